@@ -0,0 +1,64 @@
+import queue
+import threading
+from datetime import datetime
+
+from captureImage import save_frame
+from generateText import save_text_output
+
+# Penanda berhenti untuk thread archiver
+_STOP = None
+
+
+class AsyncArchiver:
+    """
+    Penyimpan arsip (gambar ke captures/, teks ke outputs/) di thread
+    background, supaya tulis ke SD card tidak berada di jalur kritis
+    pipeline. Pipeline cukup memanggil submit() setelah audio selesai.
+    """
+
+    def __init__(self, max_pending=16):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="archiver", daemon=True)
+        self.written = 0
+        self.dropped = 0
+        self._thread.start()
+
+    def submit(self, frame=None, text=None):
+        """
+        Jadwalkan penyimpanan frame dan/atau teks dengan timestamp yang sama.
+        Tidak pernah memblok: jika antrian penuh, arsip dibuang.
+        Return: True jika masuk antrian.
+        """
+        if frame is None and text is None:
+            return False
+
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            self._queue.put_nowait((ts, frame, text))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            print("[WARNING] Antrian arsip penuh, arsip dibuang.")
+            return False
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            ts, frame, text = item
+            try:
+                if frame is not None:
+                    save_frame(frame, ts=ts)
+                if text:
+                    save_text_output(text, ts=ts)
+                self.written += 1
+            except Exception as e:
+                print(f"[ERROR] Gagal menyimpan arsip: {e}")
+
+    def stop(self, timeout=5.0):
+        """
+        Selesaikan arsip yang masih antri lalu hentikan thread.
+        """
+        self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
@@ -0,0 +1,118 @@
+import sys
+import time
+import threading
+
+
+class Debouncer:
+    """
+    Debounce berbasis waktu: tekan yang datang < debounce_sec setelah
+    tekan sebelumnya dianggap pantulan kontak dan dibuang.
+    """
+
+    def __init__(self, debounce_sec):
+        self.debounce_sec = debounce_sec
+        self.last_press_time = 0.0
+        self.bounces = 0
+
+    def accept(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now - self.last_press_time < self.debounce_sec:
+            self.bounces += 1
+            return False
+        self.last_press_time = now
+        return True
+
+
+class GpioButton:
+    """
+    Tombol fisik di Jetson (Jetson.GPIO, mode BOARD, pull-up internal).
+    Callback GPIO hanya memanggil on_press setelah debounce; tidak ada
+    polling, thread event GPIO yang membangunkan pemanggil.
+    """
+
+    def __init__(self, on_press, pin, debounce_sec):
+        self.on_press = on_press
+        self.pin = pin
+        self.debouncer = Debouncer(debounce_sec)
+        self.GPIO = None
+
+    def _callback(self, channel):
+        if self.debouncer.accept():
+            self.on_press()
+
+    def start(self):
+        import Jetson.GPIO as GPIO  # hanya tersedia di Jetson
+
+        self.GPIO = GPIO
+        GPIO.setmode(GPIO.BOARD)
+        GPIO.setup(self.pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        GPIO.add_event_detect(
+            self.pin,
+            GPIO.FALLING,
+            callback=self._callback,
+            bouncetime=1  # kecil, debounce utama di logika waktu
+        )
+
+        print(f"Tombol pada pin fisik {self.pin} (BOARD mode).")
+        print(f"Satu kaki tombol -> pin {self.pin}, satu kaki -> GND (misal pin 39).")
+        return self
+
+    def stop(self):
+        """Lepas event detect dan kembalikan pin GPIO (GPIO.cleanup)."""
+        if self.GPIO is None:
+            return
+        try:
+            self.GPIO.remove_event_detect(self.pin)
+        except Exception:
+            pass
+        self.GPIO.cleanup()
+        self.GPIO = None
+
+
+class SimulatedButton:
+    """
+    Tombol tiruan untuk tes di PC biasa: press() memanggil on_press
+    dari thread terpisah (seperti thread event GPIO), lewat debounce yang sama.
+    """
+
+    def __init__(self, on_press, debounce_sec=0.0):
+        self.on_press = on_press
+        self.debouncer = Debouncer(debounce_sec)
+        self.started = False
+
+    def start(self):
+        self.started = True
+        return self
+
+    def press(self, wait=True):
+        """Simulasikan satu tekan (tepi turun). wait=True: tunggu callback selesai."""
+        thread = threading.Thread(target=self._callback, name="sim-button", daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+
+    def _callback(self):
+        if self.debouncer.accept():
+            self.on_press()
+
+    def stop(self):
+        self.started = False
+
+
+class KeyboardButton(SimulatedButton):
+    """
+    Tombol tiruan interaktif: tekan Enter di terminal = tekan tombol.
+    Dipakai dengan `python main.py --simulate` di PC tanpa GPIO.
+    """
+
+    def start(self):
+        super().start()
+        threading.Thread(target=self._read_stdin, name="keyboard-button", daemon=True).start()
+        print("Tombol simulasi: tekan Enter untuk menjalankan pipeline.")
+        return self
+
+    def _read_stdin(self):
+        for _ in sys.stdin:
+            if not self.started:
+                return
+            self.press(wait=False)
@@ -0,0 +1,193 @@
+import time
+import threading
+
+import cv2
+
+import tracing
+
+# === KONFIGURASI KAMERA ===
+CAMERA_INDEX = 0
+WARMUP_FRAMES = 15        # frame awal dibuang supaya auto-exposure sempat stabil
+MAX_FRAME_AGE = 0.5       # detik; frame lebih tua dari ini dianggap basi
+FRAME_TIMEOUT = 2.0       # detik menunggu frame segar sebelum menyerah
+MAX_READ_FAILURES = 30    # gagal baca berturut-turut sebelum kamera dibuka ulang
+
+
+def open_video_capture(index=CAMERA_INDEX):
+    """
+    Sumber frame default: cv2.VideoCapture dengan buffer driver minimal
+    supaya frame yang dibaca selalu yang terbaru.
+    """
+    cap = cv2.VideoCapture(index)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+class CameraService:
+    """
+    Kamera yang tetap terbuka selama program berjalan.
+
+    Thread background terus membaca frame dan hanya menyimpan frame
+    terbaru (slot tunggal), sehingga get_frame() langsung mendapat
+    frame segar yang sudah ter-expose tanpa membuka kamera lagi.
+
+    source_factory: fungsi tanpa argumen yang mengembalikan objek
+    mirip cv2.VideoCapture (isOpened/read/release). Bisa diganti
+    sumber palsu untuk pengujian.
+    """
+
+    def __init__(self, index=CAMERA_INDEX, source_factory=None, warmup_frames=WARMUP_FRAMES):
+        self.index = index
+        self.source_factory = source_factory or (lambda: open_video_capture(index))
+        self.warmup_frames = warmup_frames
+
+        self._cap = None
+        self._thread = None
+        self._running = False
+        self._cond = threading.Condition()
+
+        # Slot tunggal frame terbaru
+        self._frame = None
+        self._frame_time = 0.0
+        self._frame_seq = 0
+        self._consumed_seq = 0
+
+        # Statistik
+        self.open_latency = None
+        self.frames_grabbed = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self.reopen_count = 0
+
+    def _open(self):
+        start = time.monotonic()
+        cap = self.source_factory()
+        if cap is None or not cap.isOpened():
+            return None
+        self.open_latency = time.monotonic() - start
+        tracing.record("capture.camera_open", start, source="service")
+        return cap
+
+    def start(self):
+        """
+        Buka kamera dan jalankan thread pembaca.
+        Return: True jika kamera berhasil dibuka.
+        """
+        if self._running:
+            return True
+
+        print(f"[STEP] Membuka kamera (index {self.index}) secara persisten...")
+        self._cap = self._open()
+        if self._cap is None:
+            print(f"[ERROR] Kamera (index {self.index}) tidak ditemukan atau tidak bisa dibuka.")
+            return False
+
+        print(f"[INFO] Kamera terbuka dalam {self.open_latency * 1000:.0f} ms.")
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="camera-grabber", daemon=True)
+        self._thread.start()
+        return True
+
+    def is_alive(self):
+        """
+        True jika thread pembaca masih berjalan. False setelah stop() atau
+        setelah buka ulang kamera gagal (thread berhenti sendiri); start()
+        bisa dipanggil lagi untuk memulai ulang.
+        """
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        """
+        Hentikan thread pembaca dan lepaskan kamera.
+        """
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=FRAME_TIMEOUT)
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self):
+        warmup_left = self.warmup_frames
+        failures = 0
+        while self._running:
+            ret, frame = self._cap.read()
+            if not ret or frame is None:
+                self.read_failures += 1
+                failures += 1
+                if failures >= MAX_READ_FAILURES:
+                    print("[WARNING] Kamera tidak mengirim frame, membuka ulang...")
+                    self._cap.release()
+                    self._cap = self._open()
+                    self.reopen_count += 1
+                    failures = 0
+                    warmup_left = self.warmup_frames
+                    if self._cap is None:
+                        print("[ERROR] Gagal membuka ulang kamera. Thread kamera berhenti.")
+                        self._running = False
+                        break
+                time.sleep(0.01)
+                continue
+
+            failures = 0
+            self.frames_grabbed += 1
+            if warmup_left > 0:
+                warmup_left -= 1
+                continue
+
+            with self._cond:
+                if self._frame_seq > self._consumed_seq:
+                    self.frames_dropped += 1  # frame lama ditimpa tanpa pernah dipakai
+                self._frame = frame
+                self._frame_time = time.monotonic()
+                self._frame_seq += 1
+                self._cond.notify_all()
+
+        with self._cond:
+            self._cond.notify_all()
+
+    def get_frame(self, max_age=MAX_FRAME_AGE, timeout=FRAME_TIMEOUT):
+        """
+        Ambil frame terbaru. Jika frame di slot lebih tua dari max_age,
+        tunggu frame berikutnya (maksimal timeout detik).
+        Return: salinan frame (numpy array) atau None.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                fresh = (self._frame is not None
+                         and time.monotonic() - self._frame_time <= max_age)
+                if fresh:
+                    self._consumed_seq = self._frame_seq
+                    return self._frame.copy()
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._running:
+                    return None
+                self._cond.wait(remaining)
+
+    def frame_age(self):
+        """
+        Umur frame terbaru di slot (detik), atau None jika belum ada.
+        """
+        with self._cond:
+            if self._frame is None:
+                return None
+            return time.monotonic() - self._frame_time
+
+    def stats(self):
+        """
+        Statistik kamera untuk monitoring/benchmark.
+        """
+        return {
+            "running": self.is_alive(),
+            "open_latency": self.open_latency,
+            "frame_age": self.frame_age(),
+            "frames_grabbed": self.frames_grabbed,
+            "frames_dropped": self.frames_dropped,
+            "read_failures": self.read_failures,
+            "reopen_count": self.reopen_count,
+        }
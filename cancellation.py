@@ -0,0 +1,80 @@
+import time
+import threading
+
+
+class PipelineCancelled(Exception):
+    """Dilempar oleh tahap pipeline yang berhenti karena CancelToken dibatalkan."""
+
+
+class CancelToken:
+    """
+    Token pembatalan yang dibagikan ke semua tahap satu pipeline
+    (Ollama, Piper, playback).
+
+    Tahap yang bekerja dalam loop cukup memanggil raise_if_cancelled()
+    di antara potongan kerja. Tahap yang bisa terblok lama (menunggu
+    respons HTTP, antrian audio) mendaftarkan callback lewat on_cancel()
+    supaya langsung dihentikan saat cancel() dipanggil.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = {}
+        self._next_id = 0
+        self.cancel_time = None  # time.monotonic() saat cancel() dipanggil
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """
+        Batalkan pipeline dan jalankan semua callback pembatalan
+        (di thread pemanggil). Pemanggilan kedua tidak berpengaruh.
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.cancel_time = time.monotonic()
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[WARNING] Callback pembatalan gagal: {e}")
+
+    def on_cancel(self, callback):
+        """
+        Daftarkan callback. Jika token sudah dibatalkan, callback langsung
+        dijalankan. Return: handle untuk remove().
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._next_id += 1
+                self._callbacks[self._next_id] = callback
+                return self._next_id
+        callback()
+        return None
+
+    def remove(self, handle):
+        """Lepas callback yang sudah tidak diperlukan (tahap selesai normal)."""
+        with self._lock:
+            self._callbacks.pop(handle, None)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise PipelineCancelled()
+
+    def wait(self, timeout=None):
+        """Tunggu sampai dibatalkan. Return: True jika dibatalkan."""
+        return self._event.wait(timeout)
+
+    def latency(self):
+        """Detik sejak cancel() dipanggil (None jika belum dibatalkan)."""
+        if self.cancel_time is None:
+            return None
+        return time.monotonic() - self.cancel_time
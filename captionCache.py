@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# === KONFIGURASI CACHE CAPTION ===
+CACHE_DIR = os.path.join(os.getcwd(), "caption_cache")
+MAX_ENTRIES = 2000              # jumlah caption maksimal yang disimpan
+MAX_BYTES = 50 * 1024 * 1024    # ukuran total maksimal folder cache (50 MB)
+
+
+def make_key(**parts):
+    """
+    Buat key cache dari komponen request (gambar, prompt, model, opsi, ...).
+    Komponen diserialisasi JSON dengan urutan key tetap lalu di-hash SHA-256.
+    """
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def evict_lru(cache_dir, suffix, max_entries, max_bytes):
+    """
+    Hapus file cache (berakhiran suffix) dengan mtime paling lama sampai
+    jumlah file <= max_entries dan ukuran total <= max_bytes.
+    Return: jumlah file yang dihapus.
+    """
+    entries = []
+    total = 0
+    for name in os.listdir(cache_dir):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+
+    entries.sort()  # paling lama dipakai di depan
+    removed = 0
+    while entries and (len(entries) > max_entries or total > max_bytes):
+        _, size, path = entries.pop(0)
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class CaptionCache:
+    """
+    Cache caption di disk, satu file JSON per key (content-addressed).
+
+    Urutan LRU memakai mtime file: hit memperbarui mtime, eviction
+    menghapus file dengan mtime paling lama sampai batas jumlah entri
+    dan ukuran total terpenuhi.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Return: caption (str) jika ada di cache, None jika miss.
+        """
+        entry = self.get_entry(key)
+        return None if entry is None else entry.get("content")
+
+    def get_entry(self, key):
+        """
+        Return: entri lengkap {"content", "created", "meta"} jika ada di cache,
+        None jika miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # tandai baru dipakai (LRU)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key, content, meta=None):
+        """
+        Simpan caption. Ditulis ke file sementara lalu di-rename supaya
+        pembaca lain tidak pernah melihat file setengah jadi.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        entry = {"content": content, "created": time.time(), "meta": meta or {}}
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Gagal menyimpan cache caption: {e}")
+            return
+
+        with self._lock:
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        self.evictions += evict_lru(self.cache_dir, ".json", self.max_entries, self.max_bytes)
+
+    def clear(self):
+        """Hapus semua entri cache."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
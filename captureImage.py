@@ -2,39 +2,97 @@ import os
 import cv2
 from datetime import datetime
 
+import tracing
+
 # === FOLDER ===
 CAPTURE_DIR = os.path.join(os.getcwd(), "captures")
 os.makedirs(CAPTURE_DIR, exist_ok=True)
 
-def capture_image():
+def save_frame(frame, ts=None):
     """
-    Ambil satu frame dari kamera index 0 dan simpan ke CAPTURE_DIR.
+    Simpan frame ke CAPTURE_DIR sebagai PNG.
+    ts: timestamp untuk nama file (opsional, default waktu sekarang).
     Return: path gambar atau None jika gagal.
     """
+    ts = ts or datetime.now().strftime("%Y%m%d_%H%M%S")
+    image_path = os.path.join(CAPTURE_DIR, f"capture_{ts}.png")
+    try:
+        cv2.imwrite(image_path, frame)
+        print(f"[INFO] Gambar disimpan: {image_path}")
+        return image_path
+    except Exception as e:
+        print(f"[ERROR] Gagal menyimpan gambar: {e}")
+        return None
+
+
+def capture_frame(camera=None):
+    """
+    Ambil satu frame dari kamera index 0 tanpa menyimpan ke disk.
+
+    Args:
+        camera: CameraService yang sudah berjalan (opsional). Jika ada,
+                frame diambil dari slot frame terbaru tanpa membuka kamera.
+                Jika None, kamera dibuka-tutup seperti biasa. Jika thread
+                layanan sudah mati, layanan dimulai ulang; jika gagal,
+                tekan ini memakai buka-tutup kamera.
+
+    Return: frame (numpy array BGR) atau None jika gagal.
+    """
+    if camera is not None and not camera.is_alive():
+        print("[ERROR] Layanan kamera berhenti. Mencoba memulai ulang...")
+        if not camera.start():
+            print("[ERROR] Layanan kamera tidak bisa dimulai ulang, fallback buka kamera per tekan.")
+            camera = None
+
+    if camera is not None:
+        print("[STEP] Mengambil frame terbaru dari layanan kamera...")
+        with tracing.span("capture.frame_grab", source="service"):
+            frame = camera.get_frame()
+        if frame is None:
+            print("[ERROR] Tidak ada frame segar dari layanan kamera.")
+        return frame
+
     print("[STEP] Menangkap gambar dari kamera (index 0)...")
-    cap = cv2.VideoCapture(0)
+    with tracing.span("capture.camera_open"):
+        cap = cv2.VideoCapture(0)
+        opened = cap.isOpened()
 
-    if not cap.isOpened():
+    if not opened:
         print("[ERROR] Kamera (index 0) tidak ditemukan atau tidak bisa dibuka.")
         return None
 
-    ret, frame = cap.read()
+    with tracing.span("capture.frame_grab", source="open"):
+        ret, frame = cap.read()
     cap.release()
 
     if not ret or frame is None:
         print("[ERROR] Tidak dapat menangkap gambar dari kamera.")
         return None
 
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    image_path = os.path.join(CAPTURE_DIR, f"capture_{ts}.png")
-    try:
-        cv2.imwrite(image_path, frame)
-        print(f"[INFO] Gambar disimpan: {image_path}")
-        return image_path
-    except Exception as e:
-        print(f"[ERROR] Gagal menyimpan gambar: {e}")
+    return frame
+
+
+def capture_image(camera=None, save_to_file=True):
+    """
+    Ambil satu frame dari kamera dan (opsional) simpan ke CAPTURE_DIR.
+
+    Args:
+        camera: CameraService yang sudah berjalan (opsional)
+        save_to_file: Jika True, simpan PNG ke CAPTURE_DIR
+
+    Return:
+        - Jika save_to_file=True: path gambar atau None
+        - Jika save_to_file=False: frame (numpy array) atau None,
+          bisa langsung diberikan ke generate_text_from_image
+    """
+    frame = capture_frame(camera=camera)
+    if frame is None:
         return None
 
+    if not save_to_file:
+        return frame
+    return save_frame(frame)
+
 if __name__ == "__main__":
     img_path = capture_image()
     if img_path:
@@ -1,17 +1,32 @@
+import io
 import os
 import glob
+import time
 import wave
 import datetime
+import threading
 
 from piper import PiperVoice  # pastikan ini yang dipakai
 
+import ttsCache
+import tracing
+from textSegmenter import split_sentences
+
 # === PATH FOLDER ===
 OUTPUT_FOLDER = "outputs"   # tempat file .txt
 AUDIO_FOLDER = "audios"     # tempat simpan file .wav
 MODEL_PATH = "id_ID-news_tts-medium.onnx"  # sesuaikan kalau beda lokasi
 
+# === CACHE AUDIO TTS ===
+# Kalimat yang sering muncul (mis. "Tidak ada bahaya yang terlihat.")
+# diambil dari cache PCM per kalimat alih-alih disintesis ulang.
+TTS_CACHE_ENABLED = True
+
 os.makedirs(AUDIO_FOLDER, exist_ok=True)
 
+_cache = None
+_cache_lock = threading.Lock()
+
 
 def get_latest_txt(folder=OUTPUT_FOLDER):
     """
@@ -31,13 +46,130 @@ def load_voice(model_path=MODEL_PATH):
     """
     print("[INFO] Memuat model Piper...")
     voice = PiperVoice.load(model_path)
+    voice.model_path = model_path  # identitas model untuk key cache audio
     print("[INFO] Model Piper siap.")
     return voice
 
 
-def tts_from_text(text, voice=None, audio_folder=AUDIO_FOLDER):
+def warm_up_voice(voice, text="Halo."):
+    """
+    Jalankan satu sintesis pendek di memori supaya sesi ONNX Piper
+    sudah "panas" sebelum kalimat pertama dari pipeline.
+    Return: durasi warm-up (detik).
+    """
+    start = time.monotonic()
+    with wave.open(io.BytesIO(), "wb") as wav_file:
+        voice.synthesize_wav(text, wav_file)
+    return time.monotonic() - start
+
+
+def get_tts_cache():
+    """
+    Ambil cache audio TTS bersama (dibuat saat pertama dipakai).
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ttsCache.TTSCache(cache_dir=ttsCache.CACHE_DIR)
+        return _cache
+
+
+def get_voice_params(voice):
+    """
+    Parameter suara untuk key cache audio, dari voice yang dipakai
+    (lihat ttsCache.voice_params).
+    """
+    return ttsCache.voice_params(voice)
+
+
+def get_sample_rate(voice):
+    """
+    Sample rate keluaran voice yang dipakai (voice.config).
+    """
+    return voice.config.sample_rate
+
+
+def stream_tts(text, voice=None, use_cache=None, wav_path=None, stats=None, cancel=None):
+    """
+    Sintesis teks per kalimat dan yield PCM int16 mono (bytes) begitu
+    kalimat pertama siap, tanpa menunggu seluruh teks atau menulis file.
+    Jika cache aktif, kalimat yang ada di cache di-yield langsung; sisanya
+    disintesis lewat voice.synthesize() lalu disimpan ke cache.
+
+    Args:
+        text: Teks yang akan diucapkan
+        voice: Objek PiperVoice (None = load dari MODEL_PATH)
+        use_cache: True/False untuk memakai/melewati cache audio per kalimat,
+                   None = ikut TTS_CACHE_ENABLED
+        wav_path: Jika diisi, audio juga ditulis ke file WAV ini (side output)
+        stats: dict opsional, diisi jumlah "sentences" dan "cache_hits"
+        cancel: CancelToken opsional; dicek sebelum setiap kalimat dan
+                potongan audio (sintesis satu kalimat tidak bisa dipotong)
+
+    Yield: bytes PCM int16 mono
+    """
+    if voice is None:
+        voice = load_voice()
+
+    use_cache = TTS_CACHE_ENABLED if use_cache is None else use_cache
+    stats = {} if stats is None else stats
+    stats.update(sentences=0, cache_hits=0)
+
+    wav_file = None
+    if wav_path:
+        wav_file = wave.open(wav_path, "wb")
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(get_sample_rate(voice))
+
+    try:
+        cache = get_tts_cache() if use_cache else None
+        params = get_voice_params(voice) if use_cache else None
+        for sentence in split_sentences(text):
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            stats["sentences"] += 1
+            start = time.monotonic()
+            key = ttsCache.sentence_key(sentence, params) if use_cache else None
+            pcm = cache.get(key) if use_cache else None
+            if pcm is not None:
+                stats["cache_hits"] += 1
+                if wav_file is not None:
+                    wav_file.writeframes(pcm)
+                tracing.record("tts.sentence", start, chars=len(sentence), cache_hit=True)
+                yield pcm
+                continue
+
+            # Waktu selama yield (konsumen memutar / antrian penuh) tidak
+            # dihitung, supaya span hanya berisi kerja sintesis
+            paused = 0.0
+            pieces = []
+            for chunk in voice.synthesize(ttsCache.normalize_sentence(sentence)):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                pieces.append(chunk.audio_int16_bytes)
+                if wav_file is not None:
+                    wav_file.writeframes(chunk.audio_int16_bytes)
+                yielded = time.monotonic()
+                yield chunk.audio_int16_bytes
+                paused += time.monotonic() - yielded
+            if use_cache:
+                cache.put(key, b"".join(pieces))
+            tracing.record("tts.sentence", start, time.monotonic() - paused,
+                           chars=len(sentence), cache_hit=False)
+    finally:
+        if wav_file is not None:
+            wav_file.close()
+
+
+def tts_from_text(text, voice=None, audio_folder=AUDIO_FOLDER, output_path=None, use_cache=None,
+                  stats=None):
     """
     Ubah teks (string) menjadi audio WAV.
+    output_path: path .wav tujuan (opsional). Default: audios/output_<timestamp>.wav
+    use_cache: True/False untuk memakai/melewati cache audio per kalimat,
+               None = ikut TTS_CACHE_ENABLED
+    stats: dict opsional, diisi "sentences" dan "cache_hits" (lihat stream_tts)
     Return: path file .wav atau None.
     """
     if not text or not text.strip():
@@ -47,18 +179,28 @@ def tts_from_text(text, voice=None, audio_folder=AUDIO_FOLDER):
     if voice is None:
         voice = load_voice()
 
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = os.path.join(audio_folder, f"output_{timestamp}.wav")
+    if output_path is None:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = os.path.join(audio_folder, f"output_{timestamp}.wav")
+
+    use_cache = TTS_CACHE_ENABLED if use_cache is None else use_cache
+    if stats is None:
+        stats = {}
 
     print("[INFO] Mengubah teks menjadi audio (Piper TTS)...")
     try:
-        with wave.open(output_path, "wb") as wav_file:
-            voice.synthesize_wav(text, wav_file)
+        for _ in stream_tts(text, voice=voice, use_cache=use_cache,
+                            wav_path=output_path, stats=stats):
+            pass
     except Exception as e:
         print(f"[ERROR] Gagal membuat file audio: {e}")
         return None
 
-    print(f"[INFO] Audio berhasil dibuat: {output_path}")
+    if use_cache:
+        print(f"[INFO] Audio berhasil dibuat: {output_path} "
+              f"({stats['cache_hits']}/{stats['sentences']} kalimat dari cache)")
+    else:
+        print(f"[INFO] Audio berhasil dibuat: {output_path}")
     return output_path
 
 
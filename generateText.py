@@ -1,12 +1,55 @@
 import os
+import time
 import base64
-import requests
+import hashlib
+import threading
 from datetime import datetime
 import glob
 
+import numpy as np
+
+import preprocessImage
+import captionCache
+import tracing
+from ollamaClient import OllamaClient
+from cancellation import PipelineCancelled
+from textSegmenter import SentenceBuffer, ends_sentence
+
 # === KONFIGURASI OLLAMA ===
 MODEL_NAME = "customGemma3"
 OLLAMA_URL = "http://127.0.0.1:11434/api/chat"  # endpoint chat Ollama
+PROMPT_TEXT = "Apa yang kamu lihat dari gambar ini? Jelaskan singkat dalam bahasa Indonesia."
+
+# === KONTROL PANJANG KELUARAN ===
+# Decode mendominasi T_Ollama: caption yang lebih pendek = jawaban lebih cepat.
+# Pilih nilainya dari data: python test/testMain.py --sweep-length
+NUM_PREDICT = None       # batas token keluaran (None = tanpa batas / default model)
+STOP_SEQUENCES = []      # teks yang menghentikan generasi, mis. ["\n\n"]
+MAX_SENTENCES = None     # caption dipotong di batas kalimat ke-N (None = tanpa batas)
+TEMPERATURE = None       # None = ikut Modelfile (PARAMETER temperature 0.1)
+
+# === PREFIX PROMPT STABIL ===
+# Ollama memakai ulang KV cache untuk awal prompt yang sama dengan request
+# sebelumnya. Gambar disisipkan sebelum teks pesan user, jadi instruksi di
+# pesan user selalu di-prefill ulang setelah token gambar.
+#   "system": instruksi digabung ke SYSTEM Modelfile dalam pesan system,
+#             pesan user hanya berisi gambar -> prefix identik tiap tekan
+#   "user"  : instruksi dikirim bersama gambar (tata letak lama)
+PROMPT_LAYOUT = "system"
+
+# Field waktu dari respons akhir Ollama (durasi dalam nanodetik) -> key stats
+OLLAMA_TIMING_FIELDS = {
+    "total_duration": "T_Total",
+    "load_duration": "T_Load",
+    "prompt_eval_duration": "T_PromptEval",
+    "eval_duration": "T_Eval",
+}
+OLLAMA_COUNT_FIELDS = ("prompt_eval_count", "eval_count")
+
+# === CACHE CAPTION ===
+# Nonaktif untuk perangkat (frame kamera selalu berbeda, cache hanya menambah
+# tulis ke SD card); diaktifkan oleh test/testMain.py untuk evaluasi ulang.
+CAPTION_CACHE_ENABLED = False
 
 # === FOLDER ===
 CAPTURE_DIR = os.path.join(os.getcwd(), "captures")
@@ -15,57 +58,319 @@ OUTPUT_DIR = os.path.join(os.getcwd(), "outputs")
 os.makedirs(CAPTURE_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Klien Ollama bersama (pool koneksi keep-alive + timeout + retry)
+_client = None
+_client_lock = threading.Lock()
+_cache = None
+_model_digests = {}
+_system_prompts = {}
+
+
+def get_client():
+    """
+    Ambil klien Ollama bersama. Dibuat ulang jika OLLAMA_URL diganti.
+    """
+    global _client
+    base_url = OLLAMA_URL.rsplit("/api/", 1)[0]
+    with _client_lock:
+        if _client is None or _client.base_url != base_url:
+            _client = OllamaClient(base_url=base_url)
+        return _client
+
+
+def get_cache():
+    """
+    Ambil cache caption bersama (dibuat saat pertama dipakai).
+    """
+    global _cache
+    with _client_lock:
+        if _cache is None:
+            _cache = captionCache.CaptionCache(cache_dir=captionCache.CACHE_DIR)
+        return _cache
+
+
+def get_model_digest(model):
+    """
+    Digest model Ollama (disimpan per proses). Jika tidak bisa diambil,
+    return "unknown" supaya cache tetap bisa dipakai.
+    """
+    if model not in _model_digests:
+        try:
+            digest = get_client().model_digest(model)
+        except Exception as e:
+            print(f"[WARNING] Gagal mengambil digest model '{model}': {e}")
+            return "unknown"
+        _model_digests[model] = digest or "unknown"
+    return _model_digests[model]
+
+
+def get_system_prompt(model):
+    """
+    SYSTEM prompt Modelfile (disimpan per proses). Pesan system di request
+    menggantikan SYSTEM Modelfile, jadi isinya harus ikut dikirim.
+    Kegagalan /api/show juga disimpan (None) supaya tekan berikutnya tidak
+    menunggu timeout lagi selama Ollama mati; kosongkan _system_prompts
+    untuk mencoba ulang.
+    Return: string, atau None jika tidak bisa diambil.
+    """
+    if model not in _system_prompts:
+        try:
+            _system_prompts[model] = get_client().model_system(model)
+        except Exception as e:
+            print(f"[WARNING] Gagal mengambil SYSTEM prompt model '{model}': {e}")
+            print("[INFO] Layout prompt \"user\" dipakai sampai proses dimulai ulang")
+            _system_prompts[model] = None
+    return _system_prompts[model]
+
+
+def caption_cache_key(payload):
+    """
+    Key cache caption dari payload request: hash isi gambar (setelah
+    preprocessing), setting preprocessing, teks prompt, nama + digest model,
+    dan opsi generasi (temperature dll).
+    """
+    messages = []
+    for msg in payload["messages"]:
+        msg = dict(msg)
+        images = msg.pop("images", [])
+        msg["image_sha256"] = [hashlib.sha256(img.encode("ascii")).hexdigest() for img in images]
+        messages.append(msg)
+
+    return captionCache.make_key(
+        model=payload["model"],
+        digest=get_model_digest(payload["model"]),
+        messages=messages,
+        options=payload.get("options", {}),
+        preprocess=preprocessImage.current_settings(),
+    )
+
+
+def image_label(image):
+    """
+    Nama pendek gambar untuk log: nama file, atau keterangan frame di memori.
+    """
+    if isinstance(image, str):
+        return os.path.basename(image)
+    if isinstance(image, (bytes, bytearray)):
+        return f"buffer {len(image)} byte"
+    return "frame di memori"
+
+
+def encode_image_b64(image):
+    """
+    Encode gambar ke base64 (format multimodal Ollama).
+
+    Args:
+        image: salah satu dari
+            - str   : path file gambar di disk
+            - bytes : gambar yang sudah ter-encode (JPEG/PNG), dikirim apa adanya
+            - numpy array : frame BGR langsung dari kamera (tanpa lewat disk)
+
+    Jika preprocessImage.PREPROCESS_ENABLED, file/frame diperkecil dan
+    di-encode ulang (JPEG/WebP) di memori sebelum base64.
+    Return: string base64 atau None jika gagal.
+    """
+    try:
+        if isinstance(image, (bytes, bytearray)):
+            img_bytes = bytes(image)
+        elif isinstance(image, str):
+            if not os.path.exists(image):
+                print(f"[ERROR] File gambar tidak ada: {image}")
+                return None
+            if preprocessImage.PREPROCESS_ENABLED:
+                img_bytes = preprocessImage.preprocess_image_file(image)
+            else:
+                with open(image, "rb") as f:
+                    img_bytes = f.read()
+        elif preprocessImage.PREPROCESS_ENABLED:
+            img_bytes = preprocessImage.preprocess_frame(image)
+        else:
+            img_bytes = preprocessImage.encode_frame(image, fmt="png")
+
+        if img_bytes is None:
+            return None
+        return base64.b64encode(img_bytes).decode("utf-8")
+    except Exception as e:
+        print(f"[ERROR] Gagal membaca/encode gambar: {e}")
+        return None
+
+
+def generation_options():
+    """
+    Opsi generasi Ollama dari konfigurasi panjang keluaran.
+    Hanya opsi yang diset yang dikirim, sisanya ikut Modelfile.
+    """
+    options = {}
+    if NUM_PREDICT:
+        options["num_predict"] = NUM_PREDICT
+    if STOP_SEQUENCES:
+        options["stop"] = list(STOP_SEQUENCES)
+    if TEMPERATURE is not None:
+        options["temperature"] = TEMPERATURE
+    return options
+
+
+def build_messages(img_b64):
+    """
+    Pesan /api/chat untuk satu gambar sesuai PROMPT_LAYOUT. Jika SYSTEM
+    Modelfile tidak bisa diambil, kembali ke tata letak "user" supaya
+    prompt sistem model tidak hilang.
+    """
+    system = get_system_prompt(MODEL_NAME) if PROMPT_LAYOUT == "system" else None
+    if system is None:
+        return [{"role": "user", "content": PROMPT_TEXT, "images": [img_b64]}]
+
+    return [
+        {"role": "system", "content": f"{system.strip()}\n\n{PROMPT_TEXT}".strip()},
+        {"role": "user", "content": "", "images": [img_b64]},
+    ]
+
+
+def build_payload(img_b64, stream=False):
+    """
+    Susun payload request /api/chat untuk satu gambar.
+    """
+    payload = {
+        "model": MODEL_NAME,
+        "messages": build_messages(img_b64),
+        "stream": stream
+    }
+    options = generation_options()
+    if options:
+        payload["options"] = options
+    return payload
+
+
+def truncate_caption(text, max_sentences=None, cut_by_length=False):
+    """
+    Potong caption supaya selalu berakhir di batas kalimat.
+
+    Args:
+        text: caption dari model
+        max_sentences: jumlah kalimat maksimum (None = tanpa batas)
+        cut_by_length: True jika generasi berhenti karena num_predict
+                       (done_reason "length"); fragmen akhir tanpa tanda
+                       akhir kalimat dibuang, kecuali hanya itu satu-satunya
 
-def run_ollama_with_image(image_path, save_to_file=True):
+    Return: caption yang sudah dipotong.
+    """
+    buf = SentenceBuffer(min_chars=0)  # hitung kalimat asli, sebelum digabung
+    sentences = buf.feed(text)
+    _, rest = buf.flush_groups()
+    if rest and not (cut_by_length and sentences and not ends_sentence(rest)):
+        sentences.append(rest)
+    if max_sentences:
+        sentences = sentences[:max_sentences]
+    return " ".join(sentences)
+
+
+def limit_caption(content, done_reason=None):
+    """
+    Terapkan batas panjang ke caption utuh: potong ke MAX_SENTENCES dan
+    buang kalimat terakhir yang terpotong num_predict (done_reason "length").
+    Dipakai setelah respons Ollama maupun setelah cache hit, karena cache
+    menyimpan caption sebelum dipotong (MAX_SENTENCES bukan bagian key).
+    """
+    cut_by_length = done_reason == "length"
+    if cut_by_length or MAX_SENTENCES:
+        content = truncate_caption(content, MAX_SENTENCES, cut_by_length=cut_by_length)
+    return content
+
+
+def parse_ollama_timings(data, stats=None):
+    """
+    Ambil statistik server dari respons akhir Ollama ("done": true):
+    durasi total / load model / prefill (gambar + prompt) / decode dalam
+    detik, jumlah token prompt & keluaran, dan token per detik decode.
+    Field yang tidak dikirim server dibiarkan None.
+
+    stats: dict tujuan (opsional). Return: dict stats.
+    """
+    stats = {} if stats is None else stats
+    for field, key in OLLAMA_TIMING_FIELDS.items():
+        value = data.get(field)
+        stats[key] = None if value is None else value / 1e9
+    for field in OLLAMA_COUNT_FIELDS:
+        stats[field] = data.get(field)
+
+    stats["tokens_per_sec"] = None
+    if stats["eval_count"] and stats["T_Eval"]:
+        stats["tokens_per_sec"] = stats["eval_count"] / stats["T_Eval"]
+    return stats
+
+
+def save_text_output(content, ts=None):
+    """
+    Simpan teks hasil interpretasi ke file .txt di OUTPUT_DIR.
+    ts: timestamp untuk nama file (opsional, default waktu sekarang).
+    Return: path file .txt atau None jika gagal.
+    """
+    ts = ts or datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_path = os.path.join(OUTPUT_DIR, f"output_{ts}.txt")
+    try:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        print(f"[INFO] Hasil interpretasi disimpan: {output_path}")
+        return output_path
+    except Exception as e:
+        print(f"[ERROR] Gagal menulis file output: {e}")
+        return None
+
+
+def run_ollama_with_image(image, save_to_file=True, use_cache=None, cancel=None, stats=None):
     """
     Kirim gambar ke model Gemma3 (Ollama multimodal).
     
     Args:
-        image_path: Path ke file gambar
+        image: Path file gambar, bytes ter-encode, atau frame numpy (lihat encode_image_b64)
         save_to_file: Jika True, simpan hasil ke file .txt di OUTPUT_DIR
+        use_cache: True/False untuk memakai/melewati cache caption,
+                   None = ikut CAPTION_CACHE_ENABLED
+        cancel: CancelToken opsional; pembatalan memutus request dan
+                melempar PipelineCancelled ke pemanggil
+        stats: dict opsional, diisi statistik server Ollama
+               (lihat parse_ollama_timings) dan "cached"
     
     Return: 
         - Jika save_to_file=True: (content, txt_path) atau (None, None)
         - Jika save_to_file=False: (content, None) atau (None, None)
     """
-    if not os.path.exists(image_path):
-        print(f"[ERROR] File gambar tidak ada: {image_path}")
+    stats = {} if stats is None else stats
+    stats["cached"] = False
+    with tracing.span("llm.encode"):
+        img_b64 = encode_image_b64(image)
+    if img_b64 is None:
         return None, None
 
-    # Encode ke base64 (format multimodal Ollama)
-    try:
-        with open(image_path, "rb") as f:
-            img_b64 = base64.b64encode(f.read()).decode("utf-8")
-    except Exception as e:
-        print(f"[ERROR] Gagal membaca/encode gambar: {e}")
-        return None, None
+    payload = build_payload(img_b64, stream=False)  # supaya respons langsung sekali, bukan streaming
 
-    payload = {
-        "model": MODEL_NAME,
-        "messages": [
-            {
-                "role": "user",
-                "content": "Apa yang kamu lihat dari gambar ini? Jelaskan singkat dalam bahasa Indonesia.",
-                "images": [img_b64],
-            }
-        ],
-        "stream": False  # supaya respons langsung sekali, bukan streaming
-    }
+    use_cache = CAPTION_CACHE_ENABLED if use_cache is None else use_cache
+    cache_key = caption_cache_key(payload) if use_cache else None
+    if cache_key:
+        entry = get_cache().get_entry(cache_key)
+        if entry and entry.get("content"):
+            print(f"[INFO] Caption {image_label(image)} diambil dari cache.")
+            stats["cached"] = True
+            stats["done_reason"] = entry.get("meta", {}).get("done_reason")
+            content = limit_caption(entry["content"], stats["done_reason"])
+            return content, (save_text_output(content) if save_to_file else None)
 
-    print(f"[STEP] Mengirim gambar {os.path.basename(image_path)} ke Ollama (Gemma3)...")
+    print(f"[STEP] Mengirim gambar {image_label(image)} ke Ollama (Gemma3)...")
     try:
-        resp = requests.post(OLLAMA_URL, json=payload)
-        resp.raise_for_status()
+        with tracing.span("llm.http", stream=False):
+            data = get_client().chat(payload, cancel=cancel)
+    except PipelineCancelled:
+        print("[INFO] Request Ollama dibatalkan.")
+        raise
+    except ValueError as e:
+        print(f"[ERROR] Gagal parse JSON dari Ollama: {e}")
+        return None, None
     except Exception as e:
         print(f"[ERROR] Gagal memanggil Ollama. "
               f"Pastikan `ollama serve` aktif dan model '{MODEL_NAME}' tersedia. Detail: {e}")
         return None, None
 
-    try:
-        data = resp.json()
-    except Exception as e:
-        print(f"[ERROR] Gagal parse JSON dari Ollama: {e}\nRespons mentah: {resp.text}")
-        return None, None
+    parse_ollama_timings(data, stats)
 
     # Ambil konten jawaban dari field message.content
     content = data.get("message", {}).get("content", "")
@@ -73,37 +378,152 @@ def run_ollama_with_image(image_path, save_to_file=True):
         print(f"[ERROR] Konten kosong atau struktur respons tak terduga.\nRespons: {data}")
         return None, None
 
+    stats["done_reason"] = data.get("done_reason")
+    if cache_key:
+        # Disimpan utuh; batas panjang diterapkan ulang setiap kali dibaca
+        get_cache().put(cache_key, content,
+                        meta={"model": payload["model"], "done_reason": stats["done_reason"]})
+    content = limit_caption(content, stats["done_reason"])
+
     # Simpan ke file jika diminta
     if save_to_file:
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = os.path.join(OUTPUT_DIR, f"output_{ts}.txt")
-        try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"[INFO] Hasil interpretasi disimpan: {output_path}")
-            return content, output_path
-        except Exception as e:
-            print(f"[ERROR] Gagal menulis file output: {e}")
-            return content, None
+        return content, save_text_output(content)
     else:
         print(f"[INFO] Teks berhasil dihasilkan (tidak disimpan ke file)")
         return content, None
 
 
-def generate_text_from_image(image_path, save_to_file=True):
+def stream_ollama_with_image(image, use_cache=None, cancel=None, stats=None):
+    """
+    Versi streaming dari run_ollama_with_image.
+    Ollama mengirim NDJSON (satu objek JSON per baris) dengan potongan
+    token di field message.content sampai "done": true.
+    Jika cache aktif dan hit, seluruh caption di-yield sekaligus.
+
+    Yield: potongan teks (str) sesuai urutan dari model.
+    Jika gagal, generator berhenti tanpa yield (error dicetak).
+    Jika cancel dibatalkan, koneksi diputus dan PipelineCancelled dilempar.
+    stats: dict opsional, diisi statistik server dari baris "done"
+           (lihat parse_ollama_timings) dan "cached".
+    """
+    stats = {} if stats is None else stats
+    stats["cached"] = False
+    with tracing.span("llm.encode"):
+        img_b64 = encode_image_b64(image)
+    if img_b64 is None:
+        return
+
+    payload = build_payload(img_b64, stream=True)
+
+    use_cache = CAPTION_CACHE_ENABLED if use_cache is None else use_cache
+    cache_key = caption_cache_key(payload) if use_cache else None
+    if cache_key:
+        entry = get_cache().get_entry(cache_key)
+        if entry and entry.get("content"):
+            print(f"[INFO] Caption {image_label(image)} diambil dari cache.")
+            stats["cached"] = True
+            # done_reason asli diputar ulang supaya kalimat terakhir yang
+            # terpotong num_predict tetap dibuang (stream_sentences_from_image)
+            stats["done_reason"] = entry.get("meta", {}).get("done_reason")
+            yield entry["content"]
+            return
+
+    print(f"[STEP] Streaming gambar {image_label(image)} ke Ollama (Gemma3)...")
+    chunks = []
+    t_request = time.monotonic()
+    first_line = True
+    try:
+        for data in get_client().chat_stream(payload, cancel=cancel):
+            if first_line:
+                # Baris NDJSON pertama: koneksi + prompt eval selesai
+                tracing.record("llm.http", t_request, stream=True)
+                first_line = False
+            if "error" in data:
+                print(f"[ERROR] Ollama mengirim error di tengah stream: {data['error']}")
+                return
+
+            chunk = data.get("message", {}).get("content", "")
+            if chunk:
+                chunks.append(chunk)
+                if len(chunks) == 1:
+                    tracing.record("llm.first_token", t_request)
+                yield chunk
+
+            if data.get("done"):
+                tracing.record("llm.last_token", t_request, chunks=len(chunks))
+                parse_ollama_timings(data, stats)
+                stats["done_reason"] = data.get("done_reason")
+            if data.get("done") and cache_key and chunks:
+                # Hanya stream yang selesai utuh yang disimpan ke cache
+                get_cache().put(cache_key, "".join(chunks),
+                                meta={"model": payload["model"], "done_reason": stats["done_reason"]})
+    except PipelineCancelled:
+        print("[INFO] Stream Ollama dibatalkan.")
+        raise
+    except ValueError as e:
+        print(f"[ERROR] Baris stream bukan JSON valid: {e}")
+    except Exception as e:
+        print(f"[ERROR] Gagal memanggil Ollama. "
+              f"Pastikan `ollama serve` aktif dan model '{MODEL_NAME}' tersedia. Detail: {e}")
+
+
+def stream_sentences_from_image(image, use_cache=None, cancel=None, stats=None):
+    """
+    Streaming teks dari Ollama lalu pecah per kalimat secara inkremental,
+    supaya TTS bisa mulai sebelum model selesai menjawab.
+    stats: dict opsional, diisi statistik server Ollama setelah stream selesai.
+
+    Dengan MAX_SENTENCES, stream diputus setelah kalimat ke-N sehingga
+    Ollama berhenti decode. Kalimat dihitung sebelum kalimat pendek digabung.
+    Fragmen akhir tanpa tanda akhir kalimat yang terpotong num_predict dibuang.
+
+    Yield: kalimat utuh (str).
+    """
+    stats = {} if stats is None else stats
+    buf = SentenceBuffer()
+    count = 0
+    chunks = stream_ollama_with_image(image, use_cache=use_cache, cancel=cancel, stats=stats)
+    try:
+        for chunk in chunks:
+            for group in buf.feed_groups(chunk):
+                if MAX_SENTENCES:
+                    group = group[:MAX_SENTENCES - count]
+                yield " ".join(group)
+                count += len(group)
+                if MAX_SENTENCES and count >= MAX_SENTENCES:
+                    return
+    finally:
+        chunks.close()  # stream ditutup lebih awal = koneksi Ollama diputus
+    group, rest = buf.flush_groups()
+    cut_by_length = stats.get("done_reason") == "length"
+    if rest and not (cut_by_length and (count or group) and not ends_sentence(rest)):
+        group.append(rest)  # fragmen terpotong num_predict dibuang
+    if MAX_SENTENCES:
+        group = group[:MAX_SENTENCES - count]
+    if group:
+        yield " ".join(group)
+
+
+def generate_text_from_image(image, save_to_file=True, use_cache=None, cancel=None, stats=None):
     """
     Fungsi utama yang akan dipanggil modul lain:
-    1. Terima path gambar
+    1. Terima gambar (path, bytes ter-encode, atau frame numpy di memori)
     2. Kirim ke Ollama
     3. Return teks (dan path file jika save_to_file=True)
 
     Args:
-        image_path: Path ke gambar
+        image: Path gambar / bytes / frame numpy
         save_to_file: Jika True, simpan ke file .txt
+        use_cache: True/False untuk memakai/melewati cache caption (None = default modul)
+        cancel: CancelToken opsional (lihat run_ollama_with_image)
+        stats: dict opsional, diisi statistik server Ollama: T_Total, T_Load,
+               T_PromptEval, T_Eval (detik), prompt_eval_count, eval_count,
+               tokens_per_sec, cached
 
     Return: (text, txt_path) atau (None, None) jika gagal.
     """
-    text, txt_path = run_ollama_with_image(image_path, save_to_file=save_to_file)
+    text, txt_path = run_ollama_with_image(image, save_to_file=save_to_file,
+                                           use_cache=use_cache, cancel=cancel, stats=stats)
     
     if text:
         print("[INFO] Teks hasil interpretasi berhasil dibaca.")
@@ -111,6 +531,35 @@ def generate_text_from_image(image_path, save_to_file=True):
     return text, txt_path
 
 
+def warm_up_model(with_image=True):
+    """
+    Pemanasan Ollama saat startup: muat model ke memori dan jalankan
+    generasi 1 token. Dengan with_image=True, gambar kecil ikut dikirim
+    supaya vision encoder juga sudah siap sebelum tekan tombol pertama.
+
+    Return: durasi warm-up (detik) atau None jika gagal.
+    """
+    print(f"[STEP] Warm-up model Ollama '{MODEL_NAME}'...")
+    start = time.monotonic()
+
+    if with_image:
+        tiny = preprocessImage.encode_frame(np.zeros((64, 64, 3), dtype=np.uint8), fmt="jpeg")
+        payload = build_payload(base64.b64encode(tiny).decode("utf-8"))
+    else:
+        payload = {"model": MODEL_NAME, "messages": [{"role": "user", "content": "halo"}]}
+    payload["options"] = {"num_predict": 1}
+
+    try:
+        get_client().chat(payload)
+    except Exception as e:
+        print(f"[ERROR] Warm-up Ollama gagal: {e}")
+        return None
+
+    duration = time.monotonic() - start
+    print(f"[INFO] Model Ollama siap ({duration:.2f}s).")
+    return duration
+
+
 def get_latest_capture():
     """
     Mencari file gambar terbaru di folder captures.
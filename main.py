@@ -1,44 +1,94 @@
 import time
-import Jetson.GPIO as GPIO
+import queue
+import threading
+import asyncio
+import argparse
 
 from captureImage import capture_image
-from generateText import generate_text_from_image
-from generateTTS import load_voice, tts_from_text
-from playAudio import play_wav
+from cameraService import CameraService
+from generateText import generate_text_from_image, warm_up_model, get_client, MODEL_NAME
+from generateTTS import load_voice, warm_up_voice, get_sample_rate
+from ollamaClient import KeepAliveScheduler
+from playAudio import get_engine, shutdown_engine
+from streamPipeline import run_streaming_pipeline, speak_text
+from archiver import AsyncArchiver
+from cancellation import CancelToken, PipelineCancelled
+from buttonInput import GpioButton, KeyboardButton
+import orchestrator
+import tracing
 
 # === KONFIGURASI TOMBOL ===
 BUTTON_PIN = 37        # pin fisik 37 (BOARD mode)
 DEBOUNCE_SEC = 0.15    # 150 ms
 
+# === MODE PIPELINE ===
+STREAMING_MODE = True  # True: kalimat diputar selagi Ollama masih menjawab
+ARCHIVE_ENABLED = True  # simpan gambar & teks ke disk SETELAH audio selesai
+WARMUP_ENABLED = True   # muat Piper + Ollama saat startup, bukan saat tekan pertama
+CANCEL_ON_PRESS = True  # tekan saat pipeline berjalan: batalkan lalu ambil gambar baru
+CANCEL_BUDGET_SEC = 0.5  # batas latensi pembatalan yang diharapkan (peringatan jika lewat)
+ASYNC_ORCHESTRATOR = False  # True: tahap berjalan sebagai worker asyncio (lihat orchestrator.py)
+TRACE_ENABLED = False   # True: span latensi per tahap ditulis ke tracing.TRACE_PATH (JSONL)
+
 
 # === STATE GLOBAL ===
-last_press_time = 0.0
-trigger_requested = False
+press_queue = queue.Queue()  # waktu tekan (monotonic) dari thread tombol; None = berhenti
 is_processing = False
 voice = None  # cache model Piper supaya tidak load berulang kali
+camera = None  # CameraService yang tetap terbuka (None = buka-tutup per tekan)
+archiver = None  # AsyncArchiver (None = tidak ada arsip ke disk)
+keep_alive = None  # KeepAliveScheduler supaya model Ollama tidak di-evict saat idle
+current_cancel = None  # CancelToken pipeline yang sedang berjalan
+_state_lock = threading.Lock()  # is_processing & current_cancel selalu diubah bersama
 
 
-def run_full_pipeline():
+def run_full_pipeline(cancel=None):
     """
     Satu rangkaian penuh:
     1. Capture gambar
     2. Gemma3 → teks
-    3. Piper TTS → wav
-    4. Play ke speaker
+    3. Piper TTS → PCM
+    4. Play ke speaker (PlaybackEngine, kalimat pertama diputar selagi sisanya disintesis)
+
+    Jika STREAMING_MODE aktif, langkah 2-4 berjalan tumpang tindih
+    per kalimat (lihat streamPipeline.run_streaming_pipeline).
+
+    Frame dikirim ke Ollama langsung dari memori; gambar dan teks baru
+    diarsipkan ke disk (oleh archiver) setelah audio selesai diputar.
+
+    cancel: CancelToken opsional. Jika dibatalkan (tekan tombol baru),
+    semua tahap berhenti dan PipelineCancelled dilempar ke pemanggil.
     """
     global voice
 
     print("\n================= PIPELINE DIMULAI =================")
 
-    # 1. Ambil gambar dari kamera
-    img_path = capture_image()
-    if not img_path:
+    # 1. Ambil gambar dari kamera (frame di memori, tanpa tulis PNG)
+    frame = capture_image(camera=camera, save_to_file=False)
+    if frame is None:
         print("[PIPELINE] Gagal menangkap gambar. Stop.")
         print("================= PIPELINE GAGAL =================\n")
         return
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+    if STREAMING_MODE:
+        if voice is None:
+            voice = load_voice()
+
+        text, _ = run_streaming_pipeline(frame, voice, save_to_file=False, cancel=cancel)
+        if not text:
+            print("[PIPELINE] Gagal di tahap vision/LLM. Stop.")
+            print("================= PIPELINE GAGAL =================\n")
+            return
 
-    # 2. Ambil teks dari modul vision-language menggunakan gambar yang baru ditangkap
-    text, txt_path = generate_text_from_image(img_path)
+        if archiver is not None:
+            archiver.submit(frame=frame, text=text)
+        print("================= PIPELINE SELESAI =================\n")
+        return
+
+    # 2. Ambil teks dari modul vision-language menggunakan frame yang baru ditangkap
+    text, _ = generate_text_from_image(frame, save_to_file=False, cancel=cancel)
     if not text:
         print("[PIPELINE] Gagal di tahap vision/LLM. Stop.")
         print("================= PIPELINE GAGAL =================\n")
@@ -48,87 +98,208 @@ def run_full_pipeline():
     if voice is None:
         voice = load_voice()
 
-    # 4. TTS ke .wav
-    wav_path = tts_from_text(text, voice=voice)
-    if not wav_path:
+    # 4. TTS langsung ke speaker (PCM per kalimat, tanpa file .wav perantara)
+    if speak_text(text, voice, cancel=cancel) is None:
         print("[PIPELINE] Gagal di tahap TTS. Stop.")
         print("================= PIPELINE GAGAL =================\n")
         return
 
-    # 5. Play audio
-    play_wav(wav_path)
+    # 5. Arsipkan setelah pengguna sudah mendengar hasilnya
+    if archiver is not None:
+        archiver.submit(frame=frame, text=text)
 
     print("================= PIPELINE SELESAI =================\n")
 
 
-def on_button_pressed():
+def warm_up():
     """
-    Dipanggil dari callback setelah debounce.
-    Hanya meng-set flag untuk dieksekusi di main loop.
+    Fase warm-up saat startup supaya tekan tombol pertama secepat tekan berikutnya:
+    1. Load model Piper + satu sintesis pendek, buka device audio
+    2. Generasi kecil ke Ollama (memuat gemma3 ke memori)
+    3. Jalankan penjadwal keep_alive agar model tidak dikeluarkan saat idle
     """
-    global trigger_requested, is_processing
+    global voice, keep_alive
 
-    if is_processing:
+    print("\n================= WARM-UP DIMULAI =================")
+    start = time.monotonic()
+
+    if voice is None:
+        voice = load_voice()
+    t_piper = warm_up_voice(voice)
+    print(f"[INFO] Piper siap (sintesis pertama {t_piper:.2f}s).")
+
+    # buka device audio sekali dengan sample rate voice, tetap terbuka antar tekan tombol
+    get_engine().set_sample_rate(get_sample_rate(voice))
+
+    if warm_up_model() is None:
+        print("[WARNING] Ollama belum siap; tekan pertama akan menanggung waktu load model.")
+
+    keep_alive = KeepAliveScheduler(get_client(), MODEL_NAME).start()
+
+    print(f"[INFO] Warm-up selesai dalam {time.monotonic() - start:.2f}s.")
+    print("================= WARM-UP SELESAI =================\n")
+
+
+def on_button_pressed():
+    """
+    Dipanggil dari thread tombol (GPIO / simulasi) setelah debounce.
+    Hanya mengirim event ke press_queue untuk dieksekusi di main loop.
+    """
+    with _state_lock:  # token sudah ada setiap kali is_processing True
+        processing, token = is_processing, current_cancel
+    if processing:
+        if CANCEL_ON_PRESS:
+            print("[EVENT] Tombol ditekan saat pipeline berjalan. Batalkan & ambil gambar baru...")
+            if press_queue.empty():
+                press_queue.put(time.monotonic())
+            token.cancel()
+            return
         print("[INFO] Tombol ditekan, tapi pipeline masih berjalan. Abaikan.")
         return
 
-    if not trigger_requested:
-        trigger_requested = True
+    if press_queue.empty():  # satu tekan tertunda sudah cukup
         print("[EVENT] Tombol ditekan! Pipeline akan dijalankan...")
+        press_queue.put(time.monotonic())
 
 
-def button_callback(channel):
+def request_shutdown():
+    """Hentikan main loop (dan batalkan pipeline yang sedang berjalan)."""
+    press_queue.put(None)
+    token = current_cancel
+    if token is not None:
+        token.cancel()
+
+
+def run_cancellable_pipeline(cancel=None):
     """
-    Callback level bawah (dipanggil langsung oleh Jetson.GPIO),
-    meng-handle debounce berdasarkan waktu.
+    Jalankan satu pipeline dengan CancelToken (baru jika None) dan laporkan
+    latensi pembatalan jika tombol ditekan lagi di tengah jalan.
     """
-    global last_press_time
-    now = time.time()
+    if cancel is None:
+        cancel = CancelToken()
+    tracing.begin_run()
+    start = time.monotonic()
+    outcome = "done"
+    try:
+        run_full_pipeline(cancel=cancel)
+    except PipelineCancelled:
+        outcome = "cancelled"
+        latency = cancel.latency()
+        print(f"[METRIC] Latensi pembatalan: {latency:.3f}s")
+        if latency > CANCEL_BUDGET_SEC:
+            print(f"[WARNING] Pembatalan melebihi batas {CANCEL_BUDGET_SEC:.2f}s.")
+        print("================= PIPELINE DIBATALKAN =================\n")
+    finally:
+        tracing.record("pipeline.run", start, outcome=outcome)
+        tracing.end_run()
 
-    if now - last_press_time < DEBOUNCE_SEC:
-        return
 
-    last_press_time = now
-    on_button_pressed()
+def serve_presses():
+    """
+    Main loop event-driven: blok di press_queue sampai ada tekan tombol,
+    tanpa polling. Kembali saat request_shutdown() dipanggil.
+    """
+    global is_processing, current_cancel
+
+    while True:
+        press_time = press_queue.get()
+        if press_time is None:
+            return
+        print(f"[METRIC] Tekan -> pipeline mulai: {(time.monotonic() - press_time) * 1000:.1f} ms")
+        # Token dipublikasikan bersama is_processing: tekan di sela keduanya
+        # tidak lagi jatuh ke cabang "Abaikan"
+        token = CancelToken()
+        with _state_lock:
+            current_cancel = token
+            is_processing = True
+        try:
+            run_cancellable_pipeline(token)
+        finally:
+            with _state_lock:
+                is_processing = False
+                current_cancel = None
+
+
+async def run_orchestrated_pipeline(press_time, cancel):
+    """Satu run lewat orchestrator asyncio (capture/LLM/TTS/playback tumpang tindih)."""
+    global voice
+
+    if voice is None:
+        voice = load_voice()
+    tracing.begin_run()
+    start = time.monotonic()
+    outcome = "cancelled"
+    try:
+        await orchestrator.run_device_pipeline(voice, camera, get_engine(), archiver=archiver,
+                                               press_time=press_time, cancel=cancel)
+        outcome = "done"
+    finally:
+        tracing.record("pipeline.run", start, outcome=outcome)
+        tracing.end_run()
 
 
 def main():
-    global trigger_requested, is_processing
+    global camera, archiver
 
-    # --- Setup GPIO untuk tombol ---
-    GPIO.setmode(GPIO.BOARD)
-    GPIO.setup(BUTTON_PIN, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+    parser = argparse.ArgumentParser(description="Pipeline tombol: kamera -> Gemma3 -> Piper -> speaker")
+    parser.add_argument("--simulate", action="store_true",
+                        help="tanpa GPIO: tekan Enter di terminal sebagai tombol")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="jalankan tahap pipeline lewat orchestrator asyncio")
+    parser.add_argument("--trace", nargs="?", const=tracing.TRACE_PATH, default=None, metavar="PATH",
+                        help="tulis span latensi per tahap ke JSONL (default: traces/trace.jsonl)")
+    args = parser.parse_args()
 
-    GPIO.add_event_detect(
-        BUTTON_PIN,
-        GPIO.FALLING,
-        callback=button_callback,
-        bouncetime=1  # kecil, debounce utama di logika waktu
-    )
+    if args.trace or TRACE_ENABLED:
+        tracing.start_tracing(args.trace or tracing.TRACE_PATH)
 
+    # --- Buka kamera sekali, frame terbaru selalu siap ---
+    camera = CameraService()
+    if not camera.start():
+        print("[WARNING] Layanan kamera gagal, fallback buka kamera per tekan.")
+        camera = None
+
+    if ARCHIVE_ENABLED:
+        archiver = AsyncArchiver()
+
+    if WARMUP_ENABLED:
+        warm_up()
+
+    # --- Tombol: GPIO di Jetson, keyboard untuk simulasi di PC ---
     print("=== Pipeline Tombol Otomatis ===")
-    print(f"Tombol pada pin fisik {BUTTON_PIN} (BOARD mode).")
-    print("Satu kaki tombol -> pin 37, satu kaki -> GND (misal pin 39).")
-    print("Tekan tombol untuk menjalankan pipeline.")
-    print("Tekan Ctrl+C untuk keluar.\n")
 
+    def make_button(on_press):
+        if args.simulate:
+            return KeyboardButton(on_press, debounce_sec=DEBOUNCE_SEC)
+        return GpioButton(on_press, pin=BUTTON_PIN, debounce_sec=DEBOUNCE_SEC)
+
+    button = None
     try:
-        while True:
-            # cek apakah ada request dari tombol
-            if trigger_requested and not is_processing:
-                trigger_requested = False
-                is_processing = True
-                try:
-                    run_full_pipeline()
-                finally:
-                    is_processing = False
-
-            time.sleep(0.1)  # kecil saja supaya CPU nggak 100%
+        if args.use_async or ASYNC_ORCHESTRATOR:
+            # serve() memanggil button.stop() (GPIO.cleanup) sendiri saat berhenti
+            asyncio.run(orchestrator.serve(make_button, run_orchestrated_pipeline,
+                                           cancel_on_press=CANCEL_ON_PRESS))
+            return
+
+        button = make_button(on_button_pressed)
+        button.start()
+        print("Tekan tombol untuk menjalankan pipeline.")
+        print("Tekan Ctrl+C untuk keluar.\n")
+        serve_presses()
 
     except KeyboardInterrupt:
         print("\n[MAIN] Dihentikan oleh pengguna. Keluar...")
     finally:
-        GPIO.cleanup()
+        if camera is not None:
+            camera.stop()
+        if archiver is not None:
+            archiver.stop()
+        if keep_alive is not None:
+            keep_alive.stop()
+        shutdown_engine()
+        if button is not None:
+            button.stop()  # GpioButton: GPIO.cleanup()
+        tracing.stop_tracing()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,310 @@
+import json
+import time
+import socket
+import threading
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+
+from cancellation import PipelineCancelled
+
+# === KONFIGURASI KLIEN OLLAMA ===
+OLLAMA_BASE_URL = "http://127.0.0.1:11434"
+CONNECT_TIMEOUT = 3.0     # detik untuk membuka koneksi TCP
+READ_TIMEOUT = 300.0      # detik menunggu byte berikutnya (T_Ollama bisa ~2 menit)
+MAX_RETRIES = 2           # percobaan ulang saat koneksi gagal dibuka / server 5xx
+BACKOFF_SEC = 0.5         # jeda awal retry, dikali 2 setiap percobaan
+KEEP_ALIVE = "30m"        # berapa lama Ollama menahan model di memori setelah request
+POOL_SIZE = 4             # jumlah koneksi keep-alive yang disimpan di pool
+KEEP_ALIVE_INTERVAL = 600.0  # detik antar refresh keep_alive saat idle (< KEEP_ALIVE)
+
+RETRY_STATUS = (500, 502, 503, 504)
+
+# Koneksi urllib3 yang sedang dipakai tiap thread (untuk membatalkan request)
+_active_connections = {}
+
+
+class _TrackingConnectionPool(HTTPConnectionPool):
+    """
+    Pool urllib3 yang mencatat koneksi yang sedang dipakai oleh tiap thread,
+    supaya thread lain bisa memutus socket-nya saat pipeline dibatalkan
+    (termasuk saat masih menunggu header respons selama prompt eval).
+    """
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        _active_connections[threading.get_ident()] = conn
+        return conn
+
+    def _put_conn(self, conn):
+        ident = threading.get_ident()
+        if _active_connections.get(ident) is conn:
+            del _active_connections[ident]
+        super()._put_conn(conn)
+
+
+def is_connect_error(error):
+    """
+    True jika request gagal sebelum terkirim (koneksi ditolak / connect
+    timeout). NewConnectionError urllib3 adalah turunan ConnectTimeoutError.
+    Koneksi yang putus setelah request terkirim (server mungkin sudah mulai
+    generasi) bukan connect error.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ConnectTimeoutError)
+
+
+def abort_thread_request(ident):
+    """
+    Putus socket request HTTP yang sedang berjalan di thread ident.
+    Pembacaan yang terblok langsung gagal dan Ollama menghentikan generasi
+    karena klien terputus.
+    """
+    conn = _active_connections.get(ident)
+    sock = getattr(conn, "sock", None)
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+class OllamaClient:
+    """
+    Klien HTTP Ollama yang dipakai ulang antar tekan tombol:
+    - requests.Session dengan pool koneksi keep-alive (tanpa handshake TCP baru)
+    - timeout connect/read supaya server yang hang tidak memblok loop tombol
+    - retry dengan backoff eksponensial untuk koneksi gagal dibuka dan respons 5xx
+    - field keep_alive otomatis supaya model tetap di memori di antara request
+
+    Error yang tidak bisa dipulihkan dilempar sebagai exception requests
+    (ConnectionError, Timeout, HTTPError) untuk ditangani pemanggil.
+    """
+
+    def __init__(self, base_url=OLLAMA_BASE_URL, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, max_retries=MAX_RETRIES,
+                 backoff=BACKOFF_SEC, keep_alive=KEEP_ALIVE, pool_size=POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.keep_alive = keep_alive
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        adapter.poolmanager.pool_classes_by_scheme = dict(
+            adapter.poolmanager.pool_classes_by_scheme, http=_TrackingConnectionPool)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Statistik
+        self.requests_sent = 0
+        self.retries = 0
+        self.last_request_time = 0.0  # time.monotonic() request terakhir
+
+    @contextmanager
+    def _cancel_guard(self, cancel):
+        """
+        Selama blok berjalan, cancel.cancel() dari thread lain memutus
+        koneksi thread ini. Error akibat pemutusan itu diubah menjadi
+        PipelineCancelled.
+        """
+        if cancel is None:
+            yield
+            return
+        ident = threading.get_ident()
+        handle = cancel.on_cancel(lambda: abort_thread_request(ident))
+        try:
+            yield
+        except PipelineCancelled:
+            raise
+        except Exception as e:
+            if cancel.cancelled:
+                raise PipelineCancelled() from e
+            raise
+        finally:
+            cancel.remove(handle)
+
+    def _post(self, path, payload, stream=False, cancel=None, retry_after_send=False):
+        """
+        POST dengan retry. Hanya kegagalan sebelum request terkirim
+        (koneksi ditolak, connect timeout) dan status 5xx yang diulang.
+        Koneksi yang putus setelah request terkirim dan read timeout tidak
+        diulang: Ollama mungkin sudah menerima request, dan mengirim ulang
+        berarti generasi penuh kedua di GPU Jetson.
+        retry_after_send=True: request murah tanpa generasi (load/unload
+        model) juga diulang setelah koneksi putus.
+        Request yang dibatalkan (cancel) tidak diulang.
+        """
+        url = f"{self.base_url}{path}"
+        if self.keep_alive is not None and "keep_alive" not in payload:
+            payload = dict(payload, keep_alive=self.keep_alive)
+
+        attempt = 0
+        while True:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            self.requests_sent += 1
+            self.last_request_time = time.monotonic()
+            try:
+                resp = self.session.post(url, json=payload, stream=stream, timeout=self.timeout)
+                resp.raise_for_status()
+                return resp
+            except (requests.ConnectionError, requests.HTTPError) as e:
+                # ReadTimeout bukan turunan ConnectionError, jadi tidak pernah diulang
+                if e.response is not None:
+                    retryable = e.response.status_code in RETRY_STATUS
+                else:
+                    retryable = retry_after_send or is_connect_error(e)
+                if cancel is not None and cancel.cancelled:
+                    raise PipelineCancelled() from e
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                if e.response is not None:
+                    e.response.close()
+                delay = self.backoff * (2 ** attempt)
+                attempt += 1
+                self.retries += 1
+                print(f"[WARNING] Request Ollama gagal ({e}). "
+                      f"Coba lagi {attempt}/{self.max_retries} dalam {delay:.1f}s...")
+                if cancel is not None and cancel.wait(delay):
+                    raise PipelineCancelled() from e
+                if cancel is None:
+                    time.sleep(delay)
+
+    def chat(self, payload, cancel=None):
+        """
+        /api/chat tanpa streaming. Return: dict respons JSON.
+        cancel: CancelToken opsional; jika dibatalkan, request diputus
+                dan PipelineCancelled dilempar.
+        """
+        payload = dict(payload, stream=False)
+        with self._cancel_guard(cancel):
+            resp = self._post("/api/chat", payload, cancel=cancel)
+            return resp.json()
+
+    def chat_stream(self, payload, cancel=None):
+        """
+        /api/chat dengan streaming NDJSON.
+        Yield: dict per baris sampai "done": true.
+        Jika generator ditutup lebih awal, koneksi ikut ditutup.
+        cancel: CancelToken opsional; jika dibatalkan, koneksi diputus
+                dan PipelineCancelled dilempar dari generator.
+        """
+        payload = dict(payload, stream=True)
+        with self._cancel_guard(cancel):
+            resp = self._post("/api/chat", payload, stream=True, cancel=cancel)
+            with resp:
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    yield data
+                    if data.get("done"):
+                        return
+
+    def generate(self, payload):
+        """
+        /api/generate tanpa streaming (dipakai untuk load/unload model,
+        tanpa prompt, jadi aman diulang). Return: dict respons JSON.
+        """
+        payload = dict(payload, stream=False)
+        resp = self._post("/api/generate", payload, retry_after_send=True)
+        return resp.json()
+
+    def list_models(self):
+        """
+        /api/tags: daftar model lokal beserta digest-nya.
+        Return: list dict (name, model, digest, size, ...).
+        """
+        resp = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json().get("models", [])
+
+    def model_digest(self, model):
+        """
+        Digest model (berubah jika model di-pull/di-create ulang).
+        Return: string digest atau None jika model tidak ditemukan.
+        """
+        names = {model, f"{model}:latest"}
+        for info in self.list_models():
+            if info.get("name") in names or info.get("model") in names:
+                return info.get("digest")
+        return None
+
+    def show_model(self, model):
+        """
+        /api/show: detail model (template, system prompt Modelfile, parameter).
+        Return: dict respons JSON.
+        """
+        resp = self.session.post(f"{self.base_url}/api/show", json={"model": model},
+                                 timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def model_system(self, model):
+        """
+        SYSTEM prompt dari Modelfile model ("" jika model tidak punya).
+        """
+        return self.show_model(model).get("system") or ""
+
+    def load_model(self, model):
+        """
+        Muat model ke memori (atau perpanjang keep_alive-nya) tanpa
+        menghasilkan token: /api/generate dengan prompt kosong.
+        """
+        return self.generate({"model": model})
+
+    def unload_model(self, model):
+        """
+        Keluarkan model dari memori (keep_alive=0). Dipakai benchmark
+        untuk mengukur kondisi cold start.
+        """
+        return self.generate({"model": model, "keep_alive": 0})
+
+    def close(self):
+        self.session.close()
+
+
+class KeepAliveScheduler:
+    """
+    Thread background yang memperpanjang keep_alive model secara berkala
+    selama perangkat idle, supaya Ollama tidak mengeluarkan model dari
+    memori di antara tekan tombol. Refresh dilewati jika klien baru saja
+    mengirim request (request itu sendiri sudah membawa keep_alive).
+    """
+
+    def __init__(self, client, model, interval=KEEP_ALIVE_INTERVAL):
+        self.client = client
+        self.model = model
+        self.interval = interval
+        self.refresh_count = 0
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ollama-keepalive", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            idle = time.monotonic() - self.client.last_request_time
+            if idle < self.interval:
+                continue
+            try:
+                self.client.load_model(self.model)
+                self.refresh_count += 1
+            except Exception as e:
+                self.failures += 1
+                print(f"[WARNING] Gagal refresh keep_alive Ollama: {e}")
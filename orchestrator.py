@@ -0,0 +1,351 @@
+import time
+import signal
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from cancellation import CancelToken, PipelineCancelled
+
+# === KONFIGURASI ORKESTRATOR ===
+STAGE_QUEUE_SIZE = 4     # kapasitas antrian masuk tiap tahap (backpressure)
+PLAY_QUEUE_SIZE = 16     # potongan PCM yang boleh menunggu di depan playback
+
+# Penanda akhir aliran antar tahap / iterator habis
+_END = object()
+_DONE = object()
+
+
+class Stage:
+    """
+    Satu tahap pipeline. fn(item, cancel) adalah fungsi blocking (kamera,
+    HTTP Ollama, ONNX Piper, ALSA) yang mengembalikan iterable output:
+    satu input bisa menghasilkan nol, satu, atau banyak output
+    (mis. frame -> kalimat, kalimat -> potongan PCM).
+    """
+
+    def __init__(self, name, fn, queue_size=STAGE_QUEUE_SIZE):
+        self.name = name
+        self.fn = fn
+        self.queue_size = queue_size
+
+
+class StageStats:
+    """Waktu per tahap (detik) untuk satu run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_sec = 0.0      # di dalam fn / iterator (kerja sebenarnya)
+        self.wait_in_sec = 0.0   # menunggu input dari tahap sebelumnya
+        self.blocked_sec = 0.0   # menunggu antrian tahap berikutnya kosong (backpressure)
+        self.t_first_out = None  # relatif dari awal run
+        self.errors = 0
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "busy_sec": round(self.busy_sec, 4),
+            "wait_in_sec": round(self.wait_in_sec, 4),
+            "blocked_sec": round(self.blocked_sec, 4),
+            "t_first_out": None if self.t_first_out is None else round(self.t_first_out, 4),
+            "errors": self.errors,
+        }
+
+
+def _next(iterator):
+    try:
+        return next(iterator)
+    except StopIteration:
+        return _DONE
+
+
+class Orchestrator:
+    """
+    Jalankan tahap-tahap sebagai worker asyncio yang dihubungkan antrian
+    terbatas, sehingga capture, streaming token LLM, TTS dan playback
+    saling tumpang tindih. Antrian penuh menahan tahap sebelumnya
+    (backpressure). Tiap tahap punya satu thread eksekutor sendiri supaya
+    kerja blocking tidak memblok event loop dan urutan output terjaga.
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+
+    async def _worker(self, stage, executor, in_q, out_q, stats, cancel, t0):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = time.monotonic()
+            item = await in_q.get()
+            stats.wait_in_sec += time.monotonic() - start
+            if item is _END:
+                await out_q.put(_END)
+                return
+            stats.items_in += 1
+
+            try:
+                start = time.monotonic()
+                iterator = await loop.run_in_executor(executor, lambda: iter(stage.fn(item, cancel) or ()))
+                while True:
+                    out = await loop.run_in_executor(executor, _next, iterator)
+                    stats.busy_sec += time.monotonic() - start
+                    if out is _DONE:
+                        break
+                    if stats.t_first_out is None:
+                        stats.t_first_out = time.monotonic() - t0
+                    stats.items_out += 1
+
+                    start = time.monotonic()
+                    await out_q.put(out)
+                    stats.blocked_sec += time.monotonic() - start
+                    start = time.monotonic()
+            except PipelineCancelled:
+                raise
+            except Exception as e:
+                if cancel.cancelled:
+                    raise PipelineCancelled() from e
+                stats.errors += 1
+                print(f"[ERROR] Tahap {stage.name} gagal untuk satu item: {e}")
+
+    async def run(self, items, cancel=None):
+        """
+        Alirkan items melewati semua tahap.
+
+        Args:
+            items: iterable input tahap pertama (mis. [waktu_tekan])
+            cancel: CancelToken; cancel() memutus kerja blocking di thread
+                    tahap dan menghentikan semua worker
+
+        Return: (outputs tahap terakhir, list dict statistik per tahap)
+        Raise: PipelineCancelled jika dibatalkan.
+        """
+        cancel = cancel or CancelToken()
+        t0 = time.monotonic()
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        result_q = asyncio.Queue()
+        stats = [StageStats(stage.name) for stage in self.stages]
+        executors = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"stage-{stage.name}")
+                     for stage in self.stages]
+
+        tasks = []
+        for i, stage in enumerate(self.stages):
+            out_q = queues[i + 1] if i + 1 < len(self.stages) else result_q
+            tasks.append(asyncio.ensure_future(
+                self._worker(stage, executors[i], queues[i], out_q, stats[i], cancel, t0)))
+
+        # Token dibatalkan dari thread lain -> batalkan worker di event loop
+        loop = asyncio.get_running_loop()
+        handle = cancel.on_cancel(lambda: loop.call_soon_threadsafe(_cancel_tasks, tasks))
+
+        # Pengumpul output ditunggu bersama worker: worker yang dibatalkan
+        # (cancel dari thread lain) atau gagal langsung menghentikan run,
+        # bukan membiarkan pengumpul menunggu result_q selamanya
+        collector = asyncio.ensure_future(_feed_and_collect(items, queues[0], result_q))
+        pending = {collector, *tasks}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled():
+                        raise PipelineCancelled()
+                    if task.exception() is not None:
+                        raise task.exception()
+            outputs = collector.result()
+        except (asyncio.CancelledError, PipelineCancelled):
+            cancel.cancel()
+            _cancel_tasks([collector, *tasks])
+            await asyncio.gather(collector, *tasks, return_exceptions=True)
+            raise PipelineCancelled()
+        except Exception:
+            _cancel_tasks([collector, *tasks])
+            await asyncio.gather(collector, *tasks, return_exceptions=True)
+            raise
+        finally:
+            cancel.remove(handle)
+            for executor in executors:
+                # Thread yang masih menyelesaikan kerja blocking ditinggal;
+                # hasilnya dibuang karena token sudah dibatalkan
+                executor.shutdown(wait=False)
+
+        return outputs, [s.as_dict() for s in stats]
+
+
+async def _feed_and_collect(items, in_q, result_q):
+    """Masukkan items ke tahap pertama, lalu kumpulkan output tahap terakhir sampai _END."""
+    for item in items:
+        await in_q.put(item)
+    await in_q.put(_END)
+    outputs = []
+    while True:
+        out = await result_q.get()
+        if out is _END:
+            return outputs
+        outputs.append(out)
+
+
+def _cancel_tasks(tasks):
+    for task in tasks:
+        task.cancel()
+
+
+def print_stage_stats(stats):
+    print(f"{'Tahap':<10} {'in':>4} {'out':>5} {'kerja':>8} {'tunggu':>8} {'tertahan':>9} {'1st out':>8}")
+    for s in stats:
+        first = "-" if s["t_first_out"] is None else f"{s['t_first_out']:.2f}s"
+        print(f"{s['stage']:<10} {s['items_in']:>4} {s['items_out']:>5} {s['busy_sec']:>7.2f}s "
+              f"{s['wait_in_sec']:>7.2f}s {s['blocked_sec']:>8.2f}s {first:>8}")
+
+
+def build_device_stages(voice, camera, engine, record):
+    """
+    Tahap pipeline perangkat: tombol -> capture -> Gemma3 (kalimat) ->
+    Piper (PCM) -> PlaybackEngine. Frame dan kalimat yang dihasilkan
+    dicatat di dict record ("frame", "sentences") untuk diarsipkan setelah run.
+    """
+    sentences = record.setdefault("sentences", [])
+    from captureImage import capture_image
+    from generateText import stream_sentences_from_image
+    from generateTTS import stream_tts, get_sample_rate
+
+    engine.set_sample_rate(get_sample_rate(voice))
+
+    def capture(press_time, cancel):
+        frame = capture_image(camera=camera, save_to_file=False)
+        if frame is None:
+            print("[PIPELINE] Gagal menangkap gambar.")
+            return ()
+        record["frame"] = frame
+        return (frame,)
+
+    def llm(frame, cancel):
+        for sentence in stream_sentences_from_image(frame, cancel=cancel):
+            print(f"[STREAM] Kalimat {len(sentences) + 1}: {sentence}")
+            sentences.append(sentence)
+            yield sentence
+
+    def tts(sentence, cancel):
+        return stream_tts(sentence, voice=voice, cancel=cancel)
+
+    def play(pcm, cancel):
+        engine.play_pcm(pcm, cancel=cancel)
+        return ()
+
+    return [
+        Stage("capture", capture, queue_size=1),
+        Stage("llm", llm, queue_size=1),
+        Stage("tts", tts),
+        Stage("play", play, queue_size=PLAY_QUEUE_SIZE),
+    ]
+
+
+async def run_device_pipeline(voice, camera, engine, archiver=None, press_time=None, cancel=None):
+    """
+    Satu run perangkat lewat Orchestrator, lalu tunggu audio selesai
+    diputar. Return: (text, stats) — text None jika tidak ada kalimat.
+    """
+    print("\n================= PIPELINE DIMULAI (asyncio) =================")
+    cancel = cancel or CancelToken()
+    record = {"frame": None, "sentences": []}
+    orchestrator = Orchestrator(build_device_stages(voice, camera, engine, record))
+    flush_handle = cancel.on_cancel(engine.flush)
+    try:
+        _, stats = await orchestrator.run([press_time or time.monotonic()], cancel=cancel)
+        engine.end_utterance()
+        await asyncio.get_running_loop().run_in_executor(None, engine.wait_idle)
+    finally:
+        cancel.remove(flush_handle)
+    cancel.raise_if_cancelled()
+
+    print_stage_stats(stats)
+    text = " ".join(record["sentences"]) if record["sentences"] else None
+    if not text:
+        print("[PIPELINE] Gagal di tahap capture/vision/LLM.")
+        print("================= PIPELINE GAGAL =================\n")
+        return None, stats
+
+    if archiver is not None:
+        archiver.submit(frame=record["frame"], text=text)
+    print("================= PIPELINE SELESAI =================\n")
+    return text, stats
+
+
+async def serve(make_button, run_once, cancel_on_press=True):
+    """
+    Main loop asyncio: tekan tombol (dari thread GPIO) masuk ke antrian
+    event loop; setiap tekan menjalankan run_once(press_time, cancel).
+    Tekan saat run berjalan membatalkan run itu lalu memulai yang baru.
+    SIGINT/SIGTERM menghentikan loop dengan rapi; button.stop()
+    (GPIO.cleanup() untuk GpioButton) selalu dipanggil.
+
+    Args:
+        make_button: fungsi on_press -> objek tombol (start()/stop())
+        run_once: coroutine function (press_time, cancel) untuk satu run
+        cancel_on_press: False = tekan saat run berjalan diabaikan
+    """
+    loop = asyncio.get_running_loop()
+    presses = asyncio.Queue()
+    stop = asyncio.Event()
+    state = {"token": None}
+
+    def on_press():
+        # Dipanggil dari thread tombol
+        press_time = time.monotonic()
+        token = state["token"]
+        if token is not None:
+            if not cancel_on_press:
+                print("[INFO] Tombol ditekan, tapi pipeline masih berjalan. Abaikan.")
+                return
+            print("[EVENT] Tombol ditekan saat pipeline berjalan. Batalkan & ambil gambar baru...")
+            token.cancel()
+        else:
+            print("[EVENT] Tombol ditekan! Pipeline akan dijalankan...")
+        loop.call_soon_threadsafe(presses.put_nowait, press_time)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # bukan thread utama / platform tanpa dukungan signal
+
+    button = make_button(on_press)
+    stop_task = asyncio.ensure_future(stop.wait())
+    try:
+        button.start()
+        print("Tekan tombol untuk menjalankan pipeline.")
+        print("Tekan Ctrl+C untuk keluar.\n")
+        while not stop.is_set():
+            press_task = asyncio.ensure_future(presses.get())
+            done, _ = await asyncio.wait({press_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            if press_task not in done:
+                press_task.cancel()
+                break
+            press_time = press_task.result()
+            while not presses.empty():  # tekan beruntun digabung jadi satu run
+                press_time = presses.get_nowait()
+
+            print(f"[METRIC] Tekan -> pipeline mulai: {(time.monotonic() - press_time) * 1000:.1f} ms")
+            token = CancelToken()
+            state["token"] = token
+            run_task = asyncio.ensure_future(run_once(press_time, token))
+            done, _ = await asyncio.wait({run_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            if run_task not in done:
+                token.cancel()
+            try:
+                await run_task
+            except PipelineCancelled:
+                print(f"[METRIC] Latensi pembatalan: {token.latency():.3f}s")
+                print("================= PIPELINE DIBATALKAN =================\n")
+            except Exception as e:
+                print(f"[ERROR] Pipeline gagal: {e}")
+            finally:
+                state["token"] = None
+    finally:
+        print("\n[MAIN] Menghentikan orkestrator...")
+        stop_task.cancel()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.remove_signal_handler(sig)
+            except (NotImplementedError, RuntimeError):
+                pass
+        button.stop()
@@ -1,9 +1,32 @@
 import os
+import time
+import wave
+import queue
+import threading
 import subprocess
 
+import tracing
+
+try:
+    import alsaaudio  # pyalsaaudio (opsional): playback langsung di dalam proses
+except ImportError:
+    alsaaudio = None
+
 AUDIO_DIR = "audios"
 DEFAULT_DEVICE = "default"  # sesuaikan kalau device ALSA beda
 
+# === KONFIGURASI PLAYBACK ENGINE ===
+PLAYBACK_ENGINE_ENABLED = True  # False: kembali ke satu proses aplay per file
+SAMPLE_RATE = 22050             # default sebelum voice dipakai (id_ID-news_tts-medium.onnx.json)
+CHUNK_FRAMES = 1024             # frame per tulis ke device (~46 ms @ 22050 Hz)
+MAX_QUEUE_CHUNKS = 256          # batas antrian PCM (~12 detik audio)
+SAMPLE_WIDTH = 2                # int16
+CHANNELS = 1
+UNDERRUN_TOLERANCE_SEC = 0.02   # keterlambatan < ini tertutup buffer device
+
+# Penanda akhir ucapan di antrian (bukan underrun jika antrian kosong setelahnya)
+_END_UTTERANCE = object()
+
 
 def get_latest_wav(directory=AUDIO_DIR):
     """
@@ -30,9 +53,402 @@ def get_latest_wav(directory=AUDIO_DIR):
     return os.path.join(directory, latest_name)
 
 
+# === SINK AUDIO ===
+# Semua sink menerima PCM int16 mono lewat write(bytes) dan ditutup dengan close().
+
+class AlsaSink:
+    """
+    Tulis PCM langsung ke device ALSA dari dalam proses (pyalsaaudio).
+    Device dibuka sekali dan tetap terbuka.
+    """
+
+    def __init__(self, device=DEFAULT_DEVICE, sample_rate=SAMPLE_RATE):
+        self.pcm = alsaaudio.PCM(type=alsaaudio.PCM_PLAYBACK, device=device,
+                                 channels=CHANNELS, rate=sample_rate,
+                                 format=alsaaudio.PCM_FORMAT_S16_LE,
+                                 periodsize=CHUNK_FRAMES)
+
+    def write(self, pcm):
+        self.pcm.write(pcm)
+
+    def drop(self):
+        """Buang audio di buffer device (berhenti seketika)."""
+        self.pcm.drop()
+
+    def close(self):
+        self.pcm.close()
+
+
+class AplayPipeSink:
+    """
+    Satu proses aplay (raw PCM dari stdin) yang hidup selama engine berjalan,
+    dipakai jika pyalsaaudio tidak terpasang. Spawn proses dan buka device
+    ALSA hanya terjadi sekali, bukan per file.
+    """
+
+    def __init__(self, device=DEFAULT_DEVICE, sample_rate=SAMPLE_RATE):
+        self.cmd = ["aplay", "-D", device, "-q", "-t", "raw", "-f", "S16_LE",
+                    "-r", str(sample_rate), "-c", str(CHANNELS)]
+        self.restarts = 0
+        self.proc = self._spawn()
+
+    def _spawn(self):
+        # stderr dibuang: aplay melapor "underrun" setiap kali idle di antara ucapan
+        return subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def write(self, pcm):
+        if self.proc is None:
+            self.proc = self._spawn()  # dibuka lagi setelah drop()
+        elif self.proc.poll() is not None:
+            # aplay mati (device dicabut dsb.): jalankan ulang sekali per kejadian
+            self.restarts += 1
+            self.proc = self._spawn()
+        proc = self.proc
+        try:
+            proc.stdin.write(pcm)
+            proc.stdin.flush()
+        except BrokenPipeError:
+            if proc is self.proc:
+                raise
+            # proses sengaja dimatikan oleh drop() selagi menulis
+
+    def drop(self):
+        """
+        Hentikan suara seketika: matikan aplay sehingga data di pipa dan
+        buffer ALSA ikut dibuang. Proses baru dibuat saat write() berikutnya.
+        """
+        proc, self.proc = self.proc, None
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+
+    def close(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=2.0)
+        except Exception:
+            self.proc.kill()
+
+
+class NullSink:
+    """
+    Sink tanpa speaker untuk tes headless. realtime=True meniru device
+    sungguhan: write() menunggu selama durasi audio (dikali speed).
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, realtime=False, speed=1.0):
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.speed = speed
+        self.bytes_written = 0
+
+    def write(self, pcm):
+        self.bytes_written += len(pcm)
+        if self.realtime:
+            time.sleep(len(pcm) / (SAMPLE_WIDTH * CHANNELS * self.sample_rate) * self.speed)
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """
+    Rekam semua PCM yang "diputar" ke satu file WAV (tes headless /
+    memeriksa bahwa ucapan tersambung tanpa celah).
+    """
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE):
+        self.path = path
+        self.wav_file = wave.open(path, "wb")
+        self.wav_file.setnchannels(CHANNELS)
+        self.wav_file.setsampwidth(SAMPLE_WIDTH)
+        self.wav_file.setframerate(sample_rate)
+
+    def write(self, pcm):
+        self.wav_file.writeframes(pcm)
+
+    def close(self):
+        self.wav_file.close()
+
+
+def open_device_sink(device=DEFAULT_DEVICE, sample_rate=SAMPLE_RATE):
+    """
+    Buka sink ke speaker: pyalsaaudio jika ada, jika tidak pipa aplay.
+    """
+    if alsaaudio is not None:
+        try:
+            return AlsaSink(device, sample_rate)
+        except Exception as e:
+            print(f"[WARNING] Gagal membuka ALSA langsung ({e}), pakai aplay.")
+    return AplayPipeSink(device, sample_rate)
+
+
+class PlaybackEngine:
+    """
+    Engine playback yang tetap hidup: satu thread menulis potongan PCM
+    dari antrian ke sink secara berurutan, sehingga ucapan berikutnya
+    langsung tersambung tanpa spawn proses / buka device ulang.
+
+    Underrun dihitung jika di tengah ucapan (sebelum end_utterance)
+    potongan berikutnya datang setelah audio sebelumnya habis diputar.
+    """
+
+    def __init__(self, sink=None, sample_rate=SAMPLE_RATE, device=DEFAULT_DEVICE,
+                 max_queue=MAX_QUEUE_CHUNKS):
+        self.sample_rate = sample_rate
+        self.device = device
+        self.sink = sink
+        self._owns_sink = sink is None  # sink dibuka engine: boleh dibuka ulang dengan rate lain
+        self._rate_lock = threading.Lock()
+        self.bytes_per_sec = sample_rate * SAMPLE_WIDTH * CHANNELS
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._idle = threading.Condition()
+        self._pending = 0          # item di antrian + yang sedang ditulis
+        self._play_until = 0.0     # perkiraan waktu (monotonic) audio terakhir selesai
+        self._in_utterance = False
+        self._utterance_start = None  # monotonic saat potongan pertama ucapan ditulis
+        self._generation = 0       # naik setiap flush(); potongan generasi lama dibuang
+        self._thread = None
+
+        # Statistik
+        self.chunks_played = 0
+        self.bytes_played = 0
+        self.underruns = 0
+        self.underrun_sec = 0.0
+        self.max_queue_depth = 0
+        self.flushes = 0
+
+    def start(self):
+        if self.sink is None:
+            self.sink = open_device_sink(self.device, self.sample_rate)
+        self._thread = threading.Thread(target=self._run, name="playback-engine", daemon=True)
+        self._thread.start()
+        return self
+
+    def set_sample_rate(self, sample_rate):
+        """
+        Samakan sample rate engine dengan voice yang dipakai (voice.config.sample_rate).
+        Jika berbeda: tunggu audio lama selesai, lalu buka ulang device dengan
+        rate baru (sink dari luar cukup diganti atribut sample_rate-nya).
+        Panggil sebelum PCM voice tersebut diantrikan.
+        """
+        with self._rate_lock:
+            if sample_rate == self.sample_rate:
+                return
+            self.wait_idle()  # thread engine diam di antrian: sink aman diganti
+            print(f"[INFO] Sample rate audio {self.sample_rate} -> {sample_rate} Hz, membuka ulang device...")
+            self.sample_rate = sample_rate
+            self.bytes_per_sec = sample_rate * SAMPLE_WIDTH * CHANNELS
+            if self._owns_sink and self.sink is not None:
+                self.sink.close()
+                self.sink = open_device_sink(self.device, sample_rate)
+            elif hasattr(self.sink, "sample_rate"):
+                self.sink.sample_rate = sample_rate
+
+    def _put(self, item, generation=None):
+        """
+        Antrikan satu item dengan generasi flush saat pemanggil mulai.
+        Item yang masuk setelah flush() (mis. produsen yang tertahan antrian
+        penuh) tetap generasi lama dan dibuang oleh thread engine.
+        Return: False jika flush() sudah terjadi sejak generation.
+        """
+        with self._idle:
+            if generation is None:
+                generation = self._generation
+            elif generation != self._generation:
+                return False
+            self._pending += 1
+        self._queue.put((generation, item))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def play_pcm(self, pcm, cancel=None):
+        """
+        Antrikan PCM int16 mono (bytes). Dipecah per CHUNK_FRAMES supaya
+        antrian bisa memberi backpressure. Blok jika antrian penuh.
+        cancel: CancelToken opsional; berhenti mengantri jika dibatalkan.
+        Sisa PCM juga dibuang jika flush() terjadi di tengah jalan.
+        """
+        step = CHUNK_FRAMES * SAMPLE_WIDTH * CHANNELS
+        generation = self._generation
+        for i in range(0, len(pcm), step):
+            if cancel is not None and cancel.cancelled:
+                return
+            if not self._put(pcm[i:i + step], generation):
+                return
+
+    def flush(self):
+        """
+        Potong playback: buang semua potongan yang belum diputar dan
+        audio yang sudah ada di buffer device (jika sink mendukung drop()).
+        """
+        with self._idle:
+            self._generation += 1
+        dropped = 0
+        stop_requested = False
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stop_requested = True
+                continue
+            dropped += 1
+        if stop_requested:
+            self._queue.put(None)
+
+        drop = getattr(self.sink, "drop", None)
+        if drop is not None:
+            try:
+                drop()
+            except Exception as e:
+                print(f"[WARNING] Gagal membuang buffer audio: {e}")
+
+        with self._idle:
+            self._pending -= dropped
+            self._play_until = time.monotonic()
+            self._in_utterance = False
+            self._end_trace(self._play_until, flushed=True)
+            self.flushes += 1
+            self._idle.notify_all()
+
+    def end_utterance(self):
+        """Tandai akhir ucapan: jeda setelah ini bukan underrun."""
+        self._put(_END_UTTERANCE)
+
+    def play_file(self, file_path, wait=True):
+        """
+        Antrikan isi file WAV. Return: False jika format tidak cocok
+        dengan engine (pemanggil bisa memakai aplay biasa).
+        """
+        with wave.open(file_path, "rb") as wav_file:
+            if (wav_file.getframerate() != self.sample_rate
+                    or wav_file.getsampwidth() != SAMPLE_WIDTH
+                    or wav_file.getnchannels() != CHANNELS):
+                return False
+            pcm = wav_file.readframes(wav_file.getnframes())
+        self.play_pcm(pcm)
+        self.end_utterance()
+        if wait:
+            self.wait_idle()
+        return True
+
+    def wait_idle(self, timeout=None):
+        """
+        Tunggu sampai antrian habis ditulis DAN audio terakhir selesai
+        terdengar (perkiraan dari jumlah sampel).
+        Return: True jika idle, False jika timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._pending > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        tail = self._play_until - time.monotonic()
+        if deadline is not None:
+            tail = min(tail, deadline - time.monotonic())
+        if tail > 0:
+            time.sleep(tail)
+        return time.monotonic() >= self._play_until
+
+    def _end_trace(self, end, flushed=False):
+        """Catat span playback satu ucapan (mulai tulis -> audio terakhir terdengar)."""
+        start, self._utterance_start = self._utterance_start, None
+        if start is not None:
+            tracing.record("play.utterance", start, max(start, end), flushed=flushed)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            generation, item = item
+            try:
+                if generation != self._generation:
+                    continue  # diantrikan sebelum flush(): jangan diputar
+                if item is _END_UTTERANCE:
+                    self._in_utterance = False
+                    self._end_trace(self._play_until)
+                    continue
+
+                now = time.monotonic()
+                if self._in_utterance and now > self._play_until + UNDERRUN_TOLERANCE_SEC:
+                    self.underruns += 1
+                    self.underrun_sec += now - self._play_until
+                if self._utterance_start is None:
+                    self._utterance_start = now
+                self._in_utterance = True
+                # Sink tes bisa memutar lebih cepat dari real-time (atribut speed)
+                duration = len(item) / self.bytes_per_sec * getattr(self.sink, "speed", 1.0)
+                self._play_until = max(now, self._play_until) + duration
+
+                try:
+                    self.sink.write(item)
+                except Exception as e:
+                    print(f"[ERROR] Gagal menulis audio ke device: {e}")
+                self.chunks_played += 1
+                self.bytes_played += len(item)
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+
+    def stop(self, timeout=2.0):
+        """Hentikan thread engine dan tutup device."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self.sink is not None:
+            self.sink.close()
+
+    def stats(self):
+        return {
+            "chunks_played": self.chunks_played,
+            "seconds_played": self.bytes_played / self.bytes_per_sec,
+            "underruns": self.underruns,
+            "underrun_sec": self.underrun_sec,
+            "max_queue_depth": self.max_queue_depth,
+            "flushes": self.flushes,
+        }
+
+
+# Engine bersama (device tetap terbuka antar tekan tombol)
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine(device=DEFAULT_DEVICE):
+    """
+    Ambil PlaybackEngine bersama (dibuat & device dibuka saat pertama dipakai).
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None or _engine.device != device:
+            if _engine is not None:
+                _engine.stop()
+            _engine = PlaybackEngine(device=device).start()
+        return _engine
+
+
+def shutdown_engine():
+    """Tutup engine bersama (dipanggil saat program berhenti)."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.stop()
+            _engine = None
+
+
 def play_wav(file_path, device=DEFAULT_DEVICE):
     """
-    Putar file WAV menggunakan aplay ke device ALSA yang diberikan.
+    Putar file WAV ke device ALSA yang diberikan. Memakai PlaybackEngine
+    bersama jika aktif; file dengan format lain diputar dengan aplay.
     """
     if not file_path or not os.path.exists(file_path):
         print("[ERROR] File audio tidak ditemukan, batal play.")
@@ -40,6 +456,8 @@ def play_wav(file_path, device=DEFAULT_DEVICE):
 
     print(f"[INFO] Memutar: {file_path}")
     try:
+        if PLAYBACK_ENGINE_ENABLED and get_engine(device).play_file(file_path):
+            return
         subprocess.run(["aplay", "-D", device, file_path], check=False)
     except Exception as e:
         print(f"[ERROR] Gagal memutar audio: {e}")
@@ -49,11 +467,12 @@ def main():
     """
     Mode debug mandiri:
     - Cari .wav terbaru di audios/
-    - Putar menggunakan aplay
+    - Putar menggunakan playback engine
     """
     latest = get_latest_wav(AUDIO_DIR)
     if latest:
         play_wav(latest)
+        shutdown_engine()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,108 @@
+import cv2
+
+# === KONFIGURASI PREPROCESSING ===
+# Vision encoder Gemma3 (SigLIP) bekerja pada 896x896 piksel; Ollama akan
+# me-resize gambar ke ukuran itu, jadi mengirim resolusi penuh kamera hanya
+# membuang waktu encode base64 dan transfer JSON.
+PREPROCESS_ENABLED = True
+TARGET_LONG_EDGE = 896   # sisi terpanjang setelah resize (None = tanpa resize)
+IMAGE_FORMAT = "jpeg"    # "jpeg", "webp", atau "png"
+IMAGE_QUALITY = 85       # kualitas JPEG/WebP (0-100), diabaikan untuk PNG
+CENTER_CROP = False      # crop persegi di tengah sebelum resize
+
+_FORMAT_PARAMS = {
+    "jpeg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+    "png": (".png", None),
+}
+
+
+def current_settings():
+    """
+    Ambil konfigurasi preprocessing yang sedang aktif (dict).
+    """
+    return {
+        "enabled": PREPROCESS_ENABLED,
+        "long_edge": TARGET_LONG_EDGE,
+        "format": IMAGE_FORMAT,
+        "quality": IMAGE_QUALITY,
+        "center_crop": CENTER_CROP,
+    }
+
+
+def center_crop_square(frame):
+    """
+    Potong bagian tengah frame menjadi persegi (sisi = sisi terpendek).
+    """
+    h, w = frame.shape[:2]
+    side = min(h, w)
+    top = (h - side) // 2
+    left = (w - side) // 2
+    return frame[top:top + side, left:left + side]
+
+
+def resize_long_edge(frame, long_edge):
+    """
+    Perkecil frame agar sisi terpanjang = long_edge (aspek rasio dijaga).
+    Frame yang sudah lebih kecil tidak diperbesar.
+    """
+    h, w = frame.shape[:2]
+    if not long_edge or max(h, w) <= long_edge:
+        return frame
+    scale = long_edge / float(max(h, w))
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def encode_frame(frame, fmt=None, quality=None):
+    """
+    Encode frame (numpy BGR) ke bytes terkompresi di memori.
+    Return: bytes gambar atau None jika gagal.
+    """
+    fmt = (fmt or IMAGE_FORMAT).lower()
+    quality = IMAGE_QUALITY if quality is None else quality
+
+    if fmt not in _FORMAT_PARAMS:
+        print(f"[ERROR] Format gambar tidak didukung: {fmt}")
+        return None
+
+    ext, quality_flag = _FORMAT_PARAMS[fmt]
+    params = [quality_flag, int(quality)] if quality_flag is not None else []
+    ok, buf = cv2.imencode(ext, frame, params)
+    if not ok:
+        print(f"[ERROR] Gagal encode gambar ke {fmt}.")
+        return None
+    return buf.tobytes()
+
+
+def preprocess_frame(frame, long_edge=None, fmt=None, quality=None, center_crop=None):
+    """
+    Tahap preprocessing in-memory sebelum gambar dikirim ke Ollama:
+    (opsional) center crop -> resize sisi terpanjang -> encode JPEG/WebP.
+
+    Argumen None berarti pakai konfigurasi modul.
+    Return: bytes gambar terkompresi atau None jika gagal.
+    """
+    long_edge = TARGET_LONG_EDGE if long_edge is None else long_edge
+    center_crop = CENTER_CROP if center_crop is None else center_crop
+
+    if frame is None:
+        print("[ERROR] Frame kosong, batal preprocessing.")
+        return None
+
+    if center_crop:
+        frame = center_crop_square(frame)
+    frame = resize_long_edge(frame, long_edge)
+    return encode_frame(frame, fmt=fmt, quality=quality)
+
+
+def preprocess_image_file(image_path, **kwargs):
+    """
+    Baca file gambar dari disk lalu jalankan preprocess_frame.
+    Return: bytes gambar terkompresi atau None jika gagal.
+    """
+    frame = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if frame is None:
+        print(f"[ERROR] Gagal membaca gambar: {image_path}")
+        return None
+    return preprocess_frame(frame, **kwargs)
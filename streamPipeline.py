@@ -0,0 +1,239 @@
+import os
+import time
+import queue
+import threading
+from datetime import datetime
+
+from generateText import stream_sentences_from_image, save_text_output
+from generateTTS import tts_from_text, stream_tts, get_sample_rate, AUDIO_FOLDER
+from playAudio import get_engine
+from cancellation import PipelineCancelled
+import tracing
+
+# === KONFIGURASI AUDIO STREAMING ===
+SAVE_STREAM_AUDIO = False  # True: PCM per kalimat juga ditulis ke audios/*.wav
+
+# === KONFIGURASI PEMBATALAN ===
+# Batas waktu menunggu thread TTS setelah pembatalan. Sintesis satu kalimat
+# Piper tidak bisa dipotong; thread yang belum selesai ditinggal (daemon)
+# dan hasilnya dibuang, supaya latensi pembatalan tetap terbatas.
+CANCEL_JOIN_TIMEOUT = 0.3
+
+# Penanda akhir antrian antar thread
+_END = None
+
+
+def _join_workers(threads, cancel, poll=0.05):
+    """
+    Tunggu thread pekerja selesai. Jika pipeline dibatalkan (sebelum atau
+    selama menunggu), tunggu paling lama CANCEL_JOIN_TIMEOUT sejak cancel().
+    """
+    for thread in threads:
+        while thread.is_alive():
+            if cancel is not None and cancel.cancelled:
+                remaining = cancel.cancel_time + CANCEL_JOIN_TIMEOUT - time.monotonic()
+                thread.join(timeout=max(0.0, remaining))
+                break
+            thread.join(timeout=poll if cancel is not None else None)
+
+
+def speak_text(text, voice, engine=None, wav_path=None, cancel=None):
+    """
+    Ucapkan teks utuh: PCM dari Piper langsung dikirim ke PlaybackEngine
+    per kalimat (tanpa file .wav perantara), lalu tunggu sampai selesai.
+
+    cancel: CancelToken opsional; pembatalan memotong playback seketika
+            dan melempar PipelineCancelled.
+    Return: dict metrics (t_first_audio, t_total, underruns) atau None jika gagal.
+    """
+    if not text or not text.strip():
+        print("[ERROR] Teks kosong, batal TTS.")
+        return None
+
+    engine = engine or get_engine()
+    engine.set_sample_rate(get_sample_rate(voice))
+    t0 = time.monotonic()
+    t_first_audio = None
+    underruns_before = engine.underruns
+    handle = cancel.on_cancel(engine.flush) if cancel is not None else None
+    try:
+        for pcm in stream_tts(text, voice=voice, wav_path=wav_path, cancel=cancel):
+            if t_first_audio is None:
+                t_first_audio = time.monotonic() - t0
+                tracing.record("pipeline.first_audio", t0)
+                print(f"[METRIC] Time-to-first-audio: {t_first_audio:.2f}s")
+            engine.play_pcm(pcm, cancel=cancel)
+        engine.end_utterance()
+        engine.wait_idle()
+    except PipelineCancelled:
+        raise
+    except Exception as e:
+        engine.end_utterance()
+        print(f"[ERROR] Gagal membuat audio: {e}")
+        return None
+    finally:
+        if handle is not None:
+            cancel.remove(handle)
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+
+    return {
+        "t_first_audio": t_first_audio,
+        "t_total": time.monotonic() - t0,
+        "underruns": engine.underruns - underruns_before,
+    }
+
+
+def run_streaming_pipeline(image, voice, play_fn=None, engine=None, save_to_file=True,
+                           audio_folder=AUDIO_FOLDER, save_audio=None, cancel=None):
+    """
+    Pipeline streaming: kalimat dari Ollama langsung di-TTS dan diputar
+    selagi model masih menghasilkan kalimat berikutnya.
+
+    Alur default (PCM langsung):
+        thread utama : stream token Ollama -> kalimat -> sentence_q
+        thread TTS   : sentence_q -> Piper (stream_tts) -> PlaybackEngine
+
+    Jika play_fn diberikan (mode file, dipakai tes/baseline):
+        thread TTS   : sentence_q -> Piper -> file .wav -> audio_q
+        thread play  : audio_q -> play_fn(path)
+
+    Args:
+        image: Gambar yang akan dideskripsikan (path, bytes, atau frame numpy)
+        voice: Objek PiperVoice yang sudah diload
+        play_fn: Fungsi pemutar file .wav (mode file), None = PCM ke engine
+        engine: PlaybackEngine tujuan PCM (default: engine bersama playAudio)
+        save_to_file: Jika True, teks lengkap disimpan ke outputs/
+        audio_folder: Folder tempat file .wav per kalimat
+        save_audio: Mode PCM: juga tulis .wav per kalimat (None = SAVE_STREAM_AUDIO)
+        cancel: CancelToken opsional. Pembatalan memutus stream Ollama,
+                menghentikan Piper di batas kalimat/potongan, memotong
+                playback, lalu melempar PipelineCancelled setelah thread
+                dibereskan (metrics["t_cancel"] = latensi pembatalan).
+
+    Return: (text, metrics)
+        text    : teks lengkap atau None jika tidak ada kalimat
+        metrics : dict waktu (detik, relatif dari awal pipeline):
+                  t_first_sentence, t_first_audio, t_llm_done, t_total, n_sentences
+                  (+ underruns pada mode PCM)
+    """
+    t0 = time.monotonic()
+    metrics = {
+        "t_first_sentence": None,
+        "t_first_audio": None,
+        "t_llm_done": None,
+        "t_total": None,
+        "n_sentences": 0,
+    }
+
+    pcm_mode = play_fn is None
+    handle = None
+    if pcm_mode:
+        engine = engine or get_engine()
+        engine.set_sample_rate(get_sample_rate(voice))
+        save_audio = SAVE_STREAM_AUDIO if save_audio is None else save_audio
+        underruns_before = engine.underruns
+        if cancel is not None:
+            handle = cancel.on_cancel(engine.flush)
+
+    sentence_q = queue.Queue()
+    audio_q = queue.Queue()
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def mark_first_audio():
+        if metrics["t_first_audio"] is None:
+            metrics["t_first_audio"] = time.monotonic() - t0
+            tracing.record("pipeline.first_audio", t0)
+            print(f"[METRIC] Time-to-first-audio: {metrics['t_first_audio']:.2f}s")
+
+    def pcm_worker():
+        idx = 0
+        try:
+            while True:
+                sentence = sentence_q.get()
+                if sentence is _END:
+                    return
+                idx += 1
+                wav_path = None
+                if save_audio:
+                    wav_path = os.path.join(audio_folder, f"stream_{ts}_{idx:02d}.wav")
+                try:
+                    for pcm in stream_tts(sentence, voice=voice, wav_path=wav_path, cancel=cancel):
+                        mark_first_audio()
+                        engine.play_pcm(pcm, cancel=cancel)
+                except PipelineCancelled:
+                    return
+                except Exception as e:
+                    print(f"[ERROR] Gagal membuat audio kalimat {idx}: {e}")
+        finally:
+            # Satu ucapan per jawaban: jeda antar kalimat terhitung underrun
+            engine.end_utterance()
+
+    def tts_worker():
+        idx = 0
+        while True:
+            sentence = sentence_q.get()
+            if sentence is _END or (cancel is not None and cancel.cancelled):
+                audio_q.put(_END)
+                return
+            idx += 1
+            wav_path = os.path.join(audio_folder, f"stream_{ts}_{idx:02d}.wav")
+            wav_path = tts_from_text(sentence, voice=voice, output_path=wav_path)
+            if wav_path:
+                audio_q.put(wav_path)
+
+    def play_worker():
+        while True:
+            wav_path = audio_q.get()
+            if wav_path is _END or (cancel is not None and cancel.cancelled):
+                return
+            mark_first_audio()
+            play_fn(wav_path)
+
+    if pcm_mode:
+        threads = [threading.Thread(target=pcm_worker, name="tts-worker", daemon=True)]
+    else:
+        threads = [threading.Thread(target=tts_worker, name="tts-worker", daemon=True),
+                   threading.Thread(target=play_worker, name="play-worker", daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    sentences = []
+    cancelled = False
+    try:
+        for sentence in stream_sentences_from_image(image, cancel=cancel):
+            if metrics["t_first_sentence"] is None:
+                metrics["t_first_sentence"] = time.monotonic() - t0
+            print(f"[STREAM] Kalimat {len(sentences) + 1}: {sentence}")
+            sentences.append(sentence)
+            sentence_q.put(sentence)
+    except PipelineCancelled:
+        cancelled = True
+    finally:
+        metrics["t_llm_done"] = time.monotonic() - t0
+        sentence_q.put(_END)
+        _join_workers(threads, cancel)
+        if pcm_mode:
+            engine.wait_idle()
+            metrics["underruns"] = engine.underruns - underruns_before
+            if handle is not None:
+                cancel.remove(handle)
+
+    if cancelled or (cancel is not None and cancel.cancelled):
+        metrics["t_cancel"] = cancel.latency()
+        print(f"[METRIC] Pipeline dibatalkan, latensi pembatalan: {metrics['t_cancel']:.3f}s")
+        raise PipelineCancelled()
+
+    metrics["t_total"] = time.monotonic() - t0
+    metrics["n_sentences"] = len(sentences)
+
+    if not sentences:
+        return None, metrics
+
+    text = " ".join(sentences)
+    if save_to_file:
+        save_text_output(text)
+
+    print(f"[METRIC] LLM selesai: {metrics['t_llm_done']:.2f}s | "
+          f"Total: {metrics['t_total']:.2f}s | Kalimat: {metrics['n_sentences']}")
+    return text, metrics
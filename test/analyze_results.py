@@ -164,7 +164,7 @@ def main():
     TEST_DIR = os.path.dirname(__file__)
     RESULTS_FILE = os.path.join(TEST_DIR, "spice_results.json")
     PREDICTIONS_FILE = os.path.join(TEST_DIR, "resultText.json")
-    GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruth.json")
+    GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruthAsli.json")
     DETAILED_REPORT_FILE = os.path.join(TEST_DIR, "detailed_report.json")
     
     # Load data
@@ -0,0 +1,289 @@
+"""
+Benchmark latensi statistik per tahap (Ollama, Piper) dengan pemisahan
+cold / warm-up / warm.
+
+- cold   : model di-unload sebelum setiap request (--cold kali)
+- warmup : K pengulangan pertama per gambar, dibuang dari statistik
+- warm   : N pengulangan per gambar yang diukur
+
+Setiap fase diringkas per tahap (T_Ollama, T_Load, T_PromptEval, T_Eval,
+tokens_per_sec, T_Piper): mean, stddev, p50/p90/p99 dan interval
+kepercayaan 95% mean. Metadata lingkungan (digest model, model Piper,
+ukuran gambar, preprocessing, host, commit) ikut disimpan ke JSON supaya
+run berikutnya bisa dibandingkan dengan --compare.
+
+    cd test
+    python benchLatency.py                       # Ollama + Piper asli, gambar dari images-test/
+    python benchLatency.py --stub --fake-voice   # stub Ollama lokal + FakeVoice (tanpa GPU/model)
+    python benchLatency.py -n 10 --warmup 2 --cold 3 --images 5
+    python benchLatency.py --stub --fake-voice --compare benchLatency_base.json
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import socket
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import generateTTS
+import preprocessImage
+from tracing import describe
+from generateText import generate_text_from_image, get_client, get_model_digest
+from testMain import get_image_files, IMAGES_DIR
+
+# === KONFIGURASI BENCHMARK ===
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_JSON = os.path.join(TEST_DIR, "benchLatency.json")
+REPEATS = 5          # pengulangan terukur per gambar
+WARMUP = 1           # pengulangan awal per gambar yang dibuang
+COLD_RUNS = 1        # request setelah unload model
+NUM_IMAGES = 3       # jumlah gambar dari images-test/
+STAGES = ["T_Ollama", "T_Load", "T_PromptEval", "T_Eval", "tokens_per_sec", "T_Piper"]
+HIGHER_IS_BETTER = {"tokens_per_sec"}
+REGRESSION_THRESHOLD = 0.10  # naik > 10% dan CI 95% tidak tumpang tindih = regresi
+
+
+def image_name(image):
+    return os.path.basename(image) if isinstance(image, str) else generateText.image_label(image)
+
+
+def image_info(image):
+    """Ukuran gambar asli dan setelah preprocessing (byte yang dikirim ke Ollama)."""
+    size = os.path.getsize(image) if isinstance(image, str) else len(image)
+    encoded = generateText.encode_image_b64(image)
+    return {"name": image_name(image), "bytes": size,
+            "encoded_bytes": len(base64.b64decode(encoded)) if encoded else None}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=TEST_DIR, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment_info(images, voice, stub):
+    """Metadata lingkungan benchmark (disimpan bersama hasil)."""
+    piper = generateTTS.get_voice_params(voice) if voice is not None else {"model": None}
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": git_commit(),
+        "ollama": {
+            "url": generateText.OLLAMA_URL,
+            "stub": stub,
+            "model": generateText.MODEL_NAME,
+            "digest": get_model_digest(generateText.MODEL_NAME),
+            "prompt_layout": generateText.PROMPT_LAYOUT,
+            "options": generateText.generation_options(),
+        },
+        "piper": piper,
+        "preprocess": preprocessImage.current_settings(),
+        "images": [image_info(image) for image in images],
+    }
+
+
+def measure(image, phase, voice=None, tmp_dir=None):
+    """
+    Satu request: gambar -> caption (-> audio jika voice diberikan).
+    Cache caption dan audio dilewati supaya yang diukur adalah model.
+    Return: dict sampel {phase, image, T_Ollama, stats server, T_Piper, ok}.
+    """
+    stats = {}
+    start = time.monotonic()
+    text, _ = generate_text_from_image(image, save_to_file=False, use_cache=False, stats=stats)
+    sample = {
+        "phase": phase,
+        "image": image_name(image),
+        "T_Ollama": time.monotonic() - start,
+        **{key: stats.get(key) for key in STAGES if key not in ("T_Ollama", "T_Piper")},
+        "T_Piper": None,
+        "ok": bool(text),
+    }
+    if text and voice is not None:
+        start = time.monotonic()
+        wav = generateTTS.tts_from_text(text, voice=voice, use_cache=False,
+                                        output_path=os.path.join(tmp_dir, "bench.wav"))
+        sample["T_Piper"] = time.monotonic() - start if wav else None
+        sample["ok"] = wav is not None
+    return sample
+
+
+def run_benchmark(images, repeats=REPEATS, warmup=WARMUP, cold=COLD_RUNS, voice=None):
+    """
+    Jalankan fase cold lalu warm-up + warm per gambar.
+    Return: list sampel (lihat measure).
+    """
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        client = get_client()
+        for i in range(cold):
+            client.unload_model(generateText.MODEL_NAME)
+            sample = measure(images[i % len(images)], "cold", voice, tmp_dir)
+            print(f"[INFO] cold {i + 1}/{cold}: T_Ollama {sample['T_Ollama']:.2f}s")
+            samples.append(sample)
+
+        for image in images:
+            for rep in range(warmup + repeats):
+                phase = "warmup" if rep < warmup else "warm"
+                sample = measure(image, phase, voice, tmp_dir)
+                print(f"[INFO] {phase} {sample['image']} #{rep + 1}: T_Ollama {sample['T_Ollama']:.2f}s"
+                      + (f", T_Piper {sample['T_Piper']:.2f}s" if sample['T_Piper'] is not None else ""))
+                samples.append(sample)
+    return samples
+
+
+def summarize_samples(samples):
+    """
+    Ringkasan per fase per tahap (hanya sampel yang berhasil).
+    Fase warmup tidak diringkas. Return: {phase: {stage: describe(...)}}.
+    """
+    summary = {}
+    for phase in ("cold", "warm"):
+        rows = [s for s in samples if s["phase"] == phase and s["ok"]]
+        if rows:
+            summary[phase] = {stage: describe([s[stage] for s in rows]) for stage in STAGES}
+    return summary
+
+
+def compare_reports(base, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Bandingkan ringkasan warm dua laporan benchmark.
+    Tahap dianggap regresi jika mean memburuk > threshold (relatif) dan
+    interval kepercayaan 95% keduanya tidak tumpang tindih.
+    Return: {stage: {"base", "current", "change", "regression"}}.
+    """
+    comparison = {}
+    base_warm = base.get("summary", {}).get("warm", {})
+    for stage, now in current.get("summary", {}).get("warm", {}).items():
+        before = base_warm.get(stage)
+        if not before or not before.get("count") or not now.get("count") or not before["mean"]:
+            continue
+        change = (now["mean"] - before["mean"]) / before["mean"]
+        if stage in HIGHER_IS_BETTER:
+            worse = -change > threshold
+            separated = None not in (now["ci95_high"], before["ci95_low"]) and now["ci95_high"] < before["ci95_low"]
+        else:
+            worse = change > threshold
+            separated = None not in (now["ci95_low"], before["ci95_high"]) and now["ci95_low"] > before["ci95_high"]
+        comparison[stage] = {"base": before["mean"], "current": now["mean"], "change": change,
+                             "regression": worse and separated}
+    return comparison
+
+
+def _fmt(value):
+    return f"{value:>9.3f}" if value is not None else f"{'-':>9}"
+
+
+def print_summary(summary):
+    for phase, stages in summary.items():
+        print(f"\n[{phase}]")
+        print(f"{'Tahap':<15} {'n':>4} {'mean':>9} {'stddev':>9} {'p50':>9} {'p90':>9} {'p99':>9} "
+              f"{'CI 95%':>21}")
+        for stage, s in stages.items():
+            if not s["count"]:
+                continue
+            ci = (f"[{s['ci95_low']:.3f}, {s['ci95_high']:.3f}]" if s["ci95_low"] is not None else "-")
+            print(f"{stage:<15} {s['count']:>4} {_fmt(s['mean'])} {_fmt(s['stddev'])} {_fmt(s['p50'])} "
+                  f"{_fmt(s['p90'])} {_fmt(s['p99'])} {ci:>21}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latensi statistik per tahap (cold/warm)")
+    parser.add_argument("--stub", action="store_true", help="pakai stub Ollama lokal (tanpa GPU)")
+    parser.add_argument("--fake-voice", action="store_true", help="pakai FakeVoice (tanpa model Piper)")
+    parser.add_argument("--no-piper", action="store_true", help="lewati pengukuran Piper")
+    parser.add_argument("-n", "--repeats", type=int, default=REPEATS, help="pengulangan terukur per gambar")
+    parser.add_argument("--warmup", type=int, default=WARMUP, help="pengulangan awal per gambar yang dibuang")
+    parser.add_argument("--cold", type=int, default=COLD_RUNS, help="jumlah request setelah unload model")
+    parser.add_argument("--images", type=int, default=NUM_IMAGES, help="jumlah gambar")
+    parser.add_argument("--output", default=OUTPUT_JSON, help="file JSON hasil (default: test/benchLatency.json)")
+    parser.add_argument("--compare", metavar="BASE_JSON", help="bandingkan dengan hasil benchmark sebelumnya")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="batas perubahan relatif mean untuk regresi (default: 0.10)")
+    args = parser.parse_args()
+
+    server = None
+    if args.stub:
+        from stubOllama import start_stub_server
+        server = start_stub_server(token_delay=0.01, first_token_delay=0.2, load_delay=1.0)
+        generateText.OLLAMA_URL = server.url
+        preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+        images = [f"stub-{i}".encode("ascii") for i in range(args.images)]
+    else:
+        images = get_image_files(IMAGES_DIR)[:args.images]
+        if not images:
+            print(f"[ERROR] Tidak ada gambar di folder: {IMAGES_DIR}")
+            return
+
+    voice = None
+    if args.fake_voice:
+        from fakeStages import FakeVoice
+        voice = FakeVoice()
+    elif not args.no_piper:
+        voice = generateTTS.load_voice()
+
+    print("=" * 60)
+    print("BENCHMARK LATENSI - cold / warm per tahap")
+    print("=" * 60)
+    print(f"[INFO] {len(images)} gambar x ({args.warmup} warm-up + {args.repeats} terukur), "
+          f"{args.cold} cold")
+
+    try:
+        environment = environment_info(images, voice, args.stub)
+        samples = run_benchmark(images, args.repeats, args.warmup, args.cold, voice)
+    finally:
+        if server is not None:
+            server.stop()
+
+    report = {
+        "environment": environment,
+        "config": {"repeats": args.repeats, "warmup": args.warmup, "cold": args.cold,
+                   "images": len(images)},
+        "summary": summarize_samples(samples),
+        "samples": samples,
+    }
+    failed = sum(1 for s in samples if not s["ok"])
+    if failed:
+        print(f"[WARNING] {failed} request gagal, tidak masuk statistik.")
+
+    print(f"\n{'=' * 60}")
+    print("RINGKASAN (detik; tokens_per_sec dalam token/detik)")
+    print(f"{'=' * 60}")
+    print_summary(report["summary"])
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n[INFO] Hasil benchmark disimpan ke: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        print(f"\n[INFO] Dibandingkan dengan {args.compare} "
+              f"(commit {base.get('environment', {}).get('git_commit')}, warm mean)")
+        comparison = compare_reports(base, report, args.threshold)
+        for stage, row in comparison.items():
+            flag = "  << REGRESI" if row["regression"] else ""
+            print(f"{stage:<15} {row['base']:>9.3f} -> {row['current']:>9.3f} ({row['change']:+.1%}){flag}")
+        if any(row["regression"] for row in comparison.values()):
+            print("[WARNING] Ada regresi latensi.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
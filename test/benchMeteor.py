@@ -0,0 +1,112 @@
+"""
+Benchmark evaluator METEOR: 40 gambar x 5 referensi x N run.
+
+Tiga cara menilai N run terhadap ground truth yang sama:
+- lama   : satu compute_meteor_score per run, tokenisasi ulang tiap run, serial
+- cache  : satu pass, referensi ditokenisasi sekali, serial
+- paralel: satu pass, referensi ditokenisasi sekali, process pool
+
+Skor ketiganya harus identik. Run diambil bergiliran dari
+"hasil sementara/resultText*.json".
+
+    cd test
+    python benchMeteor.py            # N = 10
+    python benchMeteor.py -n 30 --workers 4
+    python benchMeteor.py --backend native
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import evaluate_meteor
+from evaluate_meteor import IndonesianMETEOREvaluator
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruthAsli.json")
+N_IMAGES = 40
+N_REFERENCES = 5
+
+
+def load_workload(n_runs):
+    """Ground truth 40 x 5 dan n_runs candidates (file run dipakai bergiliran)."""
+    references = IndonesianMETEOREvaluator.load_references(GROUND_TRUTH_FILE)
+    image_ids = sorted(references)[:N_IMAGES]
+    references = {i: references[i][:N_REFERENCES] for i in image_ids}
+
+    files = sorted(glob.glob(os.path.join(evaluate_meteor.RUNS_DIR, "resultText*.json")))
+    sources = [IndonesianMETEOREvaluator.load_candidates(path) for path in files]
+    runs = {}
+    for r in range(n_runs):
+        source = sources[r % len(sources)]
+        runs[f"run{r}"] = {i: source[i] for i in image_ids if i in source}
+    return references, runs
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark evaluator METEOR")
+    parser.add_argument("-n", type=int, default=10, help="jumlah run")
+    parser.add_argument("--workers", type=int, default=evaluate_meteor.METEOR_WORKERS)
+    parser.add_argument("--backend", choices=["native", "nltk"], default=evaluate_meteor.METEOR_BACKEND)
+    args = parser.parse_args()
+
+    references, runs = load_workload(args.n)
+    n_pairs = sum(len(c) for c in runs.values())
+    print("=" * 60)
+    print(f"BENCHMARK METEOR - {len(references)} gambar x {N_REFERENCES} referensi x {len(runs)} run "
+          f"({n_pairs} pasangan, {args.workers} worker, backend {args.backend})")
+    print("=" * 60)
+
+    evaluator = IndonesianMETEOREvaluator(workers=1, backend=args.backend)
+
+    def old_loop():
+        results = {}
+        for run, candidates in runs.items():
+            evaluator._token_cache.clear()  # perilaku lama: tokenisasi ulang tiap run
+            results[run] = evaluator.compute_meteor_score(candidates, references, verbose=False)
+        return results
+
+    def cached_serial():
+        evaluator._token_cache.clear()
+        evaluator.workers = 1
+        return evaluator.compute_meteor_scores_many(runs, references, verbose=False)
+
+    def cached_parallel():
+        evaluator._token_cache.clear()
+        evaluator.workers = args.workers
+        return evaluator.compute_meteor_scores_many(runs, references, verbose=False)
+
+    timings = {}
+    baseline, timings["lama"] = timed(old_loop)
+    serial, timings["cache"] = timed(cached_serial)
+    parallel, timings["paralel"] = timed(cached_parallel)
+
+    max_diff = max(abs(baseline[run]["per_image"][i] - other[run]["per_image"][i])
+                   for other in (serial, parallel)
+                   for run in runs
+                   for i in baseline[run]["per_image"])
+
+    print(f"\n{'=' * 60}")
+    print("RINGKASAN")
+    print(f"{'=' * 60}")
+    print(f"{'mode':<8} {'total':>9} {'per run':>9} {'speedup':>8}")
+    for mode, seconds in timings.items():
+        print(f"{mode:<8} {seconds:>8.2f}s {seconds / len(runs):>8.3f}s {timings['lama'] / seconds:>7.2f}x")
+    print(f"\n[METRIC] Selisih skor maksimum antar mode: {max_diff:.2e}")
+    if max_diff > 1e-9:
+        print("[ERROR] Skor paralel/cache berbeda dari evaluator lama!")
+
+
+if __name__ == "__main__":
+    main()
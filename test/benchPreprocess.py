@@ -0,0 +1,127 @@
+"""
+Benchmark tahap preprocessing gambar sebelum dikirim ke Ollama.
+
+Untuk setiap setting (ukuran sisi terpanjang, format, kualitas, crop)
+dan setiap gambar di images-test/, catat:
+- payload_bytes : ukuran JSON request /api/chat (termasuk base64 gambar)
+- t_encode      : waktu baca + preprocessing + base64
+- T_Ollama      : waktu end-to-end generate_text_from_image (opsional)
+
+    cd test
+    python benchPreprocess.py               # dengan Ollama
+    python benchPreprocess.py --no-ollama   # hanya ukuran & waktu encode
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import preprocessImage
+from generateText import encode_image_b64, build_payload, generate_text_from_image
+from testMain import get_image_files, IMAGES_DIR
+
+# === KONFIGURASI ===
+TEST_DIR = os.path.dirname(__file__)
+RESULT_CSV = os.path.join(TEST_DIR, "benchPreprocess.csv")
+
+# Setting yang dibandingkan. enabled=False = kirim file asli apa adanya.
+SETTINGS = [
+    {"name": "asli", "enabled": False},
+    {"name": "896-jpeg85", "enabled": True, "long_edge": 896, "format": "jpeg", "quality": 85, "center_crop": False},
+    {"name": "896-jpeg70", "enabled": True, "long_edge": 896, "format": "jpeg", "quality": 70, "center_crop": False},
+    {"name": "896-webp80", "enabled": True, "long_edge": 896, "format": "webp", "quality": 80, "center_crop": False},
+    {"name": "896-crop-jpeg85", "enabled": True, "long_edge": 896, "format": "jpeg", "quality": 85, "center_crop": True},
+    {"name": "672-jpeg85", "enabled": True, "long_edge": 672, "format": "jpeg", "quality": 85, "center_crop": False},
+]
+
+
+def apply_setting(setting):
+    """Set konfigurasi modul preprocessImage sesuai setting."""
+    preprocessImage.PREPROCESS_ENABLED = setting["enabled"]
+    if setting["enabled"]:
+        preprocessImage.TARGET_LONG_EDGE = setting["long_edge"]
+        preprocessImage.IMAGE_FORMAT = setting["format"]
+        preprocessImage.IMAGE_QUALITY = setting["quality"]
+        preprocessImage.CENTER_CROP = setting["center_crop"]
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing gambar")
+    parser.add_argument("--images", default=IMAGES_DIR, help="folder gambar uji")
+    parser.add_argument("--limit", type=int, default=0, help="batasi jumlah gambar (0 = semua)")
+    parser.add_argument("--no-ollama", action="store_true", help="jangan panggil Ollama")
+    args = parser.parse_args()
+
+    image_files = get_image_files(args.images)
+    if args.limit:
+        image_files = image_files[:args.limit]
+    if not image_files:
+        print(f"[ERROR] Tidak ada gambar di folder: {args.images}")
+        return
+
+    print("=" * 60)
+    print(f"BENCHMARK PREPROCESSING - {len(image_files)} gambar, {len(SETTINGS)} setting")
+    print("=" * 60)
+
+    rows = []
+    for setting in SETTINGS:
+        apply_setting(setting)
+        print(f"\n[SETTING] {setting['name']}")
+
+        for image_path in image_files:
+            start = time.perf_counter()
+            img_b64 = encode_image_b64(image_path)
+            t_encode = time.perf_counter() - start
+            if img_b64 is None:
+                continue
+
+            payload_bytes = len(json.dumps(build_payload(img_b64)).encode("utf-8"))
+
+            t_ollama = None
+            if not args.no_ollama:
+                start = time.perf_counter()
+                text, _ = generate_text_from_image(image_path, save_to_file=False)
+                t_ollama = round(time.perf_counter() - start, 4) if text else None
+
+            rows.append({
+                "setting": setting["name"],
+                "image_name": os.path.basename(image_path),
+                "payload_bytes": payload_bytes,
+                "t_encode": round(t_encode, 4),
+                "T_Ollama": t_ollama,
+            })
+            print(f"  {os.path.basename(image_path)}: {payload_bytes / 1024:.1f} KiB | "
+                  f"encode {t_encode * 1000:.1f} ms"
+                  + (f" | T_Ollama {t_ollama:.2f}s" if t_ollama else ""))
+
+    with open(RESULT_CSV, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['setting', 'image_name', 'payload_bytes', 't_encode', 'T_Ollama'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\n{'=' * 60}")
+    print("RINGKASAN (rata-rata per gambar)")
+    print(f"{'=' * 60}")
+    print(f"{'setting':<18}{'payload KiB':>12}{'encode ms':>11}{'T_Ollama s':>12}")
+    for setting in SETTINGS:
+        sel = [r for r in rows if r["setting"] == setting["name"]]
+        t_ollama = [r["T_Ollama"] for r in sel if r["T_Ollama"]]
+        print(f"{setting['name']:<18}"
+              f"{mean([r['payload_bytes'] for r in sel]) / 1024:>12.1f}"
+              f"{mean([r['t_encode'] for r in sel]) * 1000:>11.1f}"
+              f"{(f'{mean(t_ollama):.2f}' if t_ollama else '-'):>12}")
+    print(f"\n[INFO] Detail per gambar disimpan ke: {RESULT_CSV}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark biaya prefill per tekan tombol untuk tiap PROMPT_LAYOUT
+(generateText): "user" (instruksi bersama gambar, tata letak lama) vs
+"system" (instruksi di prefix stabil yang di-reuse KV cache Ollama).
+
+Setiap layout menjalankan N request dengan gambar berbeda. Request pertama
+mengisi cache prefix; prompt_eval_count / prompt_eval_duration dari
+request berikutnya menunjukkan berapa token yang benar-benar di-prefill.
+
+    cd test
+    python benchPromptReuse.py             # Ollama asli, gambar dari images-test/
+    python benchPromptReuse.py --stub      # stub lokal dengan simulasi prefix cache
+"""
+
+import os
+import sys
+import argparse
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+from testMain import get_image_files, IMAGES_DIR
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def bench_layout(layout, images):
+    """
+    Jalankan semua gambar dengan PROMPT_LAYOUT tertentu.
+    Return: list stats server per request (lihat parse_ollama_timings).
+    """
+    generateText.PROMPT_LAYOUT = layout
+    results = []
+    for image in images:
+        stats = {}
+        text, _ = generateText.generate_text_from_image(image, save_to_file=False,
+                                                        use_cache=False, stats=stats)
+        if text and stats.get("prompt_eval_count") is not None:
+            results.append(stats)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prefill: prefix prompt stabil vs lama")
+    parser.add_argument("--stub", action="store_true", help="pakai stub Ollama lokal")
+    parser.add_argument("-n", type=int, default=6, help="jumlah request per layout")
+    args = parser.parse_args()
+
+    server = None
+    if args.stub:
+        from stubOllama import start_stub_server
+        import preprocessImage
+        server = start_stub_server(token_delay=0.005, first_token_delay=0.3, prefix_cache=True)
+        generateText.OLLAMA_URL = server.url
+        preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+        images = [f"stub-{i}".encode("ascii") for i in range(args.n)]
+    else:
+        images = get_image_files(IMAGES_DIR)[:args.n]
+        if not images:
+            print(f"[ERROR] Tidak ada gambar di folder: {IMAGES_DIR}")
+            return
+
+    print("=" * 60)
+    print("BENCHMARK PROMPT REUSE - prompt_eval per request")
+    print("=" * 60)
+
+    rows = {layout: bench_layout(layout, images) for layout in ("user", "system")}
+    if server is not None:
+        server.stop()
+
+    print(f"\n{'=' * 60}")
+    print("RINGKASAN (request ke-2 dst., setelah cache prefix terisi)")
+    print(f"{'=' * 60}")
+    print(f"{'layout':<8} {'n':>3} {'token prefill':>14} {'T_PromptEval':>13} {'pertama':>9}")
+    for layout, results in rows.items():
+        if not results:
+            print(f"{layout:<8} tidak ada hasil")
+            continue
+        warm = results[1:] or results
+        print(f"{layout:<8} {len(results):>3} {mean([r['prompt_eval_count'] for r in warm]):>14.1f} "
+              f"{mean([r['T_PromptEval'] for r in warm]):>12.3f}s {results[0]['T_PromptEval']:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark time-to-first-sample TTS:
+  A. write-then-play : tts_from_text -> file .wav -> play_file (jalur lama)
+  B. streaming PCM   : stream_tts -> PlaybackEngine.play_pcm (tanpa file)
+
+Waktu diukur dari mulai sintesis sampai sampel pertama ditulis ke sink.
+Cache audio dimatikan supaya yang diukur adalah sintesis Piper.
+
+    cd test
+    python benchTTSStream.py            # Piper asli (butuh model .onnx)
+    python benchTTSStream.py --fake     # FakeVoice, tanpa model
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateTTS
+from generateTTS import load_voice, tts_from_text, stream_tts
+from playAudio import PlaybackEngine, NullSink
+
+from fakeStages import FakeVoice
+
+TEXT = ("Di depan Anda ada trotoar yang cukup lebar. Seorang pria berjalan ke arah kanan "
+        "sambil membawa tas. Ada beberapa motor yang diparkir di tepi jalan. "
+        "Tidak ada bahaya yang terlihat.")
+
+
+class FirstSampleSink(NullSink):
+    """NullSink yang mencatat kapan sampel pertama ditulis."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_write = None
+
+    def write(self, pcm):
+        if self.first_write is None:
+            self.first_write = time.monotonic()
+        super().write(pcm)
+
+
+def measure(voice, mode, tmp_dir):
+    sink = FirstSampleSink()
+    engine = PlaybackEngine(sink=sink).start()
+    start = time.monotonic()
+    if mode == "file":
+        wav_path = tts_from_text(TEXT, voice=voice, output_path=os.path.join(tmp_dir, "bench.wav"))
+        engine.play_file(wav_path, wait=False)
+    else:
+        for pcm in stream_tts(TEXT, voice=voice):
+            engine.play_pcm(pcm)
+        engine.end_utterance()
+    total = time.monotonic() - start
+    engine.stop()  # antrian sudah ditulis semua ke sink saat thread berhenti
+    return sink.first_write - start, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time-to-first-sample TTS")
+    parser.add_argument("--fake", action="store_true", help="pakai FakeVoice (tanpa model Piper)")
+    parser.add_argument("--runs", type=int, default=5, help="jumlah pengulangan per mode")
+    args = parser.parse_args()
+
+    generateTTS.TTS_CACHE_ENABLED = False
+    voice = FakeVoice(synth_sec_per_char=0.004) if args.fake else load_voice()
+
+    print("=" * 60)
+    print("BENCHMARK TTS STREAMING - Time-to-first-sample")
+    print("=" * 60)
+
+    results = {"file": [], "pcm": []}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        measure(voice, "pcm", tmp_dir)  # warm-up sesi ONNX
+        for _ in range(args.runs):
+            for mode in results:
+                results[mode].append(measure(voice, mode, tmp_dir))
+
+    print(f"\n{'=' * 60}")
+    print(f"RINGKASAN ({args.runs} run, {len(TEXT)} karakter)")
+    print(f"{'=' * 60}")
+    labels = {"file": "write-then-play", "pcm": "streaming PCM"}
+    for mode, rows in results.items():
+        first = [r[0] for r in rows]
+        print(f"{labels[mode]:<16}: first-sample median {statistics.median(first):.3f}s "
+              f"(min {min(first):.3f}s, max {max(first):.3f}s)")
+    speedup = statistics.median(r[0] for r in results["file"]) / \
+        max(1e-9, statistics.median(r[0] for r in results["pcm"]))
+    print(f"Streaming {speedup:.1f}x lebih cepat sampai sampel pertama")
+
+
+if __name__ == "__main__":
+    main()
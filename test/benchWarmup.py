@@ -0,0 +1,107 @@
+"""
+Benchmark latensi tekan tombol pertama: cold (model belum dimuat)
+vs warm (setelah fase warm-up main.warm_up).
+
+Skenario:
+  A. Tanpa warm-up : unload model -> tekan 1 (cold) -> tekan 2 (warm)
+  B. Dengan warm-up: unload model -> warm_up_model() -> tekan 1
+
+    cd test
+    python benchWarmup.py                 # Ollama asli
+    python benchWarmup.py --stub          # stub lokal (simulasi load 3 detik)
+    python benchWarmup.py --no-piper      # lewati pengukuran Piper
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+from generateText import generate_text_from_image, warm_up_model, get_client, MODEL_NAME
+from testMain import get_image_files, IMAGES_DIR
+
+
+def timed(fn, *args, **kwargs):
+    start = time.monotonic()
+    result = fn(*args, **kwargs)
+    return result, time.monotonic() - start
+
+
+def bench_piper():
+    """Waktu load model Piper + sintesis pertama (cold) vs kedua (warm)."""
+    from generateTTS import load_voice, warm_up_voice
+
+    voice, t_load = timed(load_voice)
+    t_cold = warm_up_voice(voice, "Ada seorang pria berjalan di trotoar.")
+    t_warm = warm_up_voice(voice, "Ada seorang pria berjalan di trotoar.")
+    return {"load": t_load, "first_synth": t_cold, "warm_synth": t_warm}
+
+
+def bench_ollama(image):
+    client = get_client()
+
+    # A. Tanpa warm-up
+    client.unload_model(MODEL_NAME)
+    _, t_cold = timed(generate_text_from_image, image, save_to_file=False)
+    _, t_warm = timed(generate_text_from_image, image, save_to_file=False)
+
+    # B. Dengan warm-up
+    client.unload_model(MODEL_NAME)
+    t_warmup = warm_up_model()
+    _, t_after = timed(generate_text_from_image, image, save_to_file=False)
+
+    return {"cold_first_press": t_cold, "warm_press": t_warm,
+            "warmup": t_warmup, "first_press_after_warmup": t_after}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold vs warm first-press")
+    parser.add_argument("--stub", action="store_true", help="pakai stub Ollama lokal")
+    parser.add_argument("--no-piper", action="store_true", help="lewati pengukuran Piper")
+    args = parser.parse_args()
+
+    server = None
+    if args.stub:
+        from stubOllama import start_stub_server
+        import preprocessImage
+        server = start_stub_server(token_delay=0.02, first_token_delay=0.5, load_delay=3.0)
+        generateText.OLLAMA_URL = server.url
+        preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+        image = b"stub"
+    else:
+        image_files = get_image_files(IMAGES_DIR)
+        if not image_files:
+            print(f"[ERROR] Tidak ada gambar di folder: {IMAGES_DIR}")
+            return
+        image = image_files[0]
+
+    print("=" * 60)
+    print("BENCHMARK WARM-UP - Cold vs warm first press")
+    print("=" * 60)
+
+    ollama = bench_ollama(image)
+    piper = None if args.no_piper else bench_piper()
+
+    if server is not None:
+        server.stop()
+
+    print(f"\n{'=' * 60}")
+    print("RINGKASAN")
+    print(f"{'=' * 60}")
+    print(f"Ollama tekan pertama (cold)         : {ollama['cold_first_press']:.2f}s")
+    print(f"Ollama tekan berikutnya (warm)      : {ollama['warm_press']:.2f}s")
+    if ollama["warmup"] is not None:
+        print(f"Durasi warm-up saat startup         : {ollama['warmup']:.2f}s")
+    print(f"Ollama tekan pertama setelah warm-up: {ollama['first_press_after_warmup']:.2f}s")
+    if piper:
+        print(f"\nPiper load model                    : {piper['load']:.2f}s")
+        print(f"Piper sintesis pertama (cold)       : {piper['first_synth']:.2f}s")
+        print(f"Piper sintesis berikutnya (warm)    : {piper['warm_synth']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
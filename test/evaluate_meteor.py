@@ -1,8 +1,13 @@
 """
 METEOR Evaluation untuk Bahasa Indonesia
-Menggunakan NLTK METEOR dengan preprocessing untuk bahasa Indonesia
 
-Requirements:
+Backend:
+- nltk (default): NLTK METEOR (Porter stemmer + WordNet Inggris); skor
+  sama dengan meteor_results.json
+- native (--backend native): indonesian_meteor, exact + stem match dengan
+  stemmer afiks Bahasa Indonesia; tanpa NLTK dan tanpa akses jaringan
+
+Requirements (hanya untuk backend nltk):
 - pip install nltk
 - Download NLTK data: nltk.download('wordnet')
 """
@@ -10,29 +15,90 @@ Requirements:
 import os
 import sys
 import json
-import nltk
+import glob
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List
-from nltk.translate.meteor_score import meteor_score
-from nltk.tokenize import word_tokenize
 
 # Tambahkan parent directory ke sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from indonesian_meteor import MeteorScorer, tokenize
+
+# === KONFIGURASI EVALUASI ===
+METEOR_BACKEND = "nltk"               # "nltk" atau "native" (indonesian_meteor, opt-in)
+METEOR_STEMMING = True                # native: stem match Bahasa Indonesia (False = exact saja)
+METEOR_WORKERS = os.cpu_count() or 1  # proses paralel untuk skor per gambar (1 = serial)
+PARALLEL_MIN_PAIRS = {"nltk": 32, "native": 5000}  # di bawah ini biaya start pool lebih besar dari hematnya
+RUNS_DIR = os.path.join(os.path.dirname(__file__), "hasil sementara")
+
+_native_scorers = {}  # per proses: stemming -> MeteorScorer (indeks referensi dipakai ulang)
+
+
+def _init_worker(backend):
+    """Muat WordNet sekali per proses worker, bukan saat gambar pertama."""
+    if backend == "nltk":
+        from nltk.corpus import wordnet
+        wordnet.ensure_loaded()
+
+
+def _score_chunk(task):
+    """
+    Skor sekumpulan pasangan (dijalankan di worker). Token sudah disiapkan
+    di proses utama, jadi worker tidak melakukan tokenisasi.
+
+    Args:
+        task: (backend, stemming, jobs), jobs = [(key, references_tokens, candidate_tokens)]
+
+    Returns:
+        List (key, score, pesan error atau None)
+    """
+    backend, stemming, jobs = task
+    if backend == "native":
+        scorer = _native_scorers.get(stemming)
+        if scorer is None:
+            scorer = _native_scorers[stemming] = MeteorScorer(stemming=stemming)
+        scores = scorer.score_batch([(refs, candidate) for _, refs, candidate in jobs])
+        return [(job[0], score, None) for job, score in zip(jobs, scores)]
+
+    from nltk.translate.meteor_score import meteor_score
+    results = []
+    for key, references_tokens, candidate_tokens in jobs:
+        try:
+            results.append((key, meteor_score(references_tokens, candidate_tokens), None))
+        except Exception as e:
+            results.append((key, 0.0, str(e)))
+    return results
+
 
 class IndonesianMETEOREvaluator:
     """
     Evaluator METEOR untuk bahasa Indonesia
     """
     
-    def __init__(self):
+    def __init__(self, workers: int = None, backend: str = None, stemming: bool = None):
         """
         Initialize evaluator
+        
+        Args:
+            workers: Jumlah proses untuk menghitung skor (default METEOR_WORKERS, 1 = serial)
+            backend: "nltk" atau "native" (default METEOR_BACKEND)
+            stemming: Backend native: aktifkan stem match (default METEOR_STEMMING)
         """
         print("[INFO] Initializing Indonesian METEOR Evaluator...")
-        self._download_nltk_data()
+        self.workers = workers or METEOR_WORKERS
+        self.backend = backend or METEOR_BACKEND
+        self.stemming = METEOR_STEMMING if stemming is None else stemming
+        self._token_cache = {}  # teks -> token, referensi cukup ditokenisasi sekali
+        if self.backend == "nltk":
+            self._download_nltk_data()
+        else:
+            print(f"[INFO] Backend native (stemming {'aktif' if self.stemming else 'nonaktif'}), tanpa data NLTK.")
         
     def _download_nltk_data(self):
-        """Download NLTK data yang diperlukan"""
+        """Download NLTK data yang diperlukan (hanya backend nltk)"""
+        import nltk
+        
         try:
             nltk.data.find('tokenizers/punkt')
         except LookupError:
@@ -61,74 +127,170 @@ class IndonesianMETEOREvaluator:
     
     def preprocess_text(self, text: str) -> List[str]:
         """
-        Preprocess text untuk bahasa Indonesia
+        Preprocess text untuk bahasa Indonesia (hasil disimpan per teks)
         
         Args:
             text: Input text
             
         Returns:
-            List of tokens
+            List of tokens (jangan diubah, dipakai bersama oleh cache)
         """
-        # Lowercase
-        text = text.lower()
-        
-        # Tokenize
-        tokens = word_tokenize(text)
+        tokens = self._token_cache.get(text)
+        if tokens is None:
+            # Lowercase + tokenize
+            if self.backend == "nltk":
+                from nltk.tokenize import word_tokenize
+                tokens = word_tokenize(text.lower())
+            else:
+                tokens = tokenize(text)
+            self._token_cache[text] = tokens
         
         return tokens
     
+    def tokenize_references(self, references: Dict[int, List[str]]) -> Dict[int, List[List[str]]]:
+        """
+        Tokenisasi semua referensi sekali untuk dipakai ulang di banyak run
+        
+        Args:
+            references: Dict {image_id: [ref1, ref2, ...]}
+            
+        Returns:
+            Dict {image_id: [tokens_ref1, tokens_ref2, ...]}
+        """
+        return {image_id: [self.preprocess_text(ref) for ref in captions]
+                for image_id, captions in references.items()}
+    
+    def _build_jobs(self, run, candidates: Dict[int, List[str]],
+                    references_tokens: Dict[int, List[List[str]]]) -> List:
+        """Pasangan (key, referensi, kandidat) untuk satu run; key = (run, image_id)"""
+        jobs = []
+        for image_id in candidates.keys():
+            if image_id not in references_tokens:
+                print(f"[WARNING] Image ID {image_id} tidak ada di references. Skip.")
+                continue
+            
+            candidate_tokens = self.preprocess_text(candidates[image_id][0])  # Ambil caption pertama
+            jobs.append(((run, image_id), references_tokens[image_id], candidate_tokens))
+        return jobs
+    
+    def _score_jobs(self, jobs: List) -> Dict:
+        """
+        Hitung METEOR untuk semua pasangan, di process pool jika cukup banyak
+        
+        Returns:
+            Dict {key: score}
+        """
+        if self.workers > 1 and len(jobs) >= PARALLEL_MIN_PAIRS[self.backend]:
+            size = -(-len(jobs) // (self.workers * 4))
+            tasks = [(self.backend, self.stemming, jobs[k:k + size]) for k in range(0, len(jobs), size)]
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.backend,)) as pool:
+                results = [result for chunk in pool.map(_score_chunk, tasks) for result in chunk]
+        else:
+            results = _score_chunk((self.backend, self.stemming, jobs))
+        
+        scores = {}
+        for key, score, error in results:
+            if error is not None:
+                print(f"[WARNING] Error computing METEOR for image {key[1]}: {error}")
+            scores[key] = score
+        return scores
+    
+    @staticmethod
+    def _summarize(scores: Dict[int, float]) -> Dict:
+        """Skor per gambar -> format hasil (overall, per_image, num_images)"""
+        all_scores = list(scores.values())
+        overall_score = sum(all_scores) / len(all_scores) if all_scores else 0.0
+        
+        return {
+            'overall': overall_score,
+            'per_image': scores,
+            'num_images': len(all_scores)
+        }
+    
     def compute_meteor_score(self, 
                              candidates: Dict[int, List[str]], 
-                             references: Dict[int, List[str]]) -> Dict:
+                             references: Dict[int, List[str]],
+                             verbose: bool = True) -> Dict:
         """
         Hitung METEOR score antara candidates dan references
         
         Args:
             candidates: Dict {image_id: [caption1, ...]}
             references: Dict {image_id: [[ref1, ref2, ref3], ...]}
+            verbose: Print skor per gambar
             
         Returns:
             Dict berisi scores per image dan overall score
         """
+        return self.compute_meteor_scores_many({None: candidates}, references, verbose=verbose)[None]
+    
+    def compute_meteor_scores_many(self,
+                                   runs: Dict[str, Dict[int, List[str]]],
+                                   references: Dict[int, List[str]],
+                                   verbose: bool = True) -> Dict[str, Dict]:
+        """
+        Hitung METEOR untuk banyak run terhadap ground truth yang sama
+        dalam satu pass: referensi ditokenisasi sekali, semua pasangan
+        (run, gambar) diskor bersama di process pool.
+        
+        Args:
+            runs: Dict {nama_run: candidates} (format candidates seperti compute_meteor_score)
+            references: Dict {image_id: [ref1, ref2, ...]}
+            verbose: Print skor per gambar
+            
+        Returns:
+            Dict {nama_run: hasil compute_meteor_score}
+        """
         print("\n[INFO] Computing METEOR scores...")
         
-        scores = {}
-        all_scores = []
+        references_tokens = self.tokenize_references(references)
+        jobs = []
+        for run, candidates in runs.items():
+            jobs.extend(self._build_jobs(run, candidates, references_tokens))
+        scores = self._score_jobs(jobs)
         
-        for image_id in candidates.keys():
-            if image_id not in references:
-                print(f"[WARNING] Image ID {image_id} tidak ada di references. Skip.")
-                continue
-            
-            candidate_caption = candidates[image_id][0]  # Ambil caption pertama
-            reference_captions = references[image_id]
-            
-            # Preprocess candidate
-            candidate_tokens = self.preprocess_text(candidate_caption)
-            
-            # Preprocess references
-            references_tokens = [self.preprocess_text(ref) for ref in reference_captions]
-            
-            # Hitung METEOR score
-            # METEOR menggunakan multiple references
-            try:
-                score = meteor_score(references_tokens, candidate_tokens)
-            except Exception as e:
-                print(f"[WARNING] Error computing METEOR for image {image_id}: {e}")
-                score = 0.0
-            
-            scores[image_id] = score
-            all_scores.append(score)
-            
-            print(f"[INFO] Image {image_id}: METEOR = {score:.4f}")
+        per_run = {run: {} for run in runs}
+        for (run, image_id), score in scores.items():
+            per_run[run][image_id] = score
+            if verbose:
+                label = f"[{run}] " if run is not None else ""
+                print(f"[INFO] {label}Image {image_id}: METEOR = {score:.4f}")
         
-        # Hitung overall score
-        overall_score = sum(all_scores) / len(all_scores) if all_scores else 0.0
+        return {run: self._summarize(per_image) for run, per_image in per_run.items()}
+    
+    @staticmethod
+    def load_candidates(predictions_file: str) -> Dict[int, List[str]]:
+        """
+        Load predictions dari file JSON
         
+        Returns:
+            Dict {image_id: captions}
+        """
+        with open(predictions_file, 'r', encoding='utf-8') as f:
+            predictions_data = json.load(f)
+        
+        # Predictions bisa punya key "predictions" atau "annotations"
+        pred_key = "predictions" if "predictions" in predictions_data else "annotations"
         return {
-            'overall': overall_score,
-            'per_image': scores,
-            'num_images': len(all_scores)
+            item['image_id']: item['captions'] 
+            for item in predictions_data[pred_key]
+        }
+    
+    @staticmethod
+    def load_references(ground_truth_file: str) -> Dict[int, List[str]]:
+        """
+        Load ground truth dari file JSON
+        
+        Returns:
+            Dict {image_id: captions}
+        """
+        with open(ground_truth_file, 'r', encoding='utf-8') as f:
+            ground_truth_data = json.load(f)
+        
+        return {
+            item['image_id']: item['captions'] 
+            for item in ground_truth_data['annotations']
         }
     
     def evaluate_from_files(self, 
@@ -152,26 +314,11 @@ class IndonesianMETEOREvaluator:
         
         # Load predictions
         print(f"\n[INFO] Loading predictions from: {predictions_file}")
-        with open(predictions_file, 'r', encoding='utf-8') as f:
-            predictions_data = json.load(f)
+        candidates = self.load_candidates(predictions_file)
         
         # Load ground truth
         print(f"[INFO] Loading ground truth from: {ground_truth_file}")
-        with open(ground_truth_file, 'r', encoding='utf-8') as f:
-            ground_truth_data = json.load(f)
-        
-        # Convert ke format yang dibutuhkan
-        # Predictions bisa punya key "predictions" atau "annotations"
-        pred_key = "predictions" if "predictions" in predictions_data else "annotations"
-        candidates = {
-            item['image_id']: item['captions'] 
-            for item in predictions_data[pred_key]
-        }
-        
-        references = {
-            item['image_id']: item['captions'] 
-            for item in ground_truth_data['annotations']
-        }
+        references = self.load_references(ground_truth_file)
         
         print(f"[INFO] Loaded {len(candidates)} predictions")
         print(f"[INFO] Loaded {len(references)} ground truth annotations")
@@ -213,6 +360,50 @@ class IndonesianMETEOREvaluator:
             print("[INFO] Results saved successfully!")
         
         return results
+    
+    def evaluate_many(self,
+                      predictions_files: List[str],
+                      ground_truth_file: str,
+                      output_file: str = None) -> Dict[str, Dict]:
+        """
+        Evaluasi banyak file predictions (mis. run di "hasil sementara/")
+        terhadap ground truth yang sama dalam satu pass
+        
+        Args:
+            predictions_files: List path resultText*.json
+            ground_truth_file: Path ke GroundTruth.json
+            output_file: Path untuk menyimpan hasil gabungan (optional)
+            
+        Returns:
+            Dict {nama_file: hasil evaluasi}
+        """
+        print("\n" + "=" * 60)
+        print(f"METEOR EVALUATION - {len(predictions_files)} run")
+        print("=" * 60)
+        
+        print(f"[INFO] Loading ground truth from: {ground_truth_file}")
+        references = self.load_references(ground_truth_file)
+        runs = {}
+        for path in predictions_files:
+            runs[os.path.basename(path)] = self.load_candidates(path)
+            print(f"[INFO] Loaded {len(runs[os.path.basename(path)])} predictions from: {path}")
+        
+        results = self.compute_meteor_scores_many(runs, references, verbose=False)
+        
+        print("\n" + "=" * 60)
+        print("RESULTS")
+        print("=" * 60)
+        print(f"{'run':<24} {'images':>7} {'METEOR':>8}")
+        for run, result in results.items():
+            print(f"{run:<24} {result['num_images']:>7} {result['overall']:>8.4f}")
+        
+        if output_file:
+            print(f"\n[INFO] Saving results to: {output_file}")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print("[INFO] Results saved successfully!")
+        
+        return results
 
 
 def main():
@@ -223,11 +414,32 @@ def main():
     PREDICTIONS_FILE = os.path.join(TEST_DIR, "resultText.json")
     GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruthAsli.json")
     OUTPUT_FILE = os.path.join(TEST_DIR, "meteor_results.json")
+    RUNS_OUTPUT_FILE = os.path.join(TEST_DIR, "meteor_results_runs.json")
+    
+    parser = argparse.ArgumentParser(description="Evaluasi METEOR Bahasa Indonesia")
+    parser.add_argument("predictions", nargs="*",
+                        help="file predictions (default: resultText.json); lebih dari satu = satu pass")
+    parser.add_argument("--runs", nargs="?", const=RUNS_DIR, default=None, metavar="DIR",
+                        help="evaluasi semua resultText*.json di DIR (default: hasil sementara/)")
+    parser.add_argument("--workers", type=int, default=METEOR_WORKERS,
+                        help="jumlah proses untuk skor per gambar (1 = serial)")
+    parser.add_argument("--backend", choices=["native", "nltk"], default=METEOR_BACKEND,
+                        help="native: stemmer Indonesia, offline; nltk: NLTK + WordNet")
+    parser.add_argument("--no-stem", action="store_true",
+                        help="backend native: exact match saja")
+    args = parser.parse_args()
+    
+    predictions_files = list(args.predictions)
+    if args.runs:
+        predictions_files += sorted(glob.glob(os.path.join(args.runs, "resultText*.json")))
+    if not predictions_files:
+        predictions_files = [PREDICTIONS_FILE]
     
     # Cek apakah file ada
-    if not os.path.exists(PREDICTIONS_FILE):
-        print(f"[ERROR] File predictions tidak ditemukan: {PREDICTIONS_FILE}")
-        return
+    for path in predictions_files:
+        if not os.path.exists(path):
+            print(f"[ERROR] File predictions tidak ditemukan: {path}")
+            return
     
     if not os.path.exists(GROUND_TRUTH_FILE):
         print(f"[ERROR] File ground truth tidak ditemukan: {GROUND_TRUTH_FILE}")
@@ -235,18 +447,22 @@ def main():
     
     # Inisialisasi evaluator
     try:
-        evaluator = IndonesianMETEOREvaluator()
+        evaluator = IndonesianMETEOREvaluator(workers=args.workers, backend=args.backend,
+                                              stemming=not args.no_stem)
     except Exception as e:
         print(f"[ERROR] Gagal inisialisasi evaluator: {e}")
         return
     
     # Jalankan evaluasi
     try:
-        results = evaluator.evaluate_from_files(
-            PREDICTIONS_FILE,
-            GROUND_TRUTH_FILE,
-            OUTPUT_FILE
-        )
+        if len(predictions_files) == 1:
+            evaluator.evaluate_from_files(
+                predictions_files[0],
+                GROUND_TRUTH_FILE,
+                OUTPUT_FILE
+            )
+        else:
+            evaluator.evaluate_many(predictions_files, GROUND_TRUTH_FILE, RUNS_OUTPUT_FILE)
         
         print("\n" + "=" * 60)
         print("EVALUATION COMPLETED SUCCESSFULLY!")
@@ -0,0 +1,388 @@
+"""
+Evaluasi multi-metrik dalam satu pass: BLEU-1..4, ROUGE-L, CIDEr, METEOR
+(dan SPICE-style opsional) untuk caption Bahasa Indonesia.
+
+Ground truth dimuat dan ditokenisasi sekali. Tabel bersama dibangun di awal:
+- n-gram (1-4) per caption, dipakai BLEU dan CIDEr
+- jumlah n-gram maksimum per gambar (clipping BLEU)
+- document frequency n-gram atas seluruh korpus referensi + vektor TF-IDF
+  referensi (CIDEr)
+- token referensi METEOR: NLTK (default, sama dengan evaluate_meteor.py) atau
+  indeks kata indonesian_meteor (--backend native)
+
+Setiap run predictions lalu dinilai semua metriknya sekaligus. Rumus BLEU,
+ROUGE-L dan CIDEr mengikuti pycocoevalcap (COCO caption evaluation).
+
+    cd test
+    python evaluate_metrics.py                    # resultText.json
+    python evaluate_metrics.py --runs             # semua run di "hasil sementara/"
+    python evaluate_metrics.py --compare          # bandingkan waktu vs metrik terpisah
+    python evaluate_metrics.py --backend native   # METEOR tanpa NLTK
+"""
+
+import os
+import sys
+import json
+import glob
+import math
+import time
+import argparse
+from collections import Counter
+from typing import Dict, List, Sequence
+
+# Tambahkan parent directory ke sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from indonesian_meteor import MeteorScorer, tokenize
+from evaluate_meteor import IndonesianMETEOREvaluator, METEOR_BACKEND, RUNS_DIR
+
+# === KONFIGURASI EVALUASI ===
+METRICS = ["BLEU", "ROUGE-L", "CIDEr", "METEOR"]  # tambahkan "SPICE" untuk proposisi
+MAX_N = 4            # n-gram terpanjang untuk BLEU dan CIDEr
+ROUGE_BETA = 1.2     # bobot recall ROUGE-L (nilai COCO)
+METEOR_STEMMING = True
+
+BLEU_TINY = 1e-15    # smoothing BLEU per gambar (nilai COCO)
+BLEU_SMALL = 1e-9
+
+
+def ngram_counts(tokens: Sequence[str], max_n: int = MAX_N) -> Counter:
+    """Semua n-gram 1..max_n dari satu caption (key = tuple token)"""
+    counts = Counter()
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            counts[tuple(tokens[i:i + n])] += 1
+    return counts
+
+
+def lcs_length(a: Sequence[str], b: Sequence[str]) -> int:
+    """Panjang longest common subsequence (DP satu baris)"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+class _Caption:
+    """Token + tabel n-gram satu caption (dihitung sekali)"""
+
+    __slots__ = ("tokens", "counts", "cider_vec", "cider_norm", "cider_length")
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.counts = ngram_counts(self.tokens)
+        self.cider_vec = self.cider_norm = self.cider_length = None
+
+
+class CaptionMetricsEngine:
+    """
+    Mesin evaluasi multi-metrik. Referensi (ground truth) diproses sekali
+    di konstruktor; score() bisa dipanggil untuk banyak run.
+    """
+
+    def __init__(self, references: Dict[int, List[str]], metrics: List[str] = None,
+                 stemming: bool = METEOR_STEMMING, backend: str = None):
+        """
+        Args:
+            references: Dict {image_id: [ref1, ref2, ...]}
+            metrics: Subset METRICS (+ "SPICE"); default METRICS
+            stemming: METEOR native: aktifkan stem match
+            backend: METEOR "nltk" atau "native" (default METEOR_BACKEND,
+                     sama dengan evaluate_meteor.py)
+        """
+        self.metrics = list(metrics or METRICS)
+        self.meteor_backend = backend or METEOR_BACKEND
+        self._captions = {}  # teks -> _Caption (kandidat yang sama tidak diproses ulang)
+        self.references = {image_id: [self._caption(ref) for ref in refs]
+                           for image_id, refs in references.items()}
+        self.reference_texts = references
+
+        # Clipping BLEU: jumlah maksimum tiap n-gram di antara referensi satu gambar
+        self._max_ref_counts = {}
+        for image_id, refs in self.references.items():
+            max_counts = Counter()
+            for ref in refs:
+                max_counts |= ref.counts
+            self._max_ref_counts[image_id] = max_counts
+
+        # CIDEr: document frequency = jumlah gambar yang referensinya memuat n-gram
+        self._document_frequency = Counter()
+        for refs in self.references.values():
+            self._document_frequency.update(set(ngram for ref in refs for ngram in ref.counts))
+        self._log_num_images = math.log(float(len(self.references))) if self.references else 0.0
+        for refs in self.references.values():
+            for ref in refs:
+                self._cider_vector(ref)
+
+        # METEOR: backend nltk lewat IndonesianMETEOREvaluator (tokenisasi NLTK),
+        # backend native memakai token yang sama dengan BLEU/ROUGE-L/CIDEr
+        self._meteor = self._meteor_evaluator = None
+        if "METEOR" in self.metrics:
+            if self.meteor_backend == "native":
+                self._meteor = MeteorScorer(stemming=stemming)
+                for refs in self.references.values():
+                    for ref in refs:
+                        self._meteor.prepare(ref.tokens)
+            else:
+                self._meteor_evaluator = IndonesianMETEOREvaluator(backend=self.meteor_backend)
+
+    def _caption(self, text: str) -> _Caption:
+        caption = self._captions.get(text)
+        if caption is None:
+            caption = self._captions[text] = _Caption(text)
+        return caption
+
+    # --- CIDEr ---
+    def _cider_vector(self, caption: _Caption):
+        """Vektor TF-IDF per n (seperti pycocoevalcap counts2vec), disimpan di caption"""
+        if caption.cider_vec is not None:
+            return
+        vec = [{} for _ in range(MAX_N)]
+        norm = [0.0] * MAX_N
+        length = 0
+        for ngram, term_freq in caption.counts.items():
+            n = len(ngram) - 1
+            df = math.log(max(1.0, self._document_frequency[ngram]))
+            vec[n][ngram] = float(term_freq) * (self._log_num_images - df)
+            norm[n] += vec[n][ngram] ** 2
+            if n == 1:
+                length += term_freq
+        caption.cider_vec = vec
+        caption.cider_norm = [math.sqrt(x) for x in norm]
+        caption.cider_length = length
+
+    def _cider(self, candidate: _Caption, refs: List[_Caption]) -> float:
+        self._cider_vector(candidate)
+        total = 0.0
+        for ref in refs:
+            for n in range(MAX_N):
+                ref_vec = ref.cider_vec[n]
+                val = sum(weight * ref_vec.get(ngram, 0.0) for ngram, weight in candidate.cider_vec[n].items())
+                if candidate.cider_norm[n] != 0 and ref.cider_norm[n] != 0:
+                    val /= candidate.cider_norm[n] * ref.cider_norm[n]
+                total += val
+        return total / MAX_N / len(refs) * 10.0
+
+    # --- BLEU ---
+    def _bleu_stats(self, image_id, candidate: _Caption, refs: List[_Caption]) -> Dict:
+        """Statistik BLEU satu gambar: match terklip dan tebakan per n, panjang kandidat/referensi"""
+        test_len = len(candidate.tokens)
+        ref_len = min((abs(len(ref.tokens) - test_len), len(ref.tokens)) for ref in refs)[1]
+        max_counts = self._max_ref_counts[image_id]
+        correct = [0] * MAX_N
+        for ngram, count in candidate.counts.items():
+            correct[len(ngram) - 1] += min(count, max_counts.get(ngram, 0))
+        guess = [max(0, test_len - n) for n in range(MAX_N)]
+        return {'correct': correct, 'guess': guess, 'test_len': test_len, 'ref_len': ref_len}
+
+    @staticmethod
+    def _bleu_from_stats(stats: Dict) -> List[float]:
+        """BLEU-1..4 dari statistik (per gambar atau jumlah korpus)"""
+        scores = []
+        bleu = 1.0
+        ratio = (stats['test_len'] + BLEU_TINY) / (stats['ref_len'] + BLEU_SMALL)
+        for k in range(MAX_N):
+            bleu *= (stats['correct'][k] + BLEU_TINY) / (stats['guess'][k] + BLEU_SMALL)
+            score = bleu ** (1.0 / (k + 1))
+            if ratio < 1:
+                score *= math.exp(1 - 1 / ratio)
+            scores.append(score)
+        return scores
+
+    # --- ROUGE-L ---
+    @staticmethod
+    def _rouge_l(candidate: _Caption, refs: List[_Caption]) -> float:
+        if not candidate.tokens:
+            return 0.0
+        precisions, recalls = [], []
+        for ref in refs:
+            lcs = lcs_length(candidate.tokens, ref.tokens)
+            precisions.append(lcs / len(candidate.tokens))
+            recalls.append(lcs / len(ref.tokens) if ref.tokens else 0.0)
+        prec_max, rec_max = max(precisions), max(recalls)
+        if prec_max == 0 or rec_max == 0:
+            return 0.0
+        return ((1 + ROUGE_BETA ** 2) * prec_max * rec_max) / (rec_max + ROUGE_BETA ** 2 * prec_max)
+
+    def score(self, candidates: Dict[int, List[str]]) -> Dict:
+        """
+        Hitung semua metrik untuk satu run
+
+        Args:
+            candidates: Dict {image_id: [caption1, ...]} (caption pertama dipakai)
+
+        Returns:
+            Dict {'corpus': {metrik: skor}, 'per_image': {image_id: {metrik: skor}}, 'num_images'}
+            (+ 'meteor_backend' jika METEOR dihitung)
+        """
+        per_image = {}
+        meteor_candidates = {}  # backend nltk: diskor sekaligus setelah loop
+        bleu_total = {'correct': [0] * MAX_N, 'guess': [0] * MAX_N, 'test_len': 0, 'ref_len': 0}
+
+        for image_id, captions in candidates.items():
+            refs = self.references.get(image_id)
+            if not refs:
+                print(f"[WARNING] Image ID {image_id} tidak ada di references. Skip.")
+                continue
+            candidate = self._caption(captions[0])
+            scores = {}
+
+            if "BLEU" in self.metrics:
+                stats = self._bleu_stats(image_id, candidate, refs)
+                for k, value in enumerate(self._bleu_from_stats(stats), 1):
+                    scores[f"BLEU-{k}"] = value
+                for key in ('correct', 'guess'):
+                    bleu_total[key] = [a + b for a, b in zip(bleu_total[key], stats[key])]
+                bleu_total['test_len'] += stats['test_len']
+                bleu_total['ref_len'] += stats['ref_len']
+            if "ROUGE-L" in self.metrics:
+                scores["ROUGE-L"] = self._rouge_l(candidate, refs)
+            if "CIDEr" in self.metrics:
+                scores["CIDEr"] = self._cider(candidate, refs)
+            if "METEOR" in self.metrics:
+                if self._meteor is not None:
+                    scores["METEOR"] = self._meteor.score([ref.tokens for ref in refs], candidate.tokens)
+                else:
+                    scores["METEOR"] = None  # urutan kolom dijaga, diisi setelah loop
+                    meteor_candidates[image_id] = captions
+            if "SPICE" in self.metrics:
+                from evaluate_spice import _score_image
+                scores["SPICE"] = _score_image((image_id, captions[0], tuple(self.reference_texts[image_id])))[1]
+
+            per_image[image_id] = scores
+
+        if meteor_candidates:
+            meteor = self._meteor_evaluator.compute_meteor_score(
+                meteor_candidates, self.reference_texts, verbose=False)
+            for image_id, value in meteor['per_image'].items():
+                per_image[image_id]["METEOR"] = value
+
+        # Korpus: BLEU dari statistik gabungan (seperti COCO), metrik lain = rata-rata per gambar
+        corpus = {}
+        names = list(next(iter(per_image.values()))) if per_image else []
+        for name in names:
+            corpus[name] = sum(scores[name] for scores in per_image.values()) / len(per_image)
+        if "BLEU" in self.metrics and per_image:
+            for k, value in enumerate(self._bleu_from_stats(bleu_total), 1):
+                corpus[f"BLEU-{k}"] = value
+
+        result = {'corpus': corpus, 'per_image': per_image, 'num_images': len(per_image)}
+        if "METEOR" in self.metrics:
+            result['meteor_backend'] = self.meteor_backend
+        return result
+
+
+def evaluate_runs(predictions_files: List[str], ground_truth_file: str,
+                  metrics: List[str] = None, backend: str = None) -> Dict[str, Dict]:
+    """
+    Muat ground truth sekali, lalu nilai semua file predictions.
+
+    Returns:
+        Dict {nama_file: hasil CaptionMetricsEngine.score}
+    """
+    engine = CaptionMetricsEngine(IndonesianMETEOREvaluator.load_references(ground_truth_file), metrics,
+                                  backend=backend)
+    return {os.path.basename(path): engine.score(IndonesianMETEOREvaluator.load_candidates(path))
+            for path in predictions_files}
+
+
+def evaluate_separately(predictions_files: List[str], ground_truth_file: str,
+                        metrics: List[str] = None, backend: str = None) -> Dict[str, Dict]:
+    """
+    Pembanding: satu metrik per "script" - setiap metrik memuat ulang file
+    dan mentokenisasi ulang semua caption, seperti menjalankan evaluator
+    terpisah. Hasil digabung ke format yang sama dengan evaluate_runs.
+    """
+    results = {}
+    for metric in metrics or METRICS:
+        for path in predictions_files:
+            engine = CaptionMetricsEngine(IndonesianMETEOREvaluator.load_references(ground_truth_file), [metric],
+                                          backend=backend)
+            result = engine.score(IndonesianMETEOREvaluator.load_candidates(path))
+            merged = results.setdefault(os.path.basename(path), {'corpus': {}, 'per_image': {},
+                                                                 'num_images': result['num_images']})
+            merged['corpus'].update(result['corpus'])
+            if 'meteor_backend' in result:
+                merged['meteor_backend'] = result['meteor_backend']
+            for image_id, scores in result['per_image'].items():
+                merged['per_image'].setdefault(image_id, {}).update(scores)
+    return results
+
+
+def print_results(results: Dict[str, Dict]):
+    """Tabel skor korpus per run"""
+    names = list(next(iter(results.values()))['corpus'])
+    print("\n" + "=" * 60)
+    print("RESULTS (korpus)")
+    print("=" * 60)
+    print(f"{'run':<20} " + " ".join(f"{name:>8}" for name in names))
+    for run, result in results.items():
+        print(f"{run:<20} " + " ".join(f"{result['corpus'][name]:>8.4f}" for name in names))
+
+
+def main():
+    """Main function untuk menjalankan evaluasi"""
+
+    # Konfigurasi paths
+    TEST_DIR = os.path.dirname(__file__)
+    PREDICTIONS_FILE = os.path.join(TEST_DIR, "resultText.json")
+    GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruthAsli.json")
+    OUTPUT_FILE = os.path.join(TEST_DIR, "metrics_results.json")
+
+    parser = argparse.ArgumentParser(description="Evaluasi BLEU, ROUGE-L, CIDEr, METEOR dalam satu pass")
+    parser.add_argument("predictions", nargs="*", help="file predictions (default: resultText.json)")
+    parser.add_argument("--runs", nargs="?", const=RUNS_DIR, default=None, metavar="DIR",
+                        help="evaluasi semua resultText*.json di DIR (default: hasil sementara/)")
+    parser.add_argument("--metrics", default=",".join(METRICS),
+                        help=f"daftar metrik dipisah koma (default: {','.join(METRICS)}; tersedia juga SPICE)")
+    parser.add_argument("--compare", action="store_true",
+                        help="bandingkan waktu satu pass vs metrik dijalankan terpisah")
+    parser.add_argument("--backend", choices=["native", "nltk"], default=METEOR_BACKEND,
+                        help=f"backend METEOR (default: {METEOR_BACKEND}, sama dengan evaluate_meteor.py)")
+    args = parser.parse_args()
+
+    predictions_files = list(args.predictions)
+    if args.runs:
+        predictions_files += sorted(glob.glob(os.path.join(args.runs, "resultText*.json")))
+    if not predictions_files:
+        predictions_files = [PREDICTIONS_FILE]
+    metrics = [m.strip() for m in args.metrics.split(",") if m.strip()]
+
+    for path in predictions_files + [GROUND_TRUTH_FILE]:
+        if not os.path.exists(path):
+            print(f"[ERROR] File tidak ditemukan: {path}")
+            return
+
+    print("=" * 60)
+    print(f"MULTI-METRIC EVALUATION - {len(predictions_files)} run, {', '.join(metrics)} (METEOR {args.backend})")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    results = evaluate_runs(predictions_files, GROUND_TRUTH_FILE, metrics, args.backend)
+    t_single = time.perf_counter() - start
+    print_results(results)
+    print(f"\n[METRIC] Satu pass: {t_single:.3f}s")
+
+    if args.compare:
+        start = time.perf_counter()
+        separate = evaluate_separately(predictions_files, GROUND_TRUTH_FILE, metrics, args.backend)
+        t_separate = time.perf_counter() - start
+        max_diff = max(abs(results[run]['per_image'][i][name] - separate[run]['per_image'][i][name])
+                       for run in results for i in results[run]['per_image']
+                       for name in results[run]['per_image'][i])
+        print(f"[METRIC] Metrik terpisah: {t_separate:.3f}s ({t_separate / t_single:.2f}x lebih lambat)")
+        print(f"[METRIC] Selisih skor maksimum: {max_diff:.2e}")
+
+    print(f"\n[INFO] Saving results to: {OUTPUT_FILE}")
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print("[INFO] Results saved successfully!")
+
+
+if __name__ == "__main__":
+    main()
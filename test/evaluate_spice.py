@@ -0,0 +1,348 @@
+"""
+SPICE-style Evaluation untuk Bahasa Indonesia (berbasis aturan, offline)
+
+SPICE asli mem-parse caption menjadi scene graph (Stanford parser, Java)
+lalu menghitung F-score atas proposisi semantik. Versi ini memakai parser
+aturan sederhana untuk Bahasa Indonesia:
+- objek      : kata benda, mis. ("pria",)
+- atribut    : (objek, sifat/jumlah/keadaan), mis. ("tiang", "miring"), ("pria", "dua")
+- relasi     : (subjek, preposisi/kata kerja, objek), mis. ("pria", "di", "trotoar")
+
+Kata dinormalisasi dengan stemmer afiks indonesian_meteor (pengganti
+sinonim WordNet di SPICE asli). Proposisi referensi digabung per gambar;
+skor = F1 antara proposisi kandidat dan gabungan referensi.
+
+Tanpa Java, tanpa Stanza, tanpa akses jaringan. Hasil disimpan ke
+spice_results.json dengan format yang dibaca analyze_results.py:
+{"overall": ..., "per_image": {"1": ...}, "num_images": ...}
+"""
+
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple
+
+# Tambahkan parent directory ke sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from indonesian_meteor import stem, tokenize
+
+# === KONFIGURASI EVALUASI ===
+SPICE_WORKERS = os.cpu_count() or 1  # proses paralel untuk skor per gambar (1 = serial)
+PARALLEL_MIN_IMAGES = 200            # di bawah ini biaya start pool lebih besar dari hematnya
+
+# === LEKSIKON PARSER ===
+# Kata fungsi yang tidak membentuk proposisi
+STOPWORDS = {
+    "ini", "itu", "adalah", "ialah", "merupakan", "ada", "terdapat", "tampak", "terlihat",
+    "yang", "dan", "atau", "serta", "juga", "sedang", "sementara", "namun", "tetapi", "tapi",
+    "sambil", "saat", "ketika", "karena", "sehingga", "agar", "bisa", "dapat", "akan", "sudah",
+    "masih", "cukup", "sangat", "agak", "lebih", "paling", "secara", "tidak", "tanpa", "bagi",
+    "untuk", "oleh", "tersebut", "seperti", "hanya", "pula", "lagi", "mungkin", "tampaknya",
+    "suasana", "kondisi", "lingkungan", "gambar", "foto", "langsung", "jelas",
+}
+# Preposisi: membentuk relasi (subjek, preposisi, objek). Berurutan digabung: "di depan"
+PREPOSITIONS = {
+    "di", "ke", "dari", "pada", "dekat", "atas", "bawah", "samping", "depan", "belakang",
+    "dalam", "luar", "sebelah", "antara", "sekitar", "sepanjang", "dengan", "menuju", "tepi",
+    "sisi", "ujung", "tengah", "kiri", "kanan",
+}
+# Kata jumlah: atribut objek berikutnya
+QUANTIFIERS = {
+    "seorang", "sebuah", "seekor", "sebatang", "satu", "dua", "tiga", "empat", "lima", "enam",
+    "tujuh", "delapan", "sembilan", "sepuluh", "beberapa", "banyak", "sejumlah", "para", "semua",
+    "setiap", "berbagai",
+}
+# Kata sifat umum di caption (warna, ukuran, keadaan): atribut objek sebelumnya
+ADJECTIVES = {
+    "besar", "kecil", "tinggi", "rendah", "panjang", "pendek", "lebar", "sempit", "luas", "tebal",
+    "tipis", "merah", "putih", "hitam", "biru", "hijau", "kuning", "coklat", "cokelat", "abu-abu",
+    "oranye", "ungu", "gelap", "terang", "cerah", "redup", "licin", "basah", "kering", "bersih",
+    "kotor", "rapi", "berantakan", "ramai", "sepi", "tenang", "padat", "kosong", "penuh", "miring",
+    "rusak", "retak", "rata", "curam", "tua", "muda", "baru", "lama", "modern", "aman", "berbahaya",
+    "terbuka", "tertutup", "parkir", "mengkilap", "teduh", "rimbun", "sejuk",
+}
+VERB_PREFIXES = ("me", "ber", "ter", "di")
+NOT_VERBS = {"dinding", "diri", "dingin", "dia", "dimana", "meja", "menit", "meter", "beranda",
+             "bertiga", "terminal", "teras", "merek"}
+
+Proposition = Tuple[str, ...]
+
+
+def _is_verb(word: str) -> bool:
+    """Kata kerja berimbuhan: prefiks me-/ber-/ter-/di- yang dilepas stemmer"""
+    return (word.startswith(VERB_PREFIXES) and word not in NOT_VERBS
+            and "-" not in word and stem(word) != word)
+
+
+@lru_cache(maxsize=16384)
+def parse_caption(text: str) -> FrozenSet[Proposition]:
+    """
+    Caption -> himpunan proposisi (objek, atribut, relasi), kata sudah di-stem.
+    Hasil disimpan per caption (per proses), sehingga referensi yang sama
+    tidak di-parse ulang untuk setiap run.
+    """
+    propositions = set()
+    subject = None       # objek terakhir (subjek relasi berikutnya)
+    head = None          # kepala frasa benda yang sedang dibaca ("trotoar batu" -> trotoar)
+    relation = []        # preposisi / kata kerja yang menunggu objek
+    quantities = []      # kata jumlah yang menunggu objek
+
+    def close_clause():
+        # Kata kerja tanpa objek menjadi atribut subjek ("pria berdiri")
+        if subject is not None and relation and not any(w in PREPOSITIONS for w in relation):
+            propositions.add((subject, " ".join(relation)))
+
+    for token in tokenize(text):
+        if token in (".", "!", "?", ";", ":"):
+            close_clause()
+            subject = head = None
+            relation, quantities = [], []
+            continue
+        if not any(ch.isalnum() for ch in token):  # koma, kutip, dll.
+            close_clause()
+            head = None
+            relation = []
+            continue
+        if token.endswith("nya") and token[:-3] in PREPOSITIONS:
+            relation = []  # "di dekatnya": objeknya kata ganti, tidak ada proposisi
+            head = None
+            continue
+        if token in STOPWORDS:
+            head = None
+            continue
+        if token in QUANTIFIERS or token.isdigit():
+            quantities.append(token)
+            head = None
+            continue
+        if token in PREPOSITIONS:
+            if head is not None and not relation and token in ("kiri", "kanan", "tengah"):
+                propositions.add((head, token))  # "sisi kanan" -> atribut
+                continue
+            if relation and not any(w in PREPOSITIONS for w in relation):
+                close_clause()  # "berdiri di trotoar" -> (pria, diri) + (pria, di, trotoar)
+                relation = []
+            relation.append(token)
+            head = None
+            continue
+        if token in ADJECTIVES:
+            if subject is not None:
+                propositions.add((subject, stem(token)))
+            continue
+        if _is_verb(token):
+            if token == "berwarna":  # "berwarna abu-abu" -> atribut warna saja
+                continue
+            relation = [w for w in relation if w not in PREPOSITIONS] + [stem(token)]
+            head = None
+            continue
+
+        # Kata benda
+        noun = stem(token)
+        if head is not None:
+            propositions.add((head, noun))  # pewatas kata benda: "kantor" pada "lorong kantor"
+            continue
+        propositions.add((noun,))
+        for quantity in quantities:
+            propositions.add((noun, quantity))
+        if subject is not None and relation:
+            propositions.add((subject, " ".join(relation), noun))
+        quantities, relation = [], []
+        subject = head = noun
+
+    close_clause()
+    return frozenset(propositions)
+
+
+def f1_score(candidate: FrozenSet[Proposition], reference: FrozenSet[Proposition]) -> float:
+    """F1 antara proposisi kandidat dan referensi (0 jika salah satu kosong)"""
+    matched = len(candidate & reference)
+    if not matched:
+        return 0.0
+    precision = matched / len(candidate)
+    recall = matched / len(reference)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _score_image(job):
+    """
+    Skor satu gambar (dijalankan di worker): parse kandidat + referensi
+    (cache per proses), gabungkan proposisi referensi, hitung F1.
+
+    Args:
+        job: (image_id, candidate_caption, reference_captions)
+
+    Returns:
+        (image_id, score)
+    """
+    image_id, candidate, references = job
+    reference = frozenset().union(*(parse_caption(ref) for ref in references))
+    return image_id, f1_score(parse_caption(candidate), reference)
+
+
+class IndonesianSPICEEvaluator:
+    """
+    Evaluator SPICE-style berbasis aturan untuk bahasa Indonesia
+    """
+
+    def __init__(self, workers: int = None):
+        """
+        Initialize evaluator
+
+        Args:
+            workers: Jumlah proses untuk menghitung skor (default SPICE_WORKERS, 1 = serial)
+        """
+        print("[INFO] Initializing Indonesian SPICE Evaluator (rule-based, offline)...")
+        self.workers = workers or SPICE_WORKERS
+
+    def compute_spice_score(self,
+                            candidates: Dict[int, List[str]],
+                            references: Dict[int, List[str]],
+                            verbose: bool = True) -> Dict:
+        """
+        Hitung skor SPICE-style antara candidates dan references
+
+        Args:
+            candidates: Dict {image_id: [caption1, ...]}
+            references: Dict {image_id: [ref1, ref2, ...]}
+            verbose: Print skor per gambar
+
+        Returns:
+            Dict {'overall', 'per_image', 'num_images'} (format analyze_results.py)
+        """
+        print("\n[INFO] Computing SPICE scores...")
+
+        jobs = []
+        for image_id in candidates.keys():
+            if image_id not in references:
+                print(f"[WARNING] Image ID {image_id} tidak ada di references. Skip.")
+                continue
+            jobs.append((image_id, candidates[image_id][0], tuple(references[image_id])))
+
+        if self.workers > 1 and len(jobs) >= PARALLEL_MIN_IMAGES:
+            chunksize = max(1, len(jobs) // (self.workers * 4))
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_score_image, jobs, chunksize=chunksize))
+        else:
+            results = [_score_image(job) for job in jobs]
+
+        scores = {}
+        for image_id, score in results:
+            scores[image_id] = score
+            if verbose:
+                print(f"[INFO] Image {image_id}: SPICE = {score:.4f}")
+
+        all_scores = list(scores.values())
+        return {
+            'overall': sum(all_scores) / len(all_scores) if all_scores else 0.0,
+            'per_image': scores,
+            'num_images': len(all_scores)
+        }
+
+    def evaluate_from_files(self,
+                            predictions_file: str,
+                            ground_truth_file: str,
+                            output_file: str = None) -> Dict:
+        """
+        Evaluasi dari file JSON
+
+        Args:
+            predictions_file: Path ke resultText.json
+            ground_truth_file: Path ke GroundTruth.json
+            output_file: Path untuk menyimpan hasil evaluasi (optional)
+
+        Returns:
+            Dict berisi hasil evaluasi
+        """
+        print("\n" + "=" * 60)
+        print("SPICE EVALUATION - Bahasa Indonesia (rule-based)")
+        print("=" * 60)
+
+        print(f"\n[INFO] Loading predictions from: {predictions_file}")
+        with open(predictions_file, 'r', encoding='utf-8') as f:
+            predictions_data = json.load(f)
+        print(f"[INFO] Loading ground truth from: {ground_truth_file}")
+        with open(ground_truth_file, 'r', encoding='utf-8') as f:
+            ground_truth_data = json.load(f)
+
+        # Predictions bisa punya key "predictions" atau "annotations"
+        pred_key = "predictions" if "predictions" in predictions_data else "annotations"
+        candidates = {item['image_id']: item['captions'] for item in predictions_data[pred_key]}
+        references = {item['image_id']: item['captions'] for item in ground_truth_data['annotations']}
+
+        print(f"[INFO] Loaded {len(candidates)} predictions")
+        print(f"[INFO] Loaded {len(references)} ground truth annotations")
+
+        results = self.compute_spice_score(candidates, references)
+
+        print("\n" + "=" * 60)
+        print("RESULTS")
+        print("=" * 60)
+        print(f"Overall SPICE Score: {results['overall']:.4f}")
+        print(f"Number of images evaluated: {results['num_images']}")
+
+        if output_file:
+            print(f"\n[INFO] Saving results to: {output_file}")
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            print("[INFO] Results saved successfully!")
+
+        return results
+
+
+def main():
+    """Main function untuk menjalankan evaluasi"""
+
+    # Konfigurasi paths
+    TEST_DIR = os.path.dirname(__file__)
+    PREDICTIONS_FILE = os.path.join(TEST_DIR, "resultText.json")
+    GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruthAsli.json")
+    OUTPUT_FILE = os.path.join(TEST_DIR, "spice_results.json")
+
+    parser = argparse.ArgumentParser(description="Evaluasi SPICE-style Bahasa Indonesia (offline)")
+    parser.add_argument("--predictions", default=PREDICTIONS_FILE, help="file predictions")
+    parser.add_argument("--ground-truth", default=GROUND_TRUTH_FILE, help="file ground truth")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="file hasil (dibaca analyze_results.py)")
+    parser.add_argument("--workers", type=int, default=SPICE_WORKERS,
+                        help="jumlah proses untuk skor per gambar (1 = serial)")
+    parser.add_argument("--show", type=int, default=None, metavar="IMAGE_ID",
+                        help="tampilkan proposisi hasil parse untuk satu gambar lalu keluar")
+    args = parser.parse_args()
+
+    for path in (args.predictions, args.ground_truth):
+        if not os.path.exists(path):
+            print(f"[ERROR] File tidak ditemukan: {path}")
+            return
+
+    evaluator = IndonesianSPICEEvaluator(workers=args.workers)
+
+    if args.show is not None:
+        with open(args.predictions, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        pred_key = "predictions" if "predictions" in data else "annotations"
+        caption = next((item['captions'][0] for item in data[pred_key] if item['image_id'] == args.show), None)
+        if caption is None:
+            print(f"[ERROR] Image {args.show} tidak ditemukan di {args.predictions}")
+            return
+        print(f"\n{caption}\n")
+        for proposition in sorted(parse_caption(caption), key=lambda p: (len(p), p)):
+            print(f"  {proposition}")
+        return
+
+    try:
+        evaluator.evaluate_from_files(args.predictions, args.ground_truth, args.output)
+
+        print("\n" + "=" * 60)
+        print("EVALUATION COMPLETED SUCCESSFULLY!")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERROR] Evaluasi gagal: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Tahap-tahap palsu (fake) untuk menguji pipeline tanpa hardware:
+tanpa kamera, tanpa model Piper, tanpa speaker.
+"""
+
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 22050  # sama dengan id_ID-news_tts-medium.onnx.json
+
+
+class FakeAudioChunk:
+    """Pengganti piper.AudioChunk (hanya field yang dipakai pipeline)."""
+
+    def __init__(self, audio_int16_bytes, sample_rate=SAMPLE_RATE):
+        self.audio_int16_bytes = audio_int16_bytes
+        self.sample_rate = sample_rate
+        self.sample_width = 2
+        self.sample_channels = 1
+
+
+class FakeVoiceConfig:
+    """Pengganti PiperConfig: field yang dibaca pipeline dan key cache audio."""
+
+    def __init__(self, sample_rate=SAMPLE_RATE, length_scale=1.0):
+        self.sample_rate = sample_rate
+        self.length_scale = length_scale
+
+
+class FakeVoice:
+    """
+    Pengganti PiperVoice: menghasilkan audio dengan durasi sebanding
+    panjang teks, setelah jeda sintesis buatan. Audio dipecah menjadi
+    `chunks` potongan; potongan ke-k berisi sampel bernilai k (potongan
+    pertama hening) supaya urutan penyambungan bisa diperiksa.
+    """
+
+    def __init__(self, synth_sec_per_char=0.002, audio_sec_per_char=0.06, chunks=1,
+                 sample_rate=SAMPLE_RATE, length_scale=1.0):
+        self.synth_sec_per_char = synth_sec_per_char
+        self.audio_sec_per_char = audio_sec_per_char
+        self.chunks = chunks
+        self.config = FakeVoiceConfig(sample_rate, length_scale)
+        self.synth_calls = 0
+
+    def synthesize(self, text):
+        self.synth_calls += 1
+        time.sleep(self.synth_sec_per_char * len(text))
+        n_samples = int(self.config.sample_rate * self.audio_sec_per_char * len(text))
+        per_chunk = n_samples // self.chunks
+        for k in range(self.chunks):
+            yield FakeAudioChunk(bytes([k % 256, 0]) * per_chunk, self.config.sample_rate)
+
+    def synthesize_wav(self, text, wav_file):
+        self.synth_calls += 1
+        time.sleep(self.synth_sec_per_char * len(text))
+        n_samples = int(self.config.sample_rate * self.audio_sec_per_char * len(text))
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(self.config.sample_rate)
+        wav_file.writeframes(b"\x00\x00" * n_samples)
+
+
+class FakePlayer:
+    """
+    Pengganti play_wav: "memutar" file dengan tidur selama durasi audio
+    (dikali speed agar tes cepat) dan mencatat waktu mulai tiap file.
+    """
+
+    def __init__(self, speed=0.1):
+        self.speed = speed
+        self.played = []  # list (waktu_mulai_monotonic, path)
+
+    def __call__(self, file_path):
+        self.played.append((time.monotonic(), file_path))
+        with wave.open(file_path, "rb") as wav_file:
+            duration = wav_file.getnframes() / float(wav_file.getframerate())
+        time.sleep(duration * self.speed)
+
+
+class FakeFrameSource:
+    """
+    Pengganti cv2.VideoCapture: membuka dengan jeda open_delay lalu
+    mengirim frame dengan laju fps. Nilai piksel = nomor frame (mod 256)
+    supaya tes bisa memeriksa frame mana yang didapat.
+    """
+
+    def __init__(self, fps=30.0, open_delay=0.3, shape=(480, 640, 3), fail_after=None):
+        time.sleep(open_delay)
+        self.interval = 1.0 / fps
+        self.shape = shape
+        self.fail_after = fail_after  # setelah N frame, read() selalu gagal
+        self.count = 0
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        time.sleep(self.interval)
+        if self.fail_after is not None and self.count >= self.fail_after:
+            return False, None
+        self.count += 1
+        return True, np.full(self.shape, self.count % 256, dtype=np.uint8)
+
+    def release(self):
+        self.opened = False
+
+
+class FakeStage:
+    """
+    Tahap orchestrator palsu: fn(item, cancel) yang tidur delay detik per
+    output dan menghasilkan fanout output (item, k). Mencatat urutan input
+    dan waktu mulai/selesai untuk memeriksa urutan dan tumpang tindih.
+    """
+
+    def __init__(self, delay=0.01, fanout=1):
+        self.delay = delay
+        self.fanout = fanout
+        self.seen = []   # input dalam urutan diterima
+        self.spans = []  # (mulai, selesai) monotonic per input
+
+    def __call__(self, item, cancel):
+        start = time.monotonic()
+        self.seen.append(item)
+        for k in range(self.fanout):
+            if cancel.wait(self.delay):
+                cancel.raise_if_cancelled()
+            yield item if self.fanout == 1 else (item, k)
+        self.spans.append((start, time.monotonic()))
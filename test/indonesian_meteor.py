@@ -0,0 +1,222 @@
+"""
+METEOR native untuk Bahasa Indonesia (tanpa NLTK, tanpa akses jaringan)
+
+Algoritma sama dengan nltk.translate.meteor_score:
+1. Alignment exact match, lalu stem match pada kata yang tersisa
+   (greedy dari kata terakhir, sama seperti NLTK)
+2. F-mean = P*R / (alpha*P + (1-alpha)*R)
+3. Penalty = gamma * (chunks / matches)^beta
+4. METEOR = F-mean * (1 - Penalty), maksimum atas semua referensi
+
+Bedanya:
+- stem match memakai stemmer afiks Bahasa Indonesia berbasis aturan
+  (partikel, kata ganti milik, sufiks, prefiks meN-/peN-/ber-/ter-/per-/di-/se-)
+  sebagai pengganti Porter stemmer Inggris
+- tidak ada synonym match (WordNet Inggris tidak relevan untuk Bahasa Indonesia)
+- referensi diindeks sekali (kata -> posisi), alignment O(n + m) per pasangan
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+# === KONFIGURASI METEOR ===
+ALPHA = 0.9    # bobot recall vs precision
+BETA = 3.0     # eksponen penalty fragmentasi
+GAMMA = 0.5    # bobot penalty fragmentasi
+MIN_STEM_LENGTH = 4  # afiks tidak dilepas jika sisa kata lebih pendek dari ini
+
+# Kata (termasuk kata ulang "orang-orang" dan angka "1.5") atau satu tanda baca
+TOKEN_PATTERN = re.compile(r"\w+(?:[-'.]\w+)*|[^\w\s]")
+
+PARTICLES = ("lah", "kah", "tah", "pun")
+POSSESSIVES = ("nya", "ku", "mu")
+SUFFIXES = ("kan", "an", "i")
+
+# Prefiks + perubahan bunyi (morfofonemik) meN-/peN-. Urutan penting:
+# pola yang lebih panjang dicek lebih dulu. Tanpa kamus, peluluhan
+# meng- + vokal diambil sebagai vokal (mengambil -> ambil). ke- tidak
+# dilepas: terlalu banyak kata dasar berawalan ke (kecil, kepala, kendaraan).
+PREFIX_RULES = [
+    (re.compile(r"^(?:me|pe)ny([aiueo])"), r"s\1"),   # menyapu -> sapu
+    (re.compile(r"^(?:me|pe)ng([aiueogkh])"), r"\1"),  # menggunakan -> gunakan
+    (re.compile(r"^(?:me|pe)n([aiueo])"), r"t\1"),    # menulis -> tulis
+    (re.compile(r"^(?:me|pe)n([cdjz])"), r"\1"),      # mendorong -> dorong
+    (re.compile(r"^(?:me|pe)m([aiueo])"), r"p\1"),    # memotret -> potret
+    (re.compile(r"^(?:me|pe)m([bfv])"), r"\1"),       # membawa -> bawa
+    (re.compile(r"^(?:ber|ter|per)(?=[^aiueo])"), ""),  # berdiri -> diri
+    (re.compile(r"^(?:be|te|pe)(?=r[aiueo])"), ""),   # berisiko -> risiko
+    (re.compile(r"^(?:me|pe)([lrwy])"), r"\1"),       # melihat -> lihat
+    (re.compile(r"^(?:di|se)"), ""),                  # dipasang -> pasang
+]
+MAX_PREFIXES = 2  # diperlihatkan -> perlihat -> lihat
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase + pisahkan kata dan tanda baca"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _strip_ending(word: str, endings: Sequence[str]) -> str:
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Stemmer afiks Bahasa Indonesia berbasis aturan (tanpa kamus kata dasar).
+    Hasilnya tidak selalu kata dasar yang benar, tapi konsisten: dua bentuk
+    berimbuhan dari kata dasar yang sama umumnya menghasilkan stem yang sama.
+    """
+    if "-" in word:  # kata ulang: stem bagian pertama (orang-orang -> orang)
+        word = word.split("-", 1)[0]
+    word = _strip_ending(word, PARTICLES)
+    word = _strip_ending(word, POSSESSIVES)
+
+    # Prefiks dulu, baru sufiks: berdiri -> diri (bukan berdir)
+    for _ in range(MAX_PREFIXES):
+        for pattern, replacement in PREFIX_RULES:
+            stripped, n = pattern.subn(replacement, word, count=1)
+            if n:
+                if len(stripped) >= MIN_STEM_LENGTH:
+                    word = stripped
+                break
+        else:
+            break
+    return _strip_ending(word, SUFFIXES)
+
+
+class PreparedReference:
+    """
+    Referensi yang sudah diindeks: kata -> posisi (naik), stem per posisi.
+    Dibuat sekali per referensi dan dipakai untuk semua kandidat.
+    """
+
+    __slots__ = ("tokens", "positions", "stems")
+
+    def __init__(self, tokens: Sequence[str]):
+        self.tokens = list(tokens)
+        self.positions = {}
+        for j, word in enumerate(self.tokens):
+            self.positions.setdefault(word, []).append(j)
+        self.stems = [stem(word) for word in self.tokens]
+
+
+def _align(candidate: Sequence[str], candidate_stems: Sequence[str],
+           reference: PreparedReference, stemming: bool) -> List[Tuple[int, int]]:
+    """
+    Alignment kandidat -> referensi, identik dengan NLTK: untuk tiap kata
+    kandidat dari belakang, ambil posisi referensi terbesar yang belum
+    dipakai (exact dulu, lalu stem pada sisa kata).
+
+    Returns:
+        List (posisi kandidat, posisi referensi), urut posisi kandidat
+    """
+    free = {word: list(positions) for word, positions in reference.positions.items()}
+    matches = []
+    unmatched = []
+    for i in range(len(candidate) - 1, -1, -1):
+        stack = free.get(candidate[i])
+        if stack:
+            matches.append((i, stack.pop()))
+        else:
+            unmatched.append(i)
+
+    if stemming and unmatched:
+        used = {j for _, j in matches}
+        free_stems = {}
+        for j, word_stem in enumerate(reference.stems):
+            if j not in used:
+                free_stems.setdefault(word_stem, []).append(j)
+        for i in unmatched:  # sudah urut dari belakang
+            stack = free_stems.get(candidate_stems[i])
+            if stack:
+                matches.append((i, stack.pop()))
+
+    matches.sort()
+    return matches
+
+
+def count_chunks(matches: Sequence[Tuple[int, int]]) -> int:
+    """Jumlah chunk: deretan match yang bersebelahan di kandidat dan referensi"""
+    chunks = 1
+    for (i0, j0), (i1, j1) in zip(matches, matches[1:]):
+        if not (i1 == i0 + 1 and j1 == j0 + 1):
+            chunks += 1
+    return chunks
+
+
+class MeteorScorer:
+    """
+    Penghitung METEOR untuk banyak pasangan kandidat/referensi sekaligus.
+    Referensi yang sama (mis. ground truth dipakai oleh banyak run) hanya
+    diindeks sekali.
+    """
+
+    def __init__(self, alpha: float = ALPHA, beta: float = BETA, gamma: float = GAMMA,
+                 stemming: bool = True):
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.stemming = stemming
+        self._prepared = {}  # tuple token referensi -> PreparedReference
+
+    def prepare(self, reference_tokens: Sequence[str]) -> PreparedReference:
+        key = tuple(reference_tokens)
+        prepared = self._prepared.get(key)
+        if prepared is None:
+            prepared = self._prepared[key] = PreparedReference(key)
+        return prepared
+
+    def single_score(self, reference: PreparedReference, candidate: Sequence[str],
+                     candidate_stems: Sequence[str] = None) -> float:
+        """METEOR terhadap satu referensi"""
+        if candidate_stems is None and self.stemming:
+            candidate_stems = [stem(word) for word in candidate]
+        matches = _align(candidate, candidate_stems, reference, self.stemming)
+        if not matches or not candidate or not reference.tokens:
+            return 0.0
+
+        precision = len(matches) / len(candidate)
+        recall = len(matches) / len(reference.tokens)
+        fmean = (precision * recall) / (self.alpha * precision + (1 - self.alpha) * recall)
+        penalty = self.gamma * (count_chunks(matches) / len(matches)) ** self.beta
+        return (1 - penalty) * fmean
+
+    def score(self, references_tokens: Sequence[Sequence[str]], candidate_tokens: Sequence[str]) -> float:
+        """METEOR kandidat = maksimum atas semua referensi (seperti NLTK)"""
+        candidate_stems = [stem(word) for word in candidate_tokens] if self.stemming else None
+        return max((self.single_score(self.prepare(ref), candidate_tokens, candidate_stems)
+                    for ref in references_tokens), default=0.0)
+
+    def score_batch(self, jobs: Sequence[Tuple[Sequence[Sequence[str]], Sequence[str]]]) -> List[float]:
+        """
+        Args:
+            jobs: List (references_tokens, candidate_tokens)
+
+        Returns:
+            List skor METEOR, urutan sama dengan jobs
+        """
+        return [self.score(references_tokens, candidate_tokens)
+                for references_tokens, candidate_tokens in jobs]
+
+
+def corpus_scores(candidates: Dict[int, Sequence[str]], references: Dict[int, Sequence[str]],
+                  stemming: bool = True) -> Dict[int, float]:
+    """
+    Skor per gambar dari teks mentah.
+
+    Args:
+        candidates: Dict {image_id: caption}
+        references: Dict {image_id: [ref1, ref2, ...]}
+
+    Returns:
+        Dict {image_id: score} untuk gambar yang punya referensi
+    """
+    scorer = MeteorScorer(stemming=stemming)
+    image_ids = [i for i in candidates if i in references]
+    jobs = [([tokenize(ref) for ref in references[i]], tokenize(candidates[i])) for i in image_ids]
+    return dict(zip(image_ids, scorer.score_batch(jobs)))
@@ -0,0 +1,113 @@
+"""
+Jurnal hasil batch test yang append-only (JSONL, satu record per gambar).
+
+Setiap record ditulis lalu di-fsync, sehingga crash / Ctrl+C di tengah
+run tidak menghilangkan hasil yang sudah selesai dan run bisa dilanjutkan
+(--resume). compact() menyusun resultText.json dan resultTime.csv final
+dari jurnal, menggantikan tulis-ulang seluruh file setelah setiap gambar.
+"""
+
+import os
+import csv
+import json
+import time
+from typing import Dict, List, Optional
+
+# Statistik server Ollama (generateText.parse_ollama_timings): model load,
+# prefill gambar + prompt, decode; kosong untuk caption dari cache / jurnal lama.
+# cached: caption atau audio diambil dari cache (waktunya bukan latensi inferensi)
+OLLAMA_FIELDNAMES = ['T_Load', 'T_PromptEval', 'T_Eval', 'prompt_eval_count',
+                     'eval_count', 'tokens_per_sec', 'cached']
+TIME_FIELDNAMES = ['image_id', 'image_name', 'T_Ollama', *OLLAMA_FIELDNAMES, 'T_Piper', 'status']
+
+
+class ResultJournal:
+    """
+    Jurnal JSONL dengan key image_id. Record yang lebih baru untuk
+    image_id yang sama menggantikan record lama saat dibaca.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def reset(self):
+        """Mulai jurnal baru (hapus isi jurnal lama)."""
+        open(self.path, 'w', encoding='utf-8').close()
+
+    def append(self, record: Dict):
+        """Tambah satu record dan pastikan sudah tersimpan di disk (fsync)."""
+        record = dict(record, journal_ts=time.time())
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> Dict[int, Dict]:
+        """
+        Baca semua record. Baris terakhir yang terpotong (crash saat menulis)
+        diabaikan. Return: {image_id: record terakhir}.
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for lineno, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"[WARNING] Baris jurnal {lineno} rusak/terpotong, diabaikan.")
+                    continue
+                records[record['image_id']] = record
+        return records
+
+    def completed_ids(self) -> set:
+        """image_id yang sudah sukses (dilewati saat --resume)."""
+        return {image_id for image_id, r in self.load().items() if r.get('status') == 'success'}
+
+
+def compact(journal: ResultJournal, text_json: str, time_csv: str,
+            order: Optional[List[int]] = None, info: Optional[Dict] = None) -> List[Dict]:
+    """
+    Susun resultText.json dan resultTime.csv dari jurnal.
+
+    Args:
+        journal: ResultJournal sumber
+        text_json: path resultText.json
+        time_csv: path resultTime.csv
+        order: urutan image_id (default: urut numerik)
+        info: metadata run (mis. setting preprocessing), disimpan sebagai
+              "info" di resultText.json
+
+    Return: baris resultTime (list dict) untuk ringkasan.
+    """
+    records = journal.load()
+    ids = [i for i in (order or []) if i in records]
+    ids += sorted(i for i in records if i not in set(ids))
+
+    results_text = []
+    results_time = []
+    for image_id in ids:
+        record = records[image_id]
+        if record.get('caption'):
+            results_text.append({
+                "image_id": image_id,
+                "captions": [record['caption']]
+            })
+        results_time.append({key: record.get(key) for key in TIME_FIELDNAMES})
+
+    with open(text_json, 'w', encoding='utf-8') as f:
+        data = {"info": info} if info else {}
+        data["annotations"] = results_text
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(time_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=TIME_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(results_time)
+
+    print(f"[INFO] Kompaksi jurnal: {len(results_text)} anotasi, {len(results_time)} baris waktu")
+    return results_time
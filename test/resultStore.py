@@ -0,0 +1,408 @@
+"""
+Penyimpanan hasil eksperimen dalam satu database SQLite (test/results.sqlite).
+
+Setiap run (resultText*.json + resultTime*.csv + skor metrik) dimasukkan
+sekali dengan run_id. Perbandingan run, regresi per gambar dan persentil
+latensi lalu dijawab lewat query berindeks, tanpa memuat ulang JSON/CSV
+dan tanpa join ulang berdasarkan image_id string.
+
+Tabel:
+- runs    : satu baris per run (sumber file, waktu ingest, catatan)
+- images  : (run_id, image_id) -> caption, waktu per tahap, counter Ollama,
+            cached (hasil dari cache: tidak ikut statistik waktu)
+- scores  : (run_id, image_id, metric) -> skor per gambar
+- corpus_scores : (run_id, metric) -> skor korpus
+
+    cd test
+    python resultStore.py ingest --run base --text resultText.json --time resultTime.csv --score
+    python resultStore.py ingest-dir "hasil sementara" --score
+    python resultStore.py runs
+    python resultStore.py compare hasil0 hasil2
+    python resultStore.py regressions hasil0 hasil2 --metric METEOR
+    python resultStore.py latency hasil0
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import glob
+import time
+import sqlite3
+import argparse
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tracing import percentile
+from resultJournal import OLLAMA_FIELDNAMES
+
+# === KONFIGURASI ===
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_PATH = os.path.join(TEST_DIR, "results.sqlite")
+GROUND_TRUTH_JSON = os.path.join(TEST_DIR, "GroundTruthAsli.json")
+TIMING_COLUMNS = ['T_Ollama', *(f for f in OLLAMA_FIELDNAMES if f != 'cached'), 'T_Piper']
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    ingested_at REAL NOT NULL,
+    source      TEXT,
+    notes       TEXT
+);
+CREATE TABLE IF NOT EXISTS images (
+    run_id     TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    image_id   INTEGER NOT NULL,
+    image_name TEXT,
+    caption    TEXT,
+    status     TEXT,
+    {", ".join(f"{column} REAL" for column in TIMING_COLUMNS)},
+    cached     INTEGER,
+    PRIMARY KEY (run_id, image_id)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    run_id   TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    image_id INTEGER NOT NULL,
+    metric   TEXT NOT NULL,
+    score    REAL NOT NULL,
+    PRIMARY KEY (run_id, metric, image_id)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_metric_image ON scores(metric, image_id);
+CREATE TABLE IF NOT EXISTS corpus_scores (
+    run_id TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    metric TEXT NOT NULL,
+    score  REAL NOT NULL,
+    PRIMARY KEY (run_id, metric)
+);
+"""
+
+
+def _number(value):
+    """Nilai CSV -> float (None untuk kosong / tidak valid)"""
+    try:
+        return float(value) if value not in (None, '') else None
+    except ValueError:
+        return None
+
+
+def _flag(value):
+    """Nilai boolean CSV ("True"/"False", "1"/"0") -> 1/0 (None untuk kosong)"""
+    if value in (None, ''):
+        return None
+    return int(str(value).strip().lower() in ('true', '1'))
+
+
+def load_metric_file(path: str) -> Tuple[Dict[str, Dict[int, float]], Dict[str, float]]:
+    """
+    Baca file hasil metrik menjadi ({metrik: {image_id: skor}}, {metrik: skor korpus}):
+    - meteor_results.json / spice_results.json: {"overall", "per_image", ...}
+      (nama metrik dari nama file)
+    - satu run dari evaluate_metrics.py: {"corpus", "per_image": {id: {metrik: skor}}}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if 'corpus' in data:
+        metrics = {name: {} for name in data['corpus']}
+        for image_id, scores in data['per_image'].items():
+            for name, value in scores.items():
+                metrics.setdefault(name, {})[int(image_id)] = value
+        return metrics, dict(data['corpus'])
+
+    name = os.path.basename(path).split('_')[0].upper()
+    scores = {int(image_id): value for image_id, value in data['per_image'].items()}
+    return {name: scores}, {name: data['overall']}
+
+
+class ResultStore:
+    """Database hasil eksperimen (SQLite). Satu koneksi per objek."""
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        tables = {r[0] for r in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.conn.executescript(SCHEMA)
+        # Database lama (skor korpus sebagai image_id 0 di scores): pindahkan ke corpus_scores
+        if 'scores' in tables and 'corpus_scores' not in tables:
+            with self.conn:
+                self.conn.execute("INSERT INTO corpus_scores SELECT run_id, metric, score FROM scores WHERE image_id = 0")
+                self.conn.execute("DELETE FROM scores WHERE image_id = 0")
+        # Database lama (sebelum kolom cached): tambahkan kolomnya
+        if 'cached' not in [r['name'] for r in self.conn.execute("PRAGMA table_info(images)")]:
+            self.conn.execute("ALTER TABLE images ADD COLUMN cached INTEGER")
+
+    def close(self):
+        self.conn.close()
+
+    # --- Ingest ---
+    def ingest_run(self, run_id: str, text_json: str = None, time_csv: str = None,
+                   metric_files: Sequence[str] = (), score: bool = False, notes: str = None,
+                   backend: str = None) -> int:
+        """
+        Masukkan satu run. Run dengan run_id yang sama diganti seluruhnya.
+
+        Args:
+            run_id: Nama run (mis. "hasil0", "num_predict_120")
+            text_json: resultText*.json (captions)
+            time_csv: resultTime*.csv (waktu per tahap + counter Ollama)
+            metric_files: File hasil metrik (lihat load_metric_file)
+            score: Hitung BLEU/ROUGE-L/CIDEr/METEOR dari captions (evaluate_metrics)
+            notes: Catatan bebas (setting eksperimen); "info" di text_json
+                   (mis. setting preprocessing testMain) ikut ditambahkan
+            backend: Backend METEOR untuk score (default METEOR_BACKEND evaluate_meteor)
+
+        Returns:
+            Jumlah gambar di run
+        """
+        rows = {}
+        if time_csv:
+            with open(time_csv, 'r', encoding='utf-8') as f:
+                for record in csv.DictReader(f):
+                    row = rows.setdefault(int(record['image_id']), {})
+                    row['image_name'] = record.get('image_name')
+                    row['status'] = record.get('status')
+                    row['cached'] = _flag(record.get('cached'))
+                    for column in TIMING_COLUMNS:
+                        row[column] = _number(record.get(column))
+
+        candidates = {}
+        if text_json:
+            with open(text_json, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            pred_key = "predictions" if "predictions" in data else "annotations"
+            if data.get('info'):
+                notes = "; ".join(filter(None, [notes, json.dumps(data['info'], sort_keys=True)]))
+            for item in data[pred_key]:
+                candidates[item['image_id']] = item['captions']
+                rows.setdefault(item['image_id'], {})['caption'] = item['captions'][0]
+
+        metrics, corpus = {}, {}
+        for path in metric_files:
+            file_metrics, file_corpus = load_metric_file(path)
+            metrics.update(file_metrics)
+            corpus.update(file_corpus)
+        if score and candidates:
+            from evaluate_metrics import CaptionMetricsEngine
+            from evaluate_meteor import IndonesianMETEOREvaluator
+            engine = CaptionMetricsEngine(IndonesianMETEOREvaluator.load_references(GROUND_TRUTH_JSON),
+                                          backend=backend)
+            result = engine.score(candidates)
+            corpus.update(result['corpus'])
+            for image_id, values in result['per_image'].items():
+                for name, value in values.items():
+                    metrics.setdefault(name, {})[image_id] = value
+
+        source = ", ".join(os.path.basename(p) for p in [text_json, time_csv, *metric_files] if p)
+        if score and candidates:
+            source += f", score (METEOR {result['meteor_backend']})"
+        columns = ['image_name', 'caption', 'status', *TIMING_COLUMNS, 'cached']
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+            self.conn.execute("INSERT INTO runs VALUES (?, ?, ?, ?)", (run_id, time.time(), source, notes))
+            self.conn.executemany(
+                f"INSERT INTO images (run_id, image_id, {', '.join(columns)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in columns)})",
+                [(run_id, image_id, *(row.get(c) for c in columns)) for image_id, row in sorted(rows.items())])
+            self.conn.executemany(
+                "INSERT INTO scores VALUES (?, ?, ?, ?)",
+                [(run_id, image_id, name, value)
+                 for name, values in metrics.items() for image_id, value in values.items()])
+            self.conn.executemany("INSERT INTO corpus_scores VALUES (?, ?, ?)",
+                                  [(run_id, name, value) for name, value in corpus.items()])
+
+        print(f"[INFO] Run '{run_id}': {len(rows)} gambar, {len(metrics)} metrik ({source})")
+        return len(rows)
+
+    def ingest_directory(self, directory: str, score: bool = False, prefix: str = "hasil",
+                         backend: str = None) -> List[str]:
+        """
+        Masukkan semua pasangan resultText{N}.json + resultTime{N}.csv di satu folder
+        (mis. "hasil sementara/") sebagai run "{prefix}{N}".
+        """
+        run_ids = []
+        for text_json in sorted(glob.glob(os.path.join(directory, "resultText*.json"))):
+            suffix = re.sub(r"^resultText|\.json$", "", os.path.basename(text_json))
+            time_csv = os.path.join(directory, f"resultTime{suffix}.csv")
+            run_id = f"{prefix}{suffix}"
+            self.ingest_run(run_id, text_json, time_csv if os.path.exists(time_csv) else None, score=score,
+                            backend=backend)
+            run_ids.append(run_id)
+        return run_ids
+
+    # --- Query ---
+    def runs(self) -> List[Dict]:
+        """Ringkasan semua run: jumlah gambar, sukses, rata-rata T_Ollama (tanpa cache), skor korpus"""
+        rows = self.conn.execute("""
+            SELECT r.run_id, r.source, COUNT(i.image_id) AS images,
+                   SUM(i.status = 'success') AS success,
+                   AVG(CASE WHEN NOT COALESCE(i.cached, 0) THEN i.T_Ollama END) AS T_Ollama_mean
+            FROM runs r LEFT JOIN images i ON i.run_id = r.run_id
+            GROUP BY r.run_id ORDER BY r.ingested_at
+        """).fetchall()
+        result = [dict(row) for row in rows]
+        for row in result:
+            row['scores'] = dict(self.conn.execute(
+                "SELECT metric, score FROM corpus_scores WHERE run_id = ? ORDER BY metric",
+                (row['run_id'],)).fetchall())
+        return result
+
+    def metric_names(self) -> List[str]:
+        return [r[0] for r in self.conn.execute(
+            "SELECT metric FROM scores UNION SELECT metric FROM corpus_scores ORDER BY metric")]
+
+    def compare_runs(self, run_a: str, run_b: str) -> Dict[str, Dict]:
+        """
+        Bandingkan dua run pada gambar yang sama-sama ada:
+        {metrik/kolom waktu: {'a', 'b', 'delta', 'n'}} (rata-rata per gambar).
+        Kolom waktu hanya dari gambar yang di kedua run tidak berasal dari cache.
+        """
+        comparison = {}
+        for row in self.conn.execute("""
+            SELECT a.metric, AVG(a.score) AS a, AVG(b.score) AS b, COUNT(*) AS n
+            FROM scores a JOIN scores b
+              ON b.run_id = ? AND b.metric = a.metric AND b.image_id = a.image_id
+            WHERE a.run_id = ?
+            GROUP BY a.metric ORDER BY a.metric
+        """, (run_b, run_a)):
+            comparison[row['metric']] = {'a': row['a'], 'b': row['b'], 'delta': row['b'] - row['a'], 'n': row['n']}
+
+        averages = ", ".join(f"AVG(a.{c}) AS a_{c}, AVG(b.{c}) AS b_{c}" for c in TIMING_COLUMNS)
+        row = self.conn.execute(f"""
+            SELECT COUNT(*) AS n, {averages}
+            FROM images a JOIN images b ON b.run_id = ? AND b.image_id = a.image_id
+            WHERE a.run_id = ? AND NOT COALESCE(a.cached, 0) AND NOT COALESCE(b.cached, 0)
+        """, (run_b, run_a)).fetchone()
+        for column in TIMING_COLUMNS:
+            if row[f"a_{column}"] is not None and row[f"b_{column}"] is not None:
+                comparison[column] = {'a': row[f"a_{column}"], 'b': row[f"b_{column}"],
+                                      'delta': row[f"b_{column}"] - row[f"a_{column}"], 'n': row['n']}
+        return comparison
+
+    def regressions(self, base_run: str, new_run: str, metric: str = "METEOR",
+                    threshold: float = 0.05, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Gambar yang skornya turun lebih dari threshold dari base_run ke new_run,
+        urut dari penurunan terbesar, lengkap dengan kedua caption.
+        """
+        query = """
+            SELECT a.image_id, a.score AS base, b.score AS new, b.score - a.score AS delta,
+                   ia.caption AS base_caption, ib.caption AS new_caption
+            FROM scores a
+            JOIN scores b ON b.run_id = ? AND b.metric = a.metric AND b.image_id = a.image_id
+            LEFT JOIN images ia ON ia.run_id = a.run_id AND ia.image_id = a.image_id
+            LEFT JOIN images ib ON ib.run_id = b.run_id AND ib.image_id = b.image_id
+            WHERE a.run_id = ? AND a.metric = ? AND b.score - a.score < ?
+            ORDER BY delta
+        """
+        params = [new_run, base_run, metric, -threshold]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def latency_percentiles(self, run_id: str, column: str = "T_Ollama",
+                            percentiles=LATENCY_PERCENTILES, success_only: bool = True) -> Dict:
+        """
+        Persentil satu kolom waktu (interpolasi linear, sama dengan tracing.percentile).
+        Baris dari cache (cached) tidak dihitung.
+
+        Returns:
+            {'count', 'mean', 'p50', ...}; kosong jika tidak ada data
+        """
+        if column not in TIMING_COLUMNS:
+            raise ValueError(f"kolom waktu tidak dikenal: {column}")
+        where = "AND status = 'success'" if success_only else ""
+        values = [r[0] for r in self.conn.execute(
+            f"SELECT {column} FROM images WHERE run_id = ? AND {column} IS NOT NULL "
+            f"AND NOT COALESCE(cached, 0) {where} ORDER BY {column}",
+            (run_id,))]
+        if not values:
+            return {}
+        summary = {'count': len(values), 'mean': sum(values) / len(values)}
+        for q in percentiles:
+            summary[f"p{q}"] = percentile(values, q)
+        return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database hasil eksperimen (SQLite)")
+    parser.add_argument("--db", default=STORE_PATH, help="path database (default: test/results.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ingest", help="masukkan satu run")
+    p.add_argument("--run", required=True, help="run_id")
+    p.add_argument("--text", help="resultText*.json")
+    p.add_argument("--time", help="resultTime*.csv")
+    p.add_argument("--metrics", nargs="*", default=[], help="file hasil metrik (meteor_results.json, ...)")
+    p.add_argument("--score", action="store_true", help="hitung BLEU/ROUGE-L/CIDEr/METEOR dari captions")
+    p.add_argument("--backend", choices=["native", "nltk"], default=None,
+                   help="backend METEOR untuk --score (default: nltk, sama dengan evaluate_meteor.py)")
+    p.add_argument("--notes", help="catatan setting eksperimen")
+
+    p = sub.add_parser("ingest-dir", help="masukkan semua resultText{N}.json + resultTime{N}.csv di folder")
+    p.add_argument("directory")
+    p.add_argument("--score", action="store_true", help="hitung metrik dari captions")
+    p.add_argument("--backend", choices=["native", "nltk"], default=None,
+                   help="backend METEOR untuk --score (default: nltk)")
+    p.add_argument("--prefix", default="hasil", help="awalan run_id (default: hasil)")
+
+    sub.add_parser("runs", help="daftar run")
+
+    p = sub.add_parser("compare", help="bandingkan dua run")
+    p.add_argument("run_a")
+    p.add_argument("run_b")
+
+    p = sub.add_parser("regressions", help="gambar yang skornya turun dari run_a ke run_b")
+    p.add_argument("run_a")
+    p.add_argument("run_b")
+    p.add_argument("--metric", default="METEOR")
+    p.add_argument("--threshold", type=float, default=0.05)
+    p.add_argument("--limit", type=int, default=10)
+
+    p = sub.add_parser("latency", help="persentil waktu satu run")
+    p.add_argument("run_id")
+    p.add_argument("--column", default="T_Ollama", choices=TIMING_COLUMNS)
+
+    args = parser.parse_args()
+    store = ResultStore(args.db)
+    try:
+        if args.command == "ingest":
+            store.ingest_run(args.run, args.text, args.time, args.metrics, score=args.score, notes=args.notes,
+                             backend=args.backend)
+        elif args.command == "ingest-dir":
+            store.ingest_directory(args.directory, score=args.score, prefix=args.prefix, backend=args.backend)
+        elif args.command == "runs":
+            for run in store.runs():
+                t_ollama = f"{run['T_Ollama_mean']:.2f}s" if run['T_Ollama_mean'] is not None else "-"
+                scores = "  ".join(f"{name} {value:.4f}" for name, value in run['scores'].items())
+                print(f"{run['run_id']:<16} {run['images']:>4} gambar  {run['success'] or 0:>4} sukses  "
+                      f"T_Ollama {t_ollama:>8}  {scores}")
+        elif args.command == "compare":
+            print(f"{'':<18} {args.run_a:>12} {args.run_b:>12} {'delta':>10} {'n':>4}")
+            for name, row in store.compare_runs(args.run_a, args.run_b).items():
+                print(f"{name:<18} {row['a']:>12.4f} {row['b']:>12.4f} {row['delta']:>+10.4f} {row['n']:>4}")
+        elif args.command == "regressions":
+            rows = store.regressions(args.run_a, args.run_b, args.metric, args.threshold, args.limit)
+            print(f"[INFO] {len(rows)} gambar turun > {args.threshold} ({args.metric}, {args.run_a} -> {args.run_b})")
+            for row in rows:
+                print(f"\nImage {row['image_id']}: {row['base']:.4f} -> {row['new']:.4f} ({row['delta']:+.4f})")
+                print(f"  {args.run_a}: {(row['base_caption'] or '')[:150]}")
+                print(f"  {args.run_b}: {(row['new_caption'] or '')[:150]}")
+        elif args.command == "latency":
+            summary = store.latency_percentiles(args.run_id, args.column)
+            if not summary:
+                print(f"[WARNING] Tidak ada data {args.column} untuk run '{args.run_id}'.")
+            else:
+                print(f"{args.column} ({args.run_id}, {summary['count']} gambar): mean {summary['mean']:.2f}s  "
+                      + "  ".join(f"p{q} {summary[f'p{q}']:.2f}s" for q in LATENCY_PERCENTILES))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
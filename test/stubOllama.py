@@ -0,0 +1,323 @@
+"""
+Server Ollama palsu (stub) untuk pengujian lokal tanpa GPU/model.
+
+Meniru endpoint /api/chat:
+- "stream": false -> satu objek JSON setelah seluruh caption "selesai"
+- "stream": true  -> NDJSON per token (chunked), menetes dengan jeda token_delay
+- options.num_predict membatasi jumlah token (done_reason "length"),
+  options.stop memotong caption sebelum urutan stop pertama
+- respons akhir ("done": true) membawa field waktu server seperti Ollama
+  asli (total/load/prompt_eval/eval_duration dalam ns, prompt_eval_count,
+  eval_count) yang dihitung dari jeda simulasi
+- prompt disusun jadi "token" seperti template chat: SYSTEM Modelfile
+  (jika tidak ada pesan system), lalu per pesan token gambar sebelum teks.
+  Dengan prefix_cache=True, awal prompt yang sama dengan request
+  sebelumnya tidak di-prefill ulang (meniru KV cache Ollama):
+  prompt_eval_count dan jeda token pertama mengecil sebanding
+
+dan /api/generate (non-stream), POST /api/show (SYSTEM Modelfile), serta
+GET /api/tags (nama + digest model). Prompt kosong hanya memuat model,
+"keep_alive": 0 mengeluarkan model. Request pertama saat model belum
+dimuat menanggung load_delay (simulasi cold start).
+
+Gangguan bisa disimulasikan lewat server.faults (dipakai satu per request):
+- "drop" : koneksi ditutup tanpa respons
+- "slow" : respons ditunda server.slow_delay detik
+- "500", "502", "503" : balas dengan status error tersebut
+
+Pemakaian mandiri:
+    python stubOllama.py --port 11435 --token-delay 0.05
+lalu arahkan generateText.OLLAMA_URL ke http://127.0.0.1:11435/api/chat
+"""
+
+import re
+import json
+import hashlib
+import time
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_SYSTEM = (
+    "Kamu adalah seorang sukarelawan pembantu tunanetra, jelaskan isi gambar "
+    "secara singkat dan tepat tanpa bertele tele"
+)
+IMAGE_TOKENS = 256  # token per gambar (Gemma3)
+
+DEFAULT_CAPTION = (
+    "Terdapat seorang pria yang sedang berjalan di trotoar. "
+    "Di sebelah kanan ada sepeda motor yang diparkir. "
+    "Suasana tampak cerah dan ramai. "
+    "Tidak ada bahaya yang terlihat secara langsung."
+)
+
+
+def server_timings(load_sec, prompt_sec, eval_sec, prompt_count, eval_count):
+    """Field waktu respons akhir Ollama (durasi dalam nanodetik)."""
+    return {
+        "total_duration": round((load_sec + prompt_sec + eval_sec) * 1e9),
+        "load_duration": round(load_sec * 1e9),
+        "prompt_eval_count": prompt_count,
+        "prompt_eval_duration": round(prompt_sec * 1e9),
+        "eval_count": eval_count,
+        "eval_duration": round(eval_sec * 1e9),
+    }
+
+
+def prompt_tokens(body, default_system):
+    """
+    Susun prompt request menjadi list "token" (kata, penanda peran, token
+    gambar per hash gambar) untuk simulasi prefill dan prefix cache.
+    """
+    messages = body.get("messages")
+    if messages is None:
+        return body.get("prompt", "").split()
+
+    tokens = []
+    if default_system and not any(m.get("role") == "system" for m in messages):
+        tokens += ["<system>"] + default_system.split()
+    for msg in messages:
+        tokens.append(f"<{msg.get('role')}>")
+        for img in msg.get("images", []):
+            digest = hashlib.sha1(img.encode("ascii")).hexdigest()[:12]
+            tokens += [f"<img:{digest}:{i}>" for i in range(IMAGE_TOKENS)]
+        tokens += msg.get("content", "").split()
+    tokens.append("<model>")
+    return tokens
+
+
+def common_prefix(a, b):
+    n = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        n += 1
+    return n
+
+
+def tokenize_caption(caption):
+    """Pecah caption menjadi 'token' (kata + spasi setelahnya)."""
+    return re.findall(r"\S+\s*", caption)
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass  # jangan kotori output tes
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, obj):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{
+                "name": f"{self.server.model_name}:latest",
+                "model": f"{self.server.model_name}:latest",
+                "digest": self.server.digest,
+            }]})
+        else:
+            self._send_json(404, {"error": f"path tidak dikenal: {self.path}"})
+
+    def do_POST(self):
+        body = self._read_json()
+        server = self.server
+        with server.lock:
+            server.requests.append({"path": self.path, "body": body,
+                                    "client_port": self.client_address[1]})
+            fault = server.faults.pop(0) if server.faults else None
+
+        if fault == "drop":
+            self.close_connection = True
+            return
+        if fault == "slow":
+            time.sleep(server.slow_delay)
+        elif fault in ("500", "502", "503"):
+            self._send_json(int(fault), {"error": f"stub fault {fault}"})
+            return
+
+        if self.path == "/api/show":
+            self._send_json(200, {"system": server.system_prompt,
+                                  "modelfile": f"FROM gemma3:4b\nSYSTEM \"\"\"{server.system_prompt}\"\"\""})
+            return
+
+        if self.path not in ("/api/chat", "/api/generate"):
+            self._send_json(404, {"error": f"path tidak dikenal: {self.path}"})
+            return
+
+        model = body.get("model", "stub")
+        created = datetime.now(timezone.utc).isoformat()
+
+        if body.get("keep_alive") == 0:
+            server.loaded = False
+            server.cached_prompt = []
+            self._send_json(200, {"model": model, "created_at": created, "response": "",
+                                  "done": True, "done_reason": "unload"})
+            return
+        load_sec = 0.0
+        if not server.loaded:
+            time.sleep(server.load_delay)
+            server.loaded = True
+            server.cached_prompt = []  # model baru dimuat: KV cache kosong
+            load_sec = server.load_delay
+
+        options = body.get("options", {})
+        caption = server.caption
+        for stop in options.get("stop", []):
+            caption = caption.split(stop, 1)[0]
+        tokens = tokenize_caption(caption)
+        done_reason = "stop"
+        num_predict = options.get("num_predict", -1)
+        if num_predict and 0 < num_predict < len(tokens):
+            tokens = tokens[:num_predict]
+            done_reason = "length"
+
+        if self.path == "/api/generate" and not body.get("prompt"):
+            self._send_json(200, {"model": model, "created_at": created, "response": "",
+                                  "done": True, "done_reason": "load"})
+            return
+
+        # Prefill: hanya bagian prompt setelah prefix yang sudah ada di cache
+        prompt = prompt_tokens(body, server.system_prompt)
+        with server.lock:
+            reused = common_prefix(prompt, server.cached_prompt) if server.prefix_cache else 0
+            reused = min(reused, len(prompt) - 1)  # token terakhir selalu dievaluasi
+            server.cached_prompt = prompt
+        evaluated = len(prompt) - reused
+        prompt_sec = server.first_token_delay * evaluated / len(prompt)
+
+        timings = server_timings(load_sec, prompt_sec, server.token_delay * len(tokens),
+                                 evaluated, len(tokens))
+        timings["done_reason"] = done_reason
+
+        if self.path == "/api/generate":
+            time.sleep(prompt_sec + server.token_delay * len(tokens))
+            self._send_json(200, dict({"model": model, "created_at": created,
+                                       "response": "".join(tokens), "done": True}, **timings))
+            return
+
+        if not body.get("stream", True):
+            time.sleep(prompt_sec + server.token_delay * len(tokens))
+            self._send_json(200, dict({
+                "model": model,
+                "created_at": created,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "done": True,
+            }, **timings))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        time.sleep(prompt_sec)
+        for token in tokens:
+            self._write_chunk({
+                "model": model,
+                "created_at": created,
+                "message": {"role": "assistant", "content": token},
+                "done": False,
+            })
+            time.sleep(server.token_delay)
+        self._write_chunk(dict({
+            "model": model,
+            "created_at": created,
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+        }, **timings))
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, caption=DEFAULT_CAPTION, token_delay=0.05,
+                 first_token_delay=0.5, faults=None, slow_delay=5.0, load_delay=0.0,
+                 model_name="customGemma3", digest="stub0digest",
+                 system_prompt=DEFAULT_SYSTEM, prefix_cache=False):
+        super().__init__(("127.0.0.1", port), StubOllamaHandler)
+        self.caption = caption
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.faults = list(faults or [])
+        self.slow_delay = slow_delay
+        self.load_delay = load_delay
+        self.model_name = model_name
+        self.digest = digest
+        self.system_prompt = system_prompt  # SYSTEM Modelfile (/api/show)
+        self.prefix_cache = prefix_cache    # True: simulasi reuse KV cache prefix prompt
+        self.cached_prompt = []             # token prompt request terakhir
+        self.loaded = load_delay <= 0  # tanpa load_delay, model dianggap selalu siap
+        self.requests = []  # semua request yang diterima (untuk diperiksa tes)
+        self.lock = threading.Lock()
+        self._thread = None
+
+    def handle_error(self, request, client_address):
+        pass  # klien menutup koneksi keep-alive / membatalkan stream: wajar
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def url(self):
+        return f"{self.base_url}/api/chat"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def start_stub_server(**kwargs):
+    """Jalankan stub di thread background. Return: objek StubOllamaServer."""
+    return StubOllamaServer(**kwargs).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub server Ollama untuk tes lokal")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    parser.add_argument("--load-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubOllamaServer(port=args.port, token_delay=args.token_delay,
+                              first_token_delay=args.first_token_delay,
+                              load_delay=args.load_delay)
+    print(f"[INFO] Stub Ollama aktif di {server.url} (Ctrl+C untuk berhenti)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
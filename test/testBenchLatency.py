@@ -0,0 +1,117 @@
+"""
+Uji benchmark latensi statistik (benchLatency.py) terhadap stub Ollama
+dan FakeVoice (tanpa GPU, tanpa model Piper):
+- statistik deskriptif tracing.describe: mean, stddev, persentil, CI 95%
+- fase cold (setelah unload) terpisah dari warm; warm-up dibuang
+- metadata lingkungan: digest model, model Piper, ukuran gambar
+- laporan JSON bisa dibandingkan; regresi terdeteksi, run sama tidak
+
+    cd test
+    python testBenchLatency.py
+"""
+
+import os
+import sys
+import json
+import copy
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import preprocessImage
+from tracing import describe
+from benchLatency import run_benchmark, summarize_samples, compare_reports, environment_info
+
+from stubOllama import start_stub_server
+from fakeStages import FakeVoice
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_describe():
+    print("\n[TES] Statistik deskriptif")
+    s = describe([1.0, 2.0, 3.0, 4.0, 5.0])
+    check("mean = 3", s["mean"] == 3.0)
+    check("stddev sampel = sqrt(2.5)", abs(s["stddev"] - 2.5 ** 0.5) < 1e-12)
+    check("p50 = 3, p90 = 4.6", s["p50"] == 3.0 and abs(s["p90"] - 4.6) < 1e-12)
+    half = 2.776 * 2.5 ** 0.5 / 5 ** 0.5  # t(0.975, df=4)
+    check("CI 95% = mean +- t * s / sqrt(n)",
+          abs(s["ci95_low"] - (3 - half)) < 1e-12 and abs(s["ci95_high"] - (3 + half)) < 1e-12)
+    check("satu nilai: stddev & CI None", describe([2.0])["stddev"] is None and describe([2.0])["ci95_low"] is None)
+    check("None diabaikan, kosong -> count 0", describe([None, 1.0])["count"] == 1 and describe([]) == {"count": 0})
+
+
+def test_benchmark(server):
+    print("\n[TES] Cold / warm-up / warm terhadap stub + FakeVoice")
+    images = [f"stub-{i}".encode("ascii") for i in range(2)]
+    voice = FakeVoice()
+    samples = run_benchmark(images, repeats=3, warmup=1, cold=2, voice=voice)
+
+    phases = [s["phase"] for s in samples]
+    check("2 cold, 2 warm-up, 6 warm", (phases.count("cold"), phases.count("warmup"), phases.count("warm")) == (2, 2, 6))
+    check("semua request berhasil", all(s["ok"] for s in samples))
+    check("T_Piper terukur", all(s["T_Piper"] > 0 for s in samples))
+
+    summary = summarize_samples(samples)
+    check("warm-up tidak diringkas", set(summary) == {"cold", "warm"})
+    check("n warm = 6", summary["warm"]["T_Ollama"]["count"] == 6)
+    check("cold menanggung load model (T_Load)", summary["cold"]["T_Load"]["mean"] >= 0.9)
+    check("cold lebih lambat dari warm", summary["cold"]["T_Ollama"]["p50"] > summary["warm"]["T_Ollama"]["p99"])
+    check("CI warm mengapit mean", summary["warm"]["T_Ollama"]["ci95_low"] <= summary["warm"]["T_Ollama"]["mean"]
+          <= summary["warm"]["T_Ollama"]["ci95_high"])
+
+    env = environment_info(images, voice, stub=True)
+    check("digest model dari /api/tags", env["ollama"]["digest"] == server.digest)
+    check("model Piper tercatat", env["piper"]["model"] == "FakeVoice" and env["piper"]["sample_rate"] == 22050)
+    check("ukuran gambar tercatat", [i["bytes"] for i in env["images"]] == [6, 6])
+    return {"environment": env, "summary": summary, "samples": samples}
+
+
+def test_compare(report):
+    print("\n[TES] Perbandingan laporan (regresi)")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "base.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f)
+        with open(path, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+
+    same = compare_reports(base, report)
+    check("laporan sama: tanpa regresi", not any(row["regression"] for row in same.values()))
+
+    slower = copy.deepcopy(report)
+    slower["summary"] = summarize_samples([
+        {**s, "T_Ollama": s["T_Ollama"] * 2, "tokens_per_sec": (s["tokens_per_sec"] or 0) / 2}
+        for s in report["samples"]])
+    comparison = compare_reports(base, slower)
+    check("T_Ollama 2x lebih lambat = regresi", comparison["T_Ollama"]["regression"])
+    check("tokens_per_sec turun setengah = regresi", comparison["tokens_per_sec"]["regression"])
+    check("T_Piper tidak berubah", not comparison["T_Piper"]["regression"])
+
+
+def main():
+    print("=" * 60)
+    print("TEST BENCH LATENCY - Statistik cold/warm per tahap")
+    print("=" * 60)
+
+    test_describe()
+
+    server = start_stub_server(token_delay=0.002, first_token_delay=0.05, load_delay=1.0)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+    try:
+        report = test_benchmark(server)
+    finally:
+        server.stop()
+    test_compare(report)
+
+    print("\n[OK] Semua skenario benchmark latensi lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Uji main loop event-driven dengan tombol simulasi (tanpa GPIO/Jetson):
+- tekan -> pipeline mulai tanpa jeda polling
+- pantulan kontak dibuang oleh debounce
+- token pembatalan sudah terpasang saat pipeline berjalan (tekan tidak dibuang)
+- tekan saat pipeline berjalan membatalkan lalu menjalankan ulang
+- request_shutdown() menghentikan loop
+
+Tahap pipeline diganti fungsi palsu yang tidur dan menghormati CancelToken.
+
+    cd test
+    python testButtonLoop.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main
+from buttonInput import SimulatedButton
+
+PIPELINE_SEC = 1.0
+
+
+class FakePipeline:
+    """Pengganti main.run_full_pipeline: catat waktu mulai, tidur, hormati pembatalan."""
+
+    def __init__(self):
+        self.starts = []
+        self.completed = 0
+        self.token_published = []
+
+    def __call__(self, cancel=None):
+        self.starts.append(time.monotonic())
+        self.token_published.append(main.is_processing and main.current_cancel is cancel)
+        if cancel.wait(PIPELINE_SEC):
+            cancel.raise_if_cancelled()
+        self.completed += 1
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def main_test():
+    print("=" * 60)
+    print("TEST BUTTON LOOP - Tombol simulasi, tanpa polling")
+    print("=" * 60)
+
+    pipeline = FakePipeline()
+    main.run_full_pipeline = pipeline
+    button = SimulatedButton(main.on_button_pressed, debounce_sec=main.DEBOUNCE_SEC).start()
+
+    loop = threading.Thread(target=main.serve_presses, name="main-loop", daemon=True)
+    loop.start()
+
+    print("\n[TES] Tekan -> pipeline mulai")
+    pressed_at = time.monotonic()
+    button.press()
+    check("pipeline dimulai", wait_until(lambda: len(pipeline.starts) == 1))
+    latency_ms = (pipeline.starts[0] - pressed_at) * 1000
+    check(f"latensi tekan -> mulai {latency_ms:.1f} ms (< 20 ms, dulu hingga 100 ms)", latency_ms < 20)
+    check("is_processing dan token pembatalan terpasang bersama", pipeline.token_published == [True])
+
+    print("\n[TES] Pantulan kontak dibuang")
+    time.sleep(0.05)
+    button.press()  # 50 ms setelah tekan pertama -> pantulan
+    check("pantulan terhitung", button.debouncer.bounces == 1)
+
+    print("\n[TES] Tekan di tengah pipeline -> batal & mulai ulang")
+    time.sleep(0.3)
+    button.press()
+    check("pipeline kedua dimulai", wait_until(lambda: len(pipeline.starts) == 2))
+    check("pipeline kedua juga punya token sendiri", pipeline.token_published == [True, True])
+    restart_ms = (pipeline.starts[1] - pipeline.starts[0] - 0.35) * 1000
+    check(f"pipeline baru mulai ~{restart_ms:.0f} ms setelah tekan", restart_ms < 50)
+    check("pipeline kedua selesai normal", wait_until(lambda: pipeline.completed == 1))
+    check("pipeline pertama tidak selesai (dibatalkan)", pipeline.completed == 1)
+
+    print("\n[TES] request_shutdown menghentikan loop")
+    main.request_shutdown()
+    loop.join(timeout=1.0)
+    check("main loop berhenti", not loop.is_alive())
+    button.stop()
+
+    print("\n[OK] Semua skenario main loop lolos.")
+
+
+if __name__ == "__main__":
+    main_test()
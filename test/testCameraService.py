@@ -0,0 +1,114 @@
+"""
+Uji CameraService dengan sumber frame palsu (tanpa kamera):
+- latensi buka kamera tercatat sekali saja
+- get_frame() hampir instan dan frame-nya segar
+- frame yang ditimpa tanpa dipakai terhitung sebagai drop
+- buka ulang gagal -> is_alive() False; capture_frame memulai ulang layanan
+  atau fallback buka kamera sekali
+
+    cd test
+    python testCameraService.py
+"""
+
+import os
+import sys
+import time
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cameraService
+import captureImage
+from cameraService import CameraService
+
+from fakeStages import FakeFrameSource
+
+
+def test_dead_service():
+    print("\n[TES] Layanan kamera mati -> mulai ulang / fallback")
+    sources = []  # antrian sumber untuk tiap buka kamera (None = gagal buka)
+
+    def factory():
+        return sources.pop(0) if sources else None
+
+    read_failures = cameraService.MAX_READ_FAILURES
+    cameraService.MAX_READ_FAILURES = 3
+    try:
+        sources.append(FakeFrameSource(fps=200, open_delay=0, fail_after=0))
+        camera = CameraService(source_factory=factory, warmup_frames=0)
+        assert camera.start(), "Kamera palsu gagal dibuka"
+        deadline = time.monotonic() + 1.0
+        while camera.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not camera.is_alive(), "Thread kamera harus berhenti setelah buka ulang gagal"
+        print("  [OK] is_alive() False setelah buka ulang gagal")
+
+        sources.append(FakeFrameSource(fps=200, open_delay=0))
+        frame = captureImage.capture_frame(camera=camera)
+        assert frame is not None and camera.is_alive(), "capture_frame harus memulai ulang layanan"
+        print("  [OK] capture_frame memulai ulang layanan yang mati")
+        camera.stop()
+
+        # Layanan tidak bisa dimulai ulang -> buka kamera sekali untuk tekan ini
+        video_capture = captureImage.cv2.VideoCapture
+        captureImage.cv2.VideoCapture = lambda index: FakeFrameSource(fps=200, open_delay=0)
+        try:
+            frame = captureImage.capture_frame(camera=camera)
+        finally:
+            captureImage.cv2.VideoCapture = video_capture
+        assert frame is not None, "Fallback buka kamera per tekan tidak dipakai"
+        print("  [OK] fallback buka kamera per tekan")
+    finally:
+        cameraService.MAX_READ_FAILURES = read_failures
+
+
+def main():
+    print("=" * 60)
+    print("TEST CAMERA SERVICE - Sumber frame palsu")
+    print("=" * 60)
+
+    camera = CameraService(source_factory=lambda: FakeFrameSource(fps=30, open_delay=0.3),
+                           warmup_frames=5)
+    assert camera.start(), "Kamera palsu gagal dibuka"
+
+    # Tunggu sampai warm-up selesai dan beberapa frame ditimpa
+    time.sleep(0.6)
+
+    latencies = []
+    for _ in range(5):
+        start = time.monotonic()
+        frame = camera.get_frame()
+        latencies.append(time.monotonic() - start)
+        assert frame is not None, "get_frame() tidak mengembalikan frame"
+        time.sleep(0.2)
+
+    stats = camera.stats()
+    camera.stop()
+
+    print(f"Open latency   : {stats['open_latency'] * 1000:.0f} ms")
+    print(f"get_frame maks : {max(latencies) * 1000:.1f} ms")
+    print(f"Frame age      : {stats['frame_age'] * 1000:.1f} ms")
+    print(f"Grabbed/dropped: {stats['frames_grabbed']}/{stats['frames_dropped']}")
+
+    assert stats["open_latency"] >= 0.3, "Latensi buka kamera tidak tercatat"
+    assert max(latencies) < 0.05, "get_frame() terlalu lambat"
+    assert stats["frame_age"] < 0.5, "Frame di slot sudah basi"
+    assert stats["frames_dropped"] > 0, "Frame yang ditimpa tidak terhitung"
+    assert not camera.stats()["running"], "Thread kamera masih berjalan setelah stop()"
+
+    # Kamera yang berhenti mengirim frame -> get_frame() menyerah setelah timeout
+    camera = CameraService(source_factory=lambda: FakeFrameSource(open_delay=0, fail_after=0),
+                           warmup_frames=0)
+    camera.start()
+    start = time.monotonic()
+    frame = camera.get_frame(timeout=0.3)
+    camera.stop()
+    assert frame is None and time.monotonic() - start < 1.0, "Timeout get_frame() tidak bekerja"
+
+    test_dead_service()
+
+    print("\n[OK] CameraService bekerja dengan sumber frame palsu.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Uji pembatalan pipeline (tekan tombol baru di tengah jalan) dengan
+stub Ollama, FakeVoice dan NullSink:
+- request Ollama yang masih "prompt eval" (belum ada header) langsung putus
+- pembatalan saat audio diputar memotong playback seketika
+- pembatalan saat Piper mensintesis terbatas oleh CANCEL_JOIN_TIMEOUT
+- pipeline baru setelah pembatalan berjalan normal
+
+    cd test
+    python testCancel.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import generateTTS
+import preprocessImage
+import streamPipeline
+from cancellation import CancelToken, PipelineCancelled
+from ollamaClient import OllamaClient
+from playAudio import PlaybackEngine, NullSink
+from streamPipeline import run_streaming_pipeline
+
+from stubOllama import start_stub_server, DEFAULT_CAPTION
+from fakeStages import FakeVoice
+
+CANCEL_BUDGET_SEC = 0.5  # sama dengan main.CANCEL_BUDGET_SEC
+
+
+def cancel_after(token, delay):
+    timer = threading.Timer(delay, token.cancel)
+    timer.start()
+    return timer
+
+
+def run_cancelled(fn, token):
+    """Jalankan fn sampai PipelineCancelled. Return: latensi pembatalan (detik)."""
+    try:
+        fn()
+    except PipelineCancelled:
+        return token.latency()
+    raise AssertionError("Pipeline selesai tanpa PipelineCancelled")
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_cancel_prompt_eval():
+    print("\n[TES] Batal saat Ollama belum mengirim header (prompt eval)")
+    server = start_stub_server(token_delay=0, first_token_delay=5.0)
+    client = OllamaClient(base_url=server.base_url)
+    token = CancelToken()
+    cancel_after(token, 0.3)
+    start = time.monotonic()
+    latency = run_cancelled(lambda: client.chat({"model": "stub", "messages": []}, cancel=token), token)
+    check(f"request diputus {latency:.3f}s setelah cancel", latency < 0.1)
+    check("tidak ada retry setelah pembatalan", client.requests_sent == 1)
+    check("tidak menunggu respons 5 detik", time.monotonic() - start < 1.0)
+    client.close()
+    server.stop()
+
+
+def test_cancel_during_playback(engine, sink):
+    print("\n[TES] Batal saat audio sedang diputar")
+    voice = FakeVoice(synth_sec_per_char=0.001)
+    token = CancelToken()
+    cancel_after(token, 1.5)
+    bytes_before = sink.bytes_written
+    latency = run_cancelled(
+        lambda: run_streaming_pipeline(b"stub", voice, engine=engine, save_to_file=False, cancel=token),
+        token)
+    played = (sink.bytes_written - bytes_before) / (2 * 22050)
+    full = len(DEFAULT_CAPTION) * voice.audio_sec_per_char
+    time.sleep(0.2)
+    check(f"latensi pembatalan {latency:.3f}s < {CANCEL_BUDGET_SEC}s", latency < CANCEL_BUDGET_SEC)
+    check(f"playback dipotong ({played:.2f}s dari {full:.2f}s audio)", played < full / 2)
+    check("tidak ada audio tersisa di antrian", engine.wait_idle(timeout=0.1))
+    check("tidak ada audio diputar setelah pembatalan",
+          (sink.bytes_written - bytes_before) / (2 * 22050) - played < 0.1)
+
+
+def test_cancel_during_tts(engine):
+    print("\n[TES] Batal saat Piper sedang mensintesis kalimat panjang")
+    voice = FakeVoice(synth_sec_per_char=0.03)  # ~1-2 detik per kalimat
+    token = CancelToken()
+    cancel_after(token, 1.0)
+    latency = run_cancelled(
+        lambda: run_streaming_pipeline(b"stub", voice, engine=engine, save_to_file=False, cancel=token),
+        token)
+    bound = streamPipeline.CANCEL_JOIN_TIMEOUT + 0.1
+    check(f"latensi pembatalan {latency:.3f}s <= CANCEL_JOIN_TIMEOUT + 0.1s", latency <= bound)
+
+
+def test_fresh_pipeline_after_cancel(engine):
+    print("\n[TES] Pipeline baru setelah pembatalan")
+    voice = FakeVoice(synth_sec_per_char=0.001)
+    text, metrics = run_streaming_pipeline(b"stub", voice, engine=engine, save_to_file=False,
+                                           cancel=CancelToken())
+    check(f"{metrics['n_sentences']} kalimat diucapkan", bool(text) and metrics["n_sentences"] > 0)
+
+
+def main():
+    print("=" * 60)
+    print("TEST CANCEL - Pembatalan pipeline dengan tahap palsu")
+    print("=" * 60)
+
+    test_cancel_prompt_eval()
+
+    server = start_stub_server(token_delay=0.02, first_token_delay=0.2)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+    generateTTS.TTS_CACHE_ENABLED = False
+
+    sink = NullSink(realtime=True, speed=0.5)
+    engine = PlaybackEngine(sink=sink).start()
+    try:
+        test_cancel_during_playback(engine, sink)
+        test_cancel_during_tts(engine)
+        test_fresh_pipeline_after_cancel(engine)
+    finally:
+        engine.stop()
+        server.stop()
+
+    print(f"\nStatistik engine: {engine.stats()}")
+    print("\n[OK] Semua skenario pembatalan lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Uji cache caption di disk (captionCache.py) dan jalurnya di generateText:
+- put/get round-trip, entri + meta tersimpan, counter hit/miss/store
+- eviction LRU (mtime) pada batas jumlah entri dan ukuran total
+- key berubah jika komponen request berubah
+- generateText: hit tidak mengirim request ke Ollama; use_cache=False dan
+  CAPTION_CACHE_ENABLED=False melewati cache
+
+    cd test
+    python testCaptionCache.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import preprocessImage
+from captionCache import CaptionCache, make_key
+
+from stubOllama import start_stub_server, DEFAULT_CAPTION
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_round_trip(tmp):
+    print("\n[TES] put/get round-trip dan counter")
+    cache = CaptionCache(cache_dir=os.path.join(tmp, "round"))
+    key = make_key(model="m", image="abc")
+    check("miss sebelum put", cache.get(key) is None)
+    cache.put(key, "Ada meja di ruangan.", meta={"model": "m"})
+    check("get = caption yang disimpan", cache.get(key) == "Ada meja di ruangan.")
+    check("meta ikut tersimpan", cache.get_entry(key)["meta"] == {"model": "m"})
+    check("counter hit/miss/store", cache.stats() == {"hits": 2, "misses": 1, "stores": 1, "evictions": 0})
+    check("key stabil (urutan argumen bebas)", make_key(image="abc", model="m") == key)
+    check("komponen lain -> key lain", make_key(model="m", image="abd") != key)
+    check("tanpa file sementara tertinggal", os.listdir(cache.cache_dir) == [f"{key}.json"])
+
+    cache.clear()
+    check("clear() mengosongkan cache", cache.get(key) is None)
+
+
+def test_eviction(tmp):
+    print("\n[TES] Eviction LRU (mtime)")
+    cache = CaptionCache(cache_dir=os.path.join(tmp, "lru"), max_entries=3)
+    for i in range(3):
+        cache.put(f"k{i}", f"caption {i}")
+        os.utime(cache._path(f"k{i}"), (time.time() - 100 + i, time.time() - 100 + i))
+    cache.get("k0")  # k0 dipakai lagi -> k1 paling lama
+    cache.put("k3", "caption 3")
+    check("batas 3 entri: k1 (paling lama dipakai) dihapus",
+          sorted(os.listdir(cache.cache_dir)) == ["k0.json", "k2.json", "k3.json"])
+    check("1 eviction tercatat", cache.evictions == 1)
+
+    small = CaptionCache(cache_dir=os.path.join(tmp, "bytes"), max_bytes=600)
+    for i in range(5):
+        small.put(f"b{i}", "x" * 200)
+        os.utime(small._path(f"b{i}"), (time.time() - 100 + i, time.time() - 100 + i))
+    size = sum(os.path.getsize(os.path.join(small.cache_dir, n)) for n in os.listdir(small.cache_dir))
+    check(f"ukuran total {size} byte <= batas 600", size <= 600)
+    check("entri terbaru tetap ada", small.get("b4") == "x" * 200)
+
+
+def test_generate_text_flags(server, tmp):
+    print("\n[TES] Cache di generateText: hit, bypass, nonaktif")
+    enabled = generateText.CAPTION_CACHE_ENABLED
+    generateText._cache = CaptionCache(cache_dir=os.path.join(tmp, "gen"))
+    try:
+        text, _ = generateText.generate_text_from_image(b"cache-a", save_to_file=False, use_cache=True)
+        n_requests = len(server.requests)
+        stats = {}
+        again, _ = generateText.generate_text_from_image(b"cache-a", save_to_file=False, use_cache=True,
+                                                         stats=stats)
+        check("hit: caption sama tanpa request ke Ollama",
+              again == text == DEFAULT_CAPTION and stats["cached"] and len(server.requests) == n_requests)
+
+        stats = {}
+        generateText.generate_text_from_image(b"cache-a", save_to_file=False, use_cache=False, stats=stats)
+        check("use_cache=False: request dikirim lagi", not stats["cached"] and len(server.requests) > n_requests)
+
+        generateText.CAPTION_CACHE_ENABLED = True
+        stats = {}
+        generateText.generate_text_from_image(b"cache-a", save_to_file=False, stats=stats)
+        check("CAPTION_CACHE_ENABLED=True: default memakai cache", stats["cached"])
+
+        n_requests = len(server.requests)
+        generateText.CAPTION_CACHE_ENABLED = False
+        stats = {}
+        generateText.generate_text_from_image(b"cache-a", save_to_file=False, stats=stats)
+        check("CAPTION_CACHE_ENABLED=False: cache dilewati",
+              not stats["cached"] and len(server.requests) > n_requests)
+        check("cache tidak dibaca saat dilewati", generateText._cache.hits == 2)
+    finally:
+        generateText.CAPTION_CACHE_ENABLED = enabled
+        generateText._cache = None
+
+
+def main():
+    print("=" * 60)
+    print("TEST CAPTION CACHE - Cache caption LRU di disk")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_round_trip(tmp)
+        test_eviction(tmp)
+
+        server = start_stub_server(token_delay=0.001, first_token_delay=0.01)
+        generateText.OLLAMA_URL = server.url
+        preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+        try:
+            test_generate_text_flags(server, tmp)
+        finally:
+            server.stop()
+
+    print("\n[OK] Semua skenario cache caption lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Uji kontrol panjang keluaran generateText terhadap stub Ollama:
+- opsi num_predict / stop / temperature terkirim di payload
+- caption yang terpotong num_predict berakhir di batas kalimat
+- MAX_SENTENCES memotong caption, dan di mode streaming memutus stream
+  lebih awal (decode lebih singkat); kalimat pendek yang digabung tetap
+  dihitung satu per satu
+- done_reason "length" hanya membuang fragmen akhir tanpa tanda akhir kalimat
+- cache caption menyimpan caption utuh: batas MAX_SENTENCES lain tidak
+  mendapat caption yang sudah dipotong, dan cache hit streaming tetap
+  membuang kalimat yang terpotong num_predict
+
+    cd test
+    python testLengthControl.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import preprocessImage
+import captionCache
+from generateText import truncate_caption
+
+from stubOllama import start_stub_server, DEFAULT_CAPTION
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def reset_options():
+    generateText.NUM_PREDICT = None
+    generateText.STOP_SEQUENCES = []
+    generateText.MAX_SENTENCES = None
+    generateText.TEMPERATURE = None
+
+
+def test_truncate_caption():
+    print("\n[TES] Potong caption di batas kalimat")
+    text = "Ada meja kayu di ruangan. Dua kursi di sampingnya. Lampu menyala terang dan"
+    check("tanpa batas = utuh", truncate_caption(text) == text)
+    check("maks 1 kalimat", truncate_caption(text, 1) == "Ada meja kayu di ruangan.")
+    check("terpotong num_predict: sisa kalimat dibuang",
+          truncate_caption(text, cut_by_length=True) == "Ada meja kayu di ruangan. Dua kursi di sampingnya.")
+    check("satu-satunya kalimat tidak dibuang",
+          truncate_caption("Ada meja kayu di", cut_by_length=True) == "Ada meja kayu di")
+    check("terpotong num_predict tepat di akhir kalimat: kalimat terakhir tetap",
+          truncate_caption("Ada meja kayu di ruangan. Dua kursi di sampingnya.", cut_by_length=True)
+          == "Ada meja kayu di ruangan. Dua kursi di sampingnya.")
+    check("kalimat pendek dihitung sendiri",
+          truncate_caption("Ya. Ada meja kayu di ruangan. Dua kursi.", 2) == "Ya. Ada meja kayu di ruangan.")
+
+
+def test_options_and_limits(server):
+    print("\n[TES] Opsi generasi dan batas panjang (non-stream)")
+    generateText.NUM_PREDICT = 25
+    generateText.STOP_SEQUENCES = ["\n\n"]
+    generateText.TEMPERATURE = 0.0
+    text, _ = generateText.generate_text_from_image(b"stub", save_to_file=False)
+    options = server.requests[-1]["body"]["options"]
+    check("options terkirim", options == {"num_predict": 25, "stop": ["\n\n"], "temperature": 0.0})
+    check(f"caption berakhir di batas kalimat: '{text[-30:]}'", text.endswith("."))
+    check("lebih pendek dari caption penuh", len(text) < len(DEFAULT_CAPTION))
+
+    reset_options()
+    generateText.MAX_SENTENCES = 2
+    text, _ = generateText.generate_text_from_image(b"stub", save_to_file=False)
+    check("tanpa opsi -> payload tanpa options", "options" not in server.requests[-1]["body"])
+    check("MAX_SENTENCES=2 -> 2 kalimat", text == ". ".join(DEFAULT_CAPTION.split(". ")[:2]) + ".")
+    reset_options()
+
+
+def test_stream_cap(server):
+    print("\n[TES] MAX_SENTENCES memutus stream lebih awal")
+    start = time.monotonic()
+    full = list(generateText.stream_sentences_from_image(b"stub"))
+    t_full = time.monotonic() - start
+
+    generateText.MAX_SENTENCES = 1
+    start = time.monotonic()
+    capped = list(generateText.stream_sentences_from_image(b"stub"))
+    t_capped = time.monotonic() - start
+    reset_options()
+
+    check(f"stream penuh {len(full)} kalimat, dibatasi 1", len(full) > 1 and capped == full[:1])
+    check(f"stream dibatasi {t_capped:.2f}s < penuh {t_full:.2f}s", t_capped < 0.7 * t_full)
+
+    generateText.NUM_PREDICT = 25
+    sentences = list(generateText.stream_sentences_from_image(b"stub"))
+    reset_options()
+    check("stream terpotong num_predict: tanpa kalimat setengah jadi",
+          all(s.endswith(".") for s in sentences))
+
+    caption = server.caption
+    server.caption = "Ya. Ada meja kayu di ruangan. Dua kursi di sampingnya. Lampu menyala."
+    generateText.MAX_SENTENCES = 2
+    sentences = list(generateText.stream_sentences_from_image(b"stub"))
+    server.caption = caption
+    reset_options()
+    check("MAX_SENTENCES=2 dihitung sebelum kalimat pendek digabung",
+          sentences == ["Ya. Ada meja kayu di ruangan."])
+
+
+def test_cache_and_limits(server, tmp):
+    print("\n[TES] Cache caption + batas panjang")
+    generateText._cache = captionCache.CaptionCache(cache_dir=tmp)
+
+    generateText.MAX_SENTENCES = 1
+    first, _ = generateText.generate_text_from_image(b"cache-1", save_to_file=False, use_cache=True)
+    generateText.MAX_SENTENCES = None
+    stats = {}
+    full, _ = generateText.generate_text_from_image(b"cache-1", save_to_file=False, use_cache=True, stats=stats)
+    check("MAX_SENTENCES=1 -> 1 kalimat", first == DEFAULT_CAPTION.split(". ")[0] + ".")
+    check("cache hit tanpa batas -> caption utuh, bukan versi terpotong",
+          stats["cached"] and full == DEFAULT_CAPTION)
+
+    generateText.NUM_PREDICT = 25
+    fresh = list(generateText.stream_sentences_from_image(b"cache-2", use_cache=True))
+    n_requests = len(server.requests)
+    stats = {}
+    cached = list(generateText.stream_sentences_from_image(b"cache-2", use_cache=True, stats=stats))
+    reset_options()
+    check("stream kedua dari cache (tanpa request)", stats["cached"] and len(server.requests) == n_requests)
+    check("done_reason diputar ulang dari cache", stats["done_reason"] == "length")
+    check("cache hit: kalimat terpotong num_predict tetap dibuang", cached == fresh)
+    generateText._cache = None
+
+
+def main():
+    print("=" * 60)
+    print("TEST LENGTH CONTROL - num_predict, stop, batas kalimat")
+    print("=" * 60)
+
+    server = start_stub_server(token_delay=0.02, first_token_delay=0.05)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+    try:
+        test_truncate_caption()
+        test_options_and_limits(server)
+        test_stream_cap(server)
+        with tempfile.TemporaryDirectory() as tmp:
+            test_cache_and_limits(server, tmp)
+    finally:
+        server.stop()
+
+    print("\n[OK] Semua skenario kontrol panjang lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,24 @@ import json
 import csv
 import time
 import glob
+import queue
+import argparse
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Tambahkan parent directory ke sys.path agar bisa import modul dari root
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import generateText
+import captionCache
+import preprocessImage
+import generateTTS
+import ttsCache
+import tracing
 from generateText import generate_text_from_image
 from generateTTS import load_voice, tts_from_text
+from resultJournal import ResultJournal, compact, OLLAMA_FIELDNAMES
 
 # === KONFIGURASI ===
 TEST_DIR = os.path.dirname(__file__)
@@ -18,6 +29,20 @@ IMAGES_DIR = os.path.join(TEST_DIR, "images-test")
 RESULT_AUDIO_DIR = os.path.join(TEST_DIR, "resultAudio")
 RESULT_TEXT_JSON = os.path.join(TEST_DIR, "resultText.json")
 RESULT_TIME_CSV = os.path.join(TEST_DIR, "resultTime.csv")
+RESULT_JOURNAL = os.path.join(TEST_DIR, "resultJournal.jsonl")
+CAPTION_CACHE_DIR = os.path.join(TEST_DIR, "captionCache")
+TTS_CACHE_DIR = os.path.join(TEST_DIR, "ttsCache")
+TRACE_PATH = os.path.join(TEST_DIR, "trace.jsonl")
+GROUND_TRUTH_JSON = os.path.join(TEST_DIR, "GroundTruthAsli.json")
+LENGTH_SWEEP_CSV = os.path.join(TEST_DIR, "lengthSweep.csv")
+
+# Nilai default --sweep-length (0 = tanpa batas)
+SWEEP_NUM_PREDICT = "0,160,120,80"
+SWEEP_MAX_SENTENCES = "0,4,3,2"
+
+# Jumlah request Ollama yang boleh berjalan bersamaan. Nilai 1 tetap
+# memberi overlap: Piper dan tulis file berjalan selagi gambar berikutnya di Ollama.
+DEFAULT_INFLIGHT = 1
 
 # Buat folder output jika belum ada
 os.makedirs(RESULT_AUDIO_DIR, exist_ok=True)
@@ -61,172 +86,356 @@ def extract_image_id(image_path):
         return hash(name_without_ext) % 10000
 
 
+def run_ollama_stage(image_path):
+    """
+    Tahap 1 (thread pool Ollama): gambar -> deskripsi.
+    Return: dict hasil sementara untuk tahap Piper.
+    """
+    image_id = extract_image_id(image_path)
+    print(f"[STEP 1] Menghasilkan deskripsi dengan Ollama: {os.path.basename(image_path)}")
+    start_ollama = time.monotonic()
+
+    # Panggil dengan save_to_file=False agar tidak menyimpan ke folder outputs
+    stats = {}
+    text, _ = generate_text_from_image(image_path, save_to_file=False, stats=stats)
+
+    time_ollama = time.monotonic() - start_ollama
+    tracing.record("batch.ollama", start_ollama, image_id=image_id)
+    return {
+        'image_path': image_path,
+        'image_id': image_id,
+        'image_name': os.path.basename(image_path),
+        'text': text,
+        'T_Ollama': time_ollama,
+        'ollama_stats': stats,
+    }
+
+
+def ollama_columns(stats):
+    """
+    Kolom statistik server Ollama untuk resultTime (dibulatkan),
+    None untuk field yang tidak ada (mis. caption dari cache).
+    """
+    columns = {}
+    for key in OLLAMA_FIELDNAMES:
+        value = stats.get(key)
+        columns[key] = round(value, 4) if isinstance(value, float) else value
+    return columns
+
+
+def run_piper_stage(voice, item):
+    """
+    Tahap 2 (thread Piper): deskripsi -> file audio di RESULT_AUDIO_DIR.
+    Return: baris resultTime (dict).
+    """
+    image_basename = os.path.splitext(item['image_name'])[0]
+    audio_path = os.path.join(RESULT_AUDIO_DIR, f"{image_basename}.wav")
+
+    print(f"[STEP 2] Menghasilkan audio dengan Piper TTS: {item['image_name']}")
+    start_piper = time.monotonic()
+    tts_stats = {}
+    if tts_from_text(item['text'], voice=voice, output_path=audio_path, stats=tts_stats) is None:
+        return {
+            'image_id': item['image_id'],
+            'image_name': item['image_name'],
+            'T_Ollama': item['T_Ollama'],
+            **ollama_columns(item['ollama_stats']),
+            'T_Piper': 0,
+            'status': 'failed_piper'
+        }
+
+    time_piper = time.monotonic() - start_piper
+    tracing.record("batch.piper", start_piper, image_id=item['image_id'])
+    stats = item['ollama_stats']
+    server = ""
+    if stats.get('T_Eval') is not None:
+        server = (f" (load {stats['T_Load'] or 0:.2f}s, prefill {stats['T_PromptEval'] or 0:.2f}s, "
+                  f"decode {stats['T_Eval']:.2f}s, {stats['tokens_per_sec'] or 0:.1f} tok/s)")
+    print(f"[SUMMARY] {item['image_name']} | Ollama: {item['T_Ollama']:.2f}s{server} | Piper: {time_piper:.2f}s")
+    return {
+        'image_id': item['image_id'],
+        'image_name': item['image_name'],
+        'T_Ollama': round(item['T_Ollama'], 4),
+        **ollama_columns(stats),
+        'cached': bool(stats.get('cached') or tts_stats.get('cache_hits')),
+        'T_Piper': round(time_piper, 4),
+        'status': 'success'
+    }
+
+
+def parse_int_list(value):
+    """'0,120,80' -> [0, 120, 80]"""
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def run_length_sweep(image_files, num_predict_values, sentence_values):
+    """
+    Benchmark kontrol panjang keluaran: untuk tiap num_predict, semua gambar
+    dikirim ke Ollama (tanpa cache, tanpa Piper); tiap batas kalimat lalu
+    diterapkan sebagai post-processing dan dinilai METEOR terhadap
+    GroundTruthAsli.json. Batas kalimat tidak mengubah T_Ollama di sini
+    (non-streaming); di mode streaming perangkat, stream diputus lebih awal.
+
+    Return: list baris hasil (juga ditulis ke LENGTH_SWEEP_CSV).
+    """
+    from evaluate_meteor import IndonesianMETEOREvaluator
+
+    with open(GROUND_TRUTH_JSON, 'r', encoding='utf-8') as f:
+        references = {item['image_id']: item['captions'] for item in json.load(f)['annotations']}
+    evaluator = IndonesianMETEOREvaluator()
+
+    generateText.CAPTION_CACHE_ENABLED = False  # ukur Ollama sebenarnya
+    generateText.MAX_SENTENCES = None           # batas kalimat diterapkan di bawah
+    rows = []
+    for num_predict in num_predict_values:
+        generateText.NUM_PREDICT = num_predict or None
+        print(f"\n[SWEEP] num_predict = {num_predict or 'tanpa batas'}")
+
+        captions = {}
+        t_ollama = []
+        t_eval = []
+        for path in image_files:
+            item = run_ollama_stage(path)
+            if item['text']:
+                captions[item['image_id']] = item['text']
+                t_ollama.append(item['T_Ollama'])
+                if item['ollama_stats'].get('T_Eval') is not None:
+                    t_eval.append(item['ollama_stats']['T_Eval'])
+
+        for max_sentences in sentence_values:
+            candidates = {image_id: [generateText.truncate_caption(text, max_sentences or None)]
+                          for image_id, text in captions.items()}
+            meteor = evaluator.compute_meteor_score(candidates, references)['overall'] if candidates else 0.0
+            rows.append({
+                'num_predict': num_predict,
+                'max_sentences': max_sentences,
+                'images': len(captions),
+                'T_Ollama_mean': round(sum(t_ollama) / len(t_ollama), 4) if t_ollama else None,
+                'T_Eval_mean': round(sum(t_eval) / len(t_eval), 4) if t_eval else None,
+                'chars_mean': round(sum(len(c[0]) for c in candidates.values()) / max(1, len(candidates)), 1),
+                'METEOR': round(meteor, 4),
+            })
+
+    with open(LENGTH_SWEEP_CSV, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ['num_predict'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\n{'=' * 60}")
+    print("SWEEP PANJANG KELUARAN (0 = tanpa batas)")
+    print(f"{'=' * 60}")
+    print(f"{'num_predict':>11} {'kalimat':>8} {'T_Ollama':>9} {'T_Eval':>8} {'karakter':>9} {'METEOR':>8}")
+    for r in rows:
+        t_ollama = f"{r['T_Ollama_mean']:.2f}s" if r['T_Ollama_mean'] is not None else "-"
+        t_eval = f"{r['T_Eval_mean']:.2f}s" if r['T_Eval_mean'] is not None else "-"
+        print(f"{r['num_predict']:>11} {r['max_sentences']:>8} {t_ollama:>9} {t_eval:>8} "
+              f"{r['chars_mean']:>9.0f} {r['METEOR']:>8.4f}")
+    print(f"\n[INFO] Hasil sweep disimpan ke: {LENGTH_SWEEP_CSV}")
+    return rows
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Batch test pipeline Ollama + Piper")
+    parser.add_argument("--inflight", type=int, default=DEFAULT_INFLIGHT,
+                        help="jumlah request Ollama yang berjalan bersamaan "
+                             "(efektif hanya jika server diset OLLAMA_NUM_PARALLEL >= nilai ini)")
+    parser.add_argument("--resume", action="store_true",
+                        help="lanjutkan run sebelumnya: lewati gambar yang sudah sukses di jurnal")
+    parser.add_argument("--compact-only", action="store_true",
+                        help="hanya susun resultText.json/resultTime.csv dari jurnal")
+    parser.add_argument("--cache", action="store_true",
+                        help="pakai cache caption & audio (baris dari cache ditandai cached dan "
+                             "tidak ikut rata-rata waktu); default mati supaya latensi terukur")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="resize + re-encode gambar seperti di device (preprocessImage); default mati "
+                             "supaya skor sebanding dengan run di 'hasil sementara'")
+    parser.add_argument("--sweep-length", action="store_true",
+                        help="benchmark num_predict x batas kalimat: latensi vs METEOR (tanpa Piper)")
+    parser.add_argument("--num-predict-values", type=parse_int_list, default=SWEEP_NUM_PREDICT,
+                        help=f"nilai num_predict untuk --sweep-length (default: {SWEEP_NUM_PREDICT})")
+    parser.add_argument("--sentence-values", type=parse_int_list, default=SWEEP_MAX_SENTENCES,
+                        help=f"batas kalimat untuk --sweep-length (default: {SWEEP_MAX_SENTENCES})")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="hanya proses N gambar pertama")
+    parser.add_argument("--trace", action="store_true",
+                        help=f"tulis span latensi per tahap ke {os.path.basename(TRACE_PATH)} "
+                             "dan tampilkan p50/p95/p99 di akhir")
+    parser.add_argument("--store", metavar="RUN_ID", default=None,
+                        help="simpan hasil run (caption, waktu, skor metrik) ke database resultStore "
+                             "dengan run_id ini")
+    args = parser.parse_args()
+
+    # Cache caption & audio hanya jika diminta (--cache): hit cache membuat
+    # T_Ollama/T_Piper mendekati nol dan bukan latensi inferensi
+    generateText.CAPTION_CACHE_ENABLED = args.cache
+    captionCache.CACHE_DIR = CAPTION_CACHE_DIR
+    generateTTS.TTS_CACHE_ENABLED = args.cache
+    ttsCache.CACHE_DIR = TTS_CACHE_DIR
+    # Preprocessing mengubah input model; untuk evaluasi default gambar asli
+    # (seperti run lama), setting yang dipakai dicatat di resultText.json "info"
+    preprocessImage.PREPROCESS_ENABLED = args.preprocess
+    run_info = {"preprocess": preprocessImage.current_settings()}
+
     print("=" * 60)
-    print("TEST MAIN - Batch Processing")
+    print("TEST MAIN - Batch Processing (pipelined)")
     print("=" * 60)
     
     # 1. Ambil semua gambar dari folder images-test
     image_files = get_image_files(IMAGES_DIR)
+    image_order = [extract_image_id(path) for path in image_files]
+    journal = ResultJournal(RESULT_JOURNAL)
+
+    if args.compact_only:
+        compact(journal, RESULT_TEXT_JSON, RESULT_TIME_CSV, order=image_order)
+        return
     
     if not image_files:
         print(f"[ERROR] Tidak ada gambar di folder: {IMAGES_DIR}")
         return
+    if args.limit:
+        image_files = image_files[:args.limit]
+
+    if args.sweep_length:
+        run_length_sweep(image_files, args.num_predict_values, args.sentence_values)
+        return
+
+    total_images = len(image_files)
+    if args.resume:
+        done_ids = journal.completed_ids()
+        image_files = [path for path in image_files if extract_image_id(path) not in done_ids]
+        print(f"[INFO] Resume: {total_images - len(image_files)} gambar sudah selesai di jurnal, dilewati")
+    else:
+        journal.reset()
     
-    print(f"[INFO] Ditemukan {len(image_files)} gambar untuk diproses\n")
+    print(f"[INFO] Ditemukan {len(image_files)} gambar untuk diproses")
+    print(f"[INFO] Request Ollama bersamaan: {args.inflight}")
+    print(f"[INFO] Preprocessing gambar: {'aktif' if args.preprocess else 'nonaktif'}\n")
+
+    if args.trace:
+        if not args.resume and os.path.exists(TRACE_PATH):
+            os.remove(TRACE_PATH)
+        tracing.start_tracing(TRACE_PATH)
     
     # 2. Load model Piper sekali saja (untuk efisiensi)
     print("[INFO] Memuat model Piper...")
     voice = load_voice()
     print()
     
-    # 3. Siapkan struktur data untuk hasil
-    results_text = []
-    results_time = []
-    
-    # 4. Proses setiap gambar
-    for idx, image_path in enumerate(image_files, 1):
-        print(f"\n{'=' * 60}")
-        print(f"Memproses gambar {idx}/{len(image_files)}: {os.path.basename(image_path)}")
-        print(f"{'=' * 60}")
-        
-        image_id = extract_image_id(image_path)
-        image_basename = os.path.splitext(os.path.basename(image_path))[0]
-        
-        # === STEP 1: Generate Text dengan Ollama ===
-        print(f"[STEP 1] Menghasilkan deskripsi dengan Ollama...")
-        start_ollama = time.time()
-        
-        # Panggil dengan save_to_file=False agar tidak menyimpan ke folder outputs
-        text, _ = generate_text_from_image(image_path, save_to_file=False)
-        
-        end_ollama = time.time()
-        time_ollama = end_ollama - start_ollama
-        
-        if not text:
-            print(f"[WARNING] Gagal menghasilkan deskripsi untuk {image_path}. Skip.")
-            results_time.append({
-                'image_id': image_id,
-                'image_name': os.path.basename(image_path),
-                'T_Ollama': 0,
-                'T_Piper': 0,
-                'status': 'failed_ollama'
-            })
-            continue
-        
-        print(f"[INFO] Deskripsi berhasil dibuat (waktu: {time_ollama:.2f}s)")
-        print(f"[INFO] Teks: {text[:100]}...")  # Preview 100 karakter pertama
-        
-        # Simpan ke struktur JSON
-        results_text.append({
-            "image_id": image_id,
-            "captions": [text]  # Dalam format list seperti GroundTruth.json
-        })
-        
-        # === STEP 2: Generate TTS dengan Piper ===
-        print(f"\n[STEP 2] Menghasilkan audio dengan Piper TTS...")
-        start_piper = time.time()
-        
-        # Tentukan nama file audio berdasarkan nama gambar
-        audio_filename = f"{image_basename}.wav"
-        audio_path = os.path.join(RESULT_AUDIO_DIR, audio_filename)
-        
-        # Gunakan fungsi tts_from_text dengan custom output path
-        try:
-            import wave
-            with wave.open(audio_path, "wb") as wav_file:
-                voice.synthesize_wav(text, wav_file)
-            print(f"[INFO] Audio berhasil dibuat: {audio_path}")
-        except Exception as e:
-            print(f"[ERROR] Gagal membuat audio: {e}")
-            end_piper = time.time()
-            time_piper = end_piper - start_piper
-            results_time.append({
-                'image_id': image_id,
-                'image_name': os.path.basename(image_path),
-                'T_Ollama': time_ollama,
-                'T_Piper': 0,
-                'status': 'failed_piper'
-            })
-            continue
-        
-        end_piper = time.time()
-        time_piper = end_piper - start_piper
-        
-        print(f"[INFO] Audio berhasil dibuat (waktu: {time_piper:.2f}s)")
-        
-        # === STEP 3: Catat waktu inferensi ===
-        results_time.append({
-            'image_id': image_id,
-            'image_name': os.path.basename(image_path),
-            'T_Ollama': round(time_ollama, 4),
-            'T_Piper': round(time_piper, 4),
-            'status': 'success'
-        })
-        
-        print(f"[SUMMARY] Ollama: {time_ollama:.2f}s | Piper: {time_piper:.2f}s")
-        
-        # === STEP 4: Simpan hasil setelah setiap gambar selesai ===
-        print(f"\n[STEP 3] Menyimpan hasil ke file...")
-        
-        # Simpan resultText.json
-        try:
-            with open(RESULT_TEXT_JSON, 'w', encoding='utf-8') as f:
-                json.dump({"annotations": results_text}, f, indent=2, ensure_ascii=False)
-            print(f"[INFO] resultText.json diperbarui ({len(results_text)} anotasi)")
-        except Exception as e:
-            print(f"[ERROR] Gagal menyimpan JSON: {e}")
-        
-        # Simpan resultTime.csv
-        try:
-            with open(RESULT_TIME_CSV, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['image_id', 'image_name', 'T_Ollama', 'T_Piper', 'status']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(results_time)
-            print(f"[INFO] resultTime.csv diperbarui ({len(results_time)} entri)")
-        except Exception as e:
-            print(f"[ERROR] Gagal menyimpan CSV: {e}")
+    # 3. Pipeline 3 tahap:
+    #    thread pool Ollama -> thread Piper -> thread penulis jurnal
+    #    sehingga Piper dan tulis file tidak menunda request Ollama berikutnya.
+    piper_q = queue.Queue()
+    writer_q = queue.Queue()
 
-    
-    # 5. Simpan hasil ke file
-    print(f"\n{'=' * 60}")
-    print("Menyimpan hasil...")
-    print(f"{'=' * 60}")
-    
-    # Simpan resultText.json
+    def piper_worker():
+        while True:
+            item = piper_q.get()
+            if item is None:
+                writer_q.put(None)
+                return
+            if not item['text']:
+                print(f"[WARNING] Gagal menghasilkan deskripsi untuk {item['image_path']}. Skip.")
+                writer_q.put({
+                    'image_id': item['image_id'],
+                    'image_name': item['image_name'],
+                    'T_Ollama': 0,
+                    'T_Piper': 0,
+                    'status': 'failed_ollama',
+                    'caption': None
+                })
+                continue
+            row = run_piper_stage(voice, item)
+            row['caption'] = item['text']
+            writer_q.put(row)
+
+    def writer_worker():
+        while True:
+            record = writer_q.get()
+            if record is None:
+                return
+            # Append + fsync satu record per gambar (bukan tulis ulang semua hasil)
+            try:
+                journal.append(record)
+                print(f"[INFO] Jurnal diperbarui: {record['image_name']} ({record['status']})")
+            except Exception as e:
+                print(f"[ERROR] Gagal menulis jurnal: {e}")
+
+    piper_thread = threading.Thread(target=piper_worker, name="piper-worker")
+    writer_thread = threading.Thread(target=writer_worker, name="writer-worker")
+    piper_thread.start()
+    writer_thread.start()
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.inflight))
     try:
-        with open(RESULT_TEXT_JSON, 'w', encoding='utf-8') as f:
-            json.dump({"annotations": results_text}, f, indent=2, ensure_ascii=False)
+        futures = [pool.submit(run_ollama_stage, path) for path in image_files]
+        # Ambil hasil sesuai urutan gambar supaya urutan output tetap sama
+        for idx, future in enumerate(futures, 1):
+            item = future.result()
+            print(f"\n[INFO] Ollama selesai {idx}/{len(image_files)}: "
+                  f"{item['image_name']} ({item['T_Ollama']:.2f}s)")
+            if item['text']:
+                print(f"[INFO] Teks: {item['text'][:100]}...")  # Preview 100 karakter pertama
+            piper_q.put(item)
+    finally:
+        # Saat Ctrl+C: batalkan request yang belum mulai, jangan tunggu antrian
+        pool.shutdown(wait=False, cancel_futures=True)
+        piper_q.put(None)
+        piper_thread.join()
+        writer_thread.join()
+
+        # 4. Kompaksi jurnal -> resultText.json + resultTime.csv
+        #    (juga saat Ctrl+C, supaya hasil parsial tetap terbaca)
+        print(f"\n{'=' * 60}")
+        print("Menyimpan hasil...")
+        print(f"{'=' * 60}")
+        results_time = compact(journal, RESULT_TEXT_JSON, RESULT_TIME_CSV, order=image_order, info=run_info)
         print(f"[INFO] Hasil teks disimpan ke: {RESULT_TEXT_JSON}")
-    except Exception as e:
-        print(f"[ERROR] Gagal menyimpan JSON: {e}")
-    
-    # Simpan resultTime.csv
-    try:
-        with open(RESULT_TIME_CSV, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['image_id', 'image_name', 'T_Ollama', 'T_Piper', 'status']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(results_time)
         print(f"[INFO] Waktu inferensi disimpan ke: {RESULT_TIME_CSV}")
-    except Exception as e:
-        print(f"[ERROR] Gagal menyimpan CSV: {e}")
-    
-    # 6. Tampilkan ringkasan
+
+    if args.store:
+        from resultStore import ResultStore
+        store = ResultStore()
+        store.ingest_run(args.store, RESULT_TEXT_JSON, RESULT_TIME_CSV, score=True)
+        store.close()
+
+    # 5. Tampilkan ringkasan
     print(f"\n{'=' * 60}")
     print("RINGKASAN")
     print(f"{'=' * 60}")
-    print(f"Total gambar diproses: {len(image_files)}")
+    print(f"Total gambar diproses: {total_images}")
     print(f"Berhasil: {sum(1 for r in results_time if r['status'] == 'success')}")
     print(f"Gagal: {sum(1 for r in results_time if r['status'] != 'success')}")
     
-    if results_time:
-        avg_ollama = sum(r['T_Ollama'] for r in results_time if r['T_Ollama'] > 0) / max(1, sum(1 for r in results_time if r['T_Ollama'] > 0))
-        avg_piper = sum(r['T_Piper'] for r in results_time if r['T_Piper'] > 0) / max(1, sum(1 for r in results_time if r['T_Piper'] > 0))
+    timed = [r for r in results_time if not r.get('cached')]
+    if len(timed) < len(results_time):
+        print(f"Dari cache (tidak ikut rata-rata waktu): {len(results_time) - len(timed)}")
+    if timed:
+        avg_ollama = sum(r['T_Ollama'] for r in timed if r['T_Ollama'] > 0) / max(1, sum(1 for r in timed if r['T_Ollama'] > 0))
+        avg_piper = sum(r['T_Piper'] for r in timed if r['T_Piper'] > 0) / max(1, sum(1 for r in timed if r['T_Piper'] > 0))
         print(f"\nRata-rata waktu Ollama: {avg_ollama:.2f}s")
         print(f"Rata-rata waktu Piper: {avg_piper:.2f}s")
+
+        # Pisahkan load model, prefill (gambar + prompt) dan decode
+        for key, label, unit in (('T_Load', 'load model', 's'), ('T_PromptEval', 'prefill', 's'),
+                                 ('T_Eval', 'decode', 's'), ('tokens_per_sec', 'kecepatan decode', ' tok/s')):
+            values = [r[key] for r in timed if r.get(key) not in (None, '')]
+            if values:
+                print(f"Rata-rata {label}: {sum(values) / len(values):.2f}{unit}")
+
+    if generateText.CAPTION_CACHE_ENABLED:
+        stats = generateText.get_cache().stats()
+        print(f"\nCache caption: {stats['hits']} hit, {stats['misses']} miss, "
+              f"{stats['stores']} disimpan, {stats['evictions']} dibuang")
+    if generateTTS.TTS_CACHE_ENABLED:
+        stats = generateTTS.get_tts_cache().stats()
+        print(f"Cache audio (per kalimat): {stats['hits']} hit, {stats['misses']} miss, "
+              f"{stats['stores']} disimpan, {stats['evictions']} dibuang")
     
+    if args.trace:
+        tracing.stop_tracing()
+        print(f"\nLatensi per tahap ({TRACE_PATH}):")
+        tracing.print_summary(tracing.summarize(tracing.load_trace(TRACE_PATH)))
+
     print(f"\n{'=' * 60}")
     print("SELESAI")
     print(f"{'=' * 60}")
@@ -0,0 +1,113 @@
+"""
+Uji METEOR native Bahasa Indonesia (indonesian_meteor.py), tanpa NLTK:
+- stemmer afiks: bentuk berimbuhan -> stem yang sama dengan kata dasarnya
+- alignment + penalty chunk sesuai rumus METEOR (contoh hitung tangan)
+- score_batch sama dengan score per pasangan
+- mode exact-only cocok dengan meteor_results.json (NLTK) untuk
+  resultText.json vs GroundTruthAsli.json; selisih yang tersisa berasal
+  dari tokenisasi NLTK (kutip, "**") dan stem/WordNet Inggris
+- default evaluator tetap nltk; backend native (opt-in) tidak butuh NLTK /
+  jaringan
+
+    cd test
+    python testMeteorIndonesia.py
+"""
+
+import os
+import sys
+import json
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from indonesian_meteor import MeteorScorer, stem, tokenize, count_chunks, corpus_scores
+from evaluate_meteor import IndonesianMETEOREvaluator, METEOR_BACKEND
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_stemmer():
+    print("\n[TES] Stemmer afiks Bahasa Indonesia")
+    pairs = [("memotret", "potret"), ("menggunakan", "guna"), ("berdiri", "diri"),
+             ("terlihat", "lihat"), ("diperlihatkan", "lihat"), ("bangunannya", "bangun"),
+             ("menyapu", "sapu"), ("berisiko", "risiko"), ("orang-orang", "orang"),
+             ("pemandangan", "pandang"), ("memandang", "pandang")]
+    for word, expected in pairs:
+        check(f"{word} -> {expected}", stem(word) == expected)
+    check("kata pendek tidak dipotong", stem("kecil") == "kecil" and stem("makan") == "makan")
+
+
+def test_formula():
+    print("\n[TES] Rumus METEOR")
+    check("tokenisasi kata ulang + tanda baca",
+          tokenize("Orang-orang berdiri, di trotoar.") == ["orang-orang", "berdiri", ",", "di", "trotoar", "."])
+    check("chunk: (0,0)(1,1) | (3,2)", count_chunks([(0, 0), (1, 1), (3, 2)]) == 2)
+
+    scorer = MeteorScorer(stemming=False)
+    check("identik = 1 - 0.5/n^3", abs(scorer.score([["a", "b", "c", "d"]], ["a", "b", "c", "d"])
+                                       - (1 - 0.5 / 4 ** 3)) < 1e-12)
+    # kandidat "a c b", referensi "a b c": 3 match, 3 chunk, P = R = 1
+    check("urutan acak -> penalty 0.5", abs(scorer.score([["a", "b", "c"]], ["a", "c", "b"]) - 0.5) < 1e-12)
+    check("tanpa match = 0", scorer.score([["x"]], ["a"]) == 0.0)
+
+    stemming = MeteorScorer()
+    ref = [tokenize("pria memotret bangunan")]
+    check("stem match menaikkan skor",
+          stemming.score(ref, tokenize("pria potret bangunannya")) > scorer.score(ref, tokenize("pria potret bangunannya")))
+
+    jobs = [(ref, tokenize("pria memotret")), ([["a", "b"], ["b", "a"]], ["a", "b"])]
+    check("score_batch = score per pasangan", stemming.score_batch(jobs) == [stemming.score(r, c) for r, c in jobs])
+    check("maksimum atas referensi", stemming.score([["x"], ["a", "b"]], ["a", "b"]) == stemming.score([["a", "b"]], ["a", "b"]))
+
+
+def test_against_nltk_results():
+    print("\n[TES] Exact-only vs meteor_results.json (NLTK)")
+    references = IndonesianMETEOREvaluator.load_references(os.path.join(TEST_DIR, "GroundTruthAsli.json"))
+    candidates = {i: c[0] for i, c in IndonesianMETEOREvaluator.load_candidates(
+        os.path.join(TEST_DIR, "resultText.json")).items()}
+    with open(os.path.join(TEST_DIR, "meteor_results.json"), 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+
+    scores = corpus_scores(candidates, references, stemming=False)
+    diffs = [abs(scores[i] - expected['per_image'][str(i)]) for i in scores]
+    same = sum(d < 1e-9 for d in diffs)
+    overall = sum(scores.values()) / len(scores)
+    print(f"  overall native {overall:.4f} vs NLTK {expected['overall']:.4f}, "
+          f"{same}/{len(diffs)} gambar identik, selisih maks {max(diffs):.4f}")
+    check("jumlah gambar sama", len(scores) == expected['num_images'])
+    check(">= 90% gambar identik", same >= 0.9 * len(diffs))
+    check("selisih per gambar < 0.05", max(diffs) < 0.05)
+    check("selisih overall < 0.005", abs(overall - expected['overall']) < 0.005)
+
+
+def test_evaluator_offline():
+    print("\n[TES] Evaluator backend native tanpa NLTK")
+    check("default tetap nltk (skor sama dengan meteor_results.json)", METEOR_BACKEND == "nltk")
+    evaluator = IndonesianMETEOREvaluator(workers=1, backend="native")
+    result = evaluator.compute_meteor_score({1: ["Dua lift dengan karpet merah."]},
+                                            {1: ["Dua lift berkarpet merah di depan pintu."]}, verbose=False)
+    check("backend native", evaluator.backend == "native")
+    check("skor dalam (0, 1)", 0.0 < result['overall'] < 1.0)
+    check("nltk tidak diimpor", "nltk" not in sys.modules)
+
+
+def main():
+    print("=" * 60)
+    print("TEST METEOR INDONESIA - Engine native")
+    print("=" * 60)
+
+    test_stemmer()
+    test_formula()
+    test_against_nltk_results()
+    test_evaluator_offline()
+
+    print("\n[OK] Semua skenario METEOR native lolos.")
+
+
+if __name__ == "__main__":
+    main()
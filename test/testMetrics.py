@@ -0,0 +1,103 @@
+"""
+Uji mesin evaluasi multi-metrik (evaluate_metrics.py):
+- caption identik dengan referensi -> BLEU dan ROUGE-L = 1
+- BLEU, ROUGE-L dan CIDEr sesuai hitungan tangan (rumus pycocoevalcap)
+- METEOR sama dengan evaluate_meteor (backend native); default backend = nltk
+  seperti evaluate_meteor, dan backend dicatat di hasil
+- satu pass = metrik dijalankan terpisah, dan lebih cepat
+
+    cd test
+    python testMetrics.py
+"""
+
+import os
+import sys
+import math
+import time
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from evaluate_metrics import CaptionMetricsEngine, lcs_length, evaluate_runs, evaluate_separately
+from evaluate_meteor import IndonesianMETEOREvaluator
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+PREDICTIONS_FILE = os.path.join(TEST_DIR, "resultText.json")
+GROUND_TRUTH_FILE = os.path.join(TEST_DIR, "GroundTruthAsli.json")
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_formulas():
+    print("\n[TES] Rumus per metrik")
+    references = {1: ["pria berdiri di trotoar dekat tiang"], 2: ["mobil merah di jalan raya"]}
+    engine = CaptionMetricsEngine(references, backend="native")
+
+    same = engine.score({1: ["pria berdiri di trotoar dekat tiang"]})['per_image'][1]
+    check("identik: BLEU-4 = 1", abs(same["BLEU-4"] - 1.0) < 1e-6)
+    check("identik: ROUGE-L = 1", abs(same["ROUGE-L"] - 1.0) < 1e-12)
+
+    # kandidat 4 token, 3 unigram cocok, 1 bigram cocok; referensi 6 token
+    part = engine.score({1: ["pria duduk di trotoar"]})['per_image'][1]
+    bp = math.exp(1 - 6 / 4)
+    check("BLEU-1 = 3/4 * BP", abs(part["BLEU-1"] - 0.75 * bp) < 1e-6)
+    check("BLEU-2 = sqrt(3/4 * 1/3) * BP", abs(part["BLEU-2"] - math.sqrt(0.75 / 3) * bp) < 1e-6)
+    # LCS = 3 (pria, di, trotoar): P = 3/4, R = 3/6
+    p, r, beta = 0.75, 0.5, 1.2
+    check("ROUGE-L", abs(part["ROUGE-L"] - (1 + beta ** 2) * p * r / (r + beta ** 2 * p)) < 1e-12)
+    check("LCS", lcs_length("a b c d".split(), "a c d b".split()) == 3)
+
+    # CIDEr: n-gram yang muncul di semua gambar (df = jumlah gambar) berbobot 0
+    check("CIDEr identik > kandidat parsial", same["CIDEr"] > part["CIDEr"] > 0)
+    shared = engine.score({2: ["di"]})['per_image'][2]
+    check("CIDEr n-gram umum ('di' di semua gambar) = 0", shared["CIDEr"] == 0.0)
+
+
+def test_against_meteor_evaluator():
+    print("\n[TES] METEOR = evaluate_meteor (native)")
+    references = IndonesianMETEOREvaluator.load_references(GROUND_TRUTH_FILE)
+    candidates = IndonesianMETEOREvaluator.load_candidates(PREDICTIONS_FILE)
+    expected = IndonesianMETEOREvaluator(workers=1, backend="native").compute_meteor_score(candidates, references, verbose=False)
+    result = CaptionMetricsEngine(references, backend="native").score(candidates)
+    check("backend dicatat di hasil", result['meteor_backend'] == "native")
+    check("default backend sama dengan evaluate_meteor (nltk)",
+          CaptionMetricsEngine(references, metrics=["BLEU"]).meteor_backend == "nltk")
+    check("METEOR per gambar identik",
+          all(result['per_image'][i]["METEOR"] == expected['per_image'][i] for i in expected['per_image']))
+    check("METEOR korpus identik", abs(result['corpus']["METEOR"] - expected['overall']) < 1e-12)
+    check("50 gambar", result['num_images'] == 50)
+
+
+def test_single_pass():
+    print("\n[TES] Satu pass vs metrik terpisah")
+    files = [PREDICTIONS_FILE]
+    start = time.perf_counter()
+    single = evaluate_runs(files, GROUND_TRUTH_FILE, backend="native")
+    t_single = time.perf_counter() - start
+    start = time.perf_counter()
+    separate = evaluate_separately(files, GROUND_TRUTH_FILE, backend="native")
+    t_separate = time.perf_counter() - start
+
+    run = os.path.basename(PREDICTIONS_FILE)
+    check("skor korpus identik", single[run]['corpus'] == separate[run]['corpus'])
+    check("skor per gambar identik", single[run]['per_image'] == separate[run]['per_image'])
+    check(f"satu pass {t_single:.3f}s < terpisah {t_separate:.3f}s", t_single < t_separate)
+
+
+def main():
+    print("=" * 60)
+    print("TEST METRICS - BLEU, ROUGE-L, CIDEr, METEOR satu pass")
+    print("=" * 60)
+
+    test_formulas()
+    test_against_meteor_evaluator()
+    test_single_pass()
+
+    print("\n[OK] Semua skenario multi-metrik lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Uji OllamaClient terhadap stub Ollama lokal yang mensimulasikan
+respons lambat, koneksi terputus, dan error 5xx, serta statistik
+waktu server (load/prefill/decode) yang diteruskan generateText.
+
+    cd test
+    python testOllamaClient.py
+"""
+
+import os
+import sys
+import time
+import socket
+
+import requests
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import preprocessImage
+from ollamaClient import OllamaClient
+
+from stubOllama import start_stub_server, IMAGE_TOKENS
+
+PAYLOAD = {"model": "stub", "messages": [{"role": "user", "content": "halo"}]}
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("backoff", 0.05)
+    return OllamaClient(base_url=server.base_url, **kwargs)
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_keep_alive_pool():
+    print("\n[TES] Koneksi dipakai ulang + field keep_alive")
+    server = start_stub_server(token_delay=0, first_token_delay=0)
+    client = make_client(server, keep_alive="15m")
+    for _ in range(3):
+        client.chat(PAYLOAD)
+    list(client.chat_stream(PAYLOAD))
+    ports = {r["client_port"] for r in server.requests}
+    check("4 request lewat 1 koneksi TCP", len(server.requests) == 4 and len(ports) == 1)
+    check("keep_alive dikirim", all(r["body"].get("keep_alive") == "15m" for r in server.requests))
+    client.close()
+    server.stop()
+
+
+def test_retry_drop_and_5xx():
+    print("\n[TES] Retry untuk 5xx; koneksi putus setelah request terkirim tidak diulang")
+    server = start_stub_server(token_delay=0, first_token_delay=0, faults=["503", "502"])
+    client = make_client(server, max_retries=2)
+    data = client.chat(PAYLOAD)
+    check("berhasil setelah 503 + 502", data.get("done") is True)
+    check("3 request terkirim (2 retry)", len(server.requests) == 3 and client.retries == 2)
+    client.close()
+    server.stop()
+
+    for name, call in [("chat", lambda c: c.chat(PAYLOAD)), ("chat_stream", lambda c: list(c.chat_stream(PAYLOAD)))]:
+        server = start_stub_server(token_delay=0, first_token_delay=0, faults=["drop"])
+        client = make_client(server, max_retries=2)
+        try:
+            call(client)
+            raised = False
+        except requests.ConnectionError:
+            raised = True
+        check(f"{name}: putus setelah terkirim -> ConnectionError tanpa kirim ulang generasi",
+              raised and len(server.requests) == 1 and client.retries == 0)
+        client.close()
+        server.stop()
+
+    server = start_stub_server(token_delay=0, first_token_delay=0, faults=["drop"])
+    client = make_client(server, max_retries=2)
+    client.load_model("stub")
+    check("load model (tanpa generasi) tetap diulang", len(server.requests) == 2 and client.retries == 1)
+    client.close()
+    server.stop()
+
+    server = start_stub_server(token_delay=0, first_token_delay=0, faults=["500", "500", "500"])
+    client = make_client(server, max_retries=2)
+    try:
+        client.chat(PAYLOAD)
+        raised = False
+    except requests.HTTPError as e:
+        raised = e.response.status_code == 500
+    check("HTTPError setelah retry habis", raised and len(server.requests) == 3)
+    client.close()
+    server.stop()
+
+
+def test_read_timeout():
+    print("\n[TES] Server lambat -> read timeout, tidak diulang")
+    server = start_stub_server(token_delay=0, first_token_delay=0, faults=["slow"], slow_delay=3.0)
+    client = make_client(server, read_timeout=0.5, max_retries=2)
+    start = time.monotonic()
+    try:
+        client.chat(PAYLOAD)
+        raised = False
+    except requests.ReadTimeout:
+        raised = True
+    elapsed = time.monotonic() - start
+    check(f"ReadTimeout dalam {elapsed:.2f}s", raised and elapsed < 1.5)
+    check("tidak ada retry", len(server.requests) == 1)
+    client.close()
+    server.stop()
+
+
+def test_server_down():
+    print("\n[TES] Server mati -> ConnectionError setelah backoff")
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()  # port kosong, koneksi akan ditolak
+
+    client = OllamaClient(base_url=f"http://127.0.0.1:{port}", max_retries=2, backoff=0.1)
+    start = time.monotonic()
+    try:
+        client.chat(PAYLOAD)
+        raised = False
+    except requests.ConnectionError:
+        raised = True
+    elapsed = time.monotonic() - start
+    check(f"ConnectionError setelah {elapsed:.2f}s (backoff 0.1 + 0.2)", raised and 0.3 <= elapsed < 2.0)
+    check("3 percobaan", client.requests_sent == 3)
+    client.close()
+
+
+def test_server_timings():
+    print("\n[TES] Statistik waktu server Ollama lewat generateText")
+    server = start_stub_server(token_delay=0.01, first_token_delay=0.1, load_delay=0.2)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+
+    cold = {}
+    text, _ = generateText.generate_text_from_image(b"stub", save_to_file=False, stats=cold)
+    n_tokens = cold["eval_count"]
+    check("teks dihasilkan", bool(text))
+    check(f"load model {cold['T_Load']:.2f}s pada request pertama", abs(cold["T_Load"] - 0.2) < 1e-6)
+    check(f"prefill 0.1s untuk {cold['prompt_eval_count']} token prompt (termasuk gambar)",
+          abs(cold["T_PromptEval"] - 0.1) < 1e-6 and cold["prompt_eval_count"] > IMAGE_TOKENS)
+    check(f"{cold['tokens_per_sec']:.0f} token/detik decode",
+          abs(cold["tokens_per_sec"] - n_tokens / (0.01 * n_tokens)) < 1e-3)
+    check("total = load + prefill + decode",
+          abs(cold["T_Total"] - (cold["T_Load"] + cold["T_PromptEval"] + cold["T_Eval"])) < 1e-6)
+
+    warm = {}
+    sentences = list(generateText.stream_sentences_from_image(b"stub", stats=warm))
+    check("stream: kalimat dihasilkan", len(sentences) > 0)
+    check("stream: model sudah dimuat (load 0s)", warm["T_Load"] == 0.0)
+    check("stream: eval_count sama dengan non-stream", warm["eval_count"] == n_tokens)
+    check("bukan dari cache", not cold["cached"] and not warm["cached"])
+
+    check("field hilang -> None", generateText.parse_ollama_timings({})["tokens_per_sec"] is None)
+    server.stop()
+
+
+def main():
+    print("=" * 60)
+    print("TEST OLLAMA CLIENT - Stub server lokal")
+    print("=" * 60)
+    test_keep_alive_pool()
+    test_retry_drop_and_5xx()
+    test_read_timeout()
+    test_server_down()
+    test_server_timings()
+    print("\n[OK] Semua skenario OllamaClient lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Uji orchestrator asyncio (orchestrator.py) tanpa hardware:
+- urutan output terjaga dan tahap saling tumpang tindih (throughput)
+- antrian terbatas menahan tahap yang lebih cepat (backpressure)
+- item yang gagal tidak menghentikan run, pembatalan cepat
+- cancel di tengah run: run() kembali dalam batas waktu (tidak deadlock)
+- pipeline perangkat dengan stub Ollama, FakeVoice dan NullSink
+- serve(): tekan tombol simulasi, SIGINT -> berhenti rapi + button.stop()
+
+    cd test
+    python testOrchestrator.py
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import threading
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import generateTTS
+import preprocessImage
+import orchestrator
+from orchestrator import Orchestrator, Stage, print_stage_stats
+from cancellation import CancelToken, PipelineCancelled
+from playAudio import PlaybackEngine, NullSink
+from buttonInput import SimulatedButton
+
+from stubOllama import start_stub_server
+from fakeStages import FakeStage, FakeVoice
+
+N_ITEMS = 10
+
+
+class FakeCamera:
+    """Pengganti CameraService: get_frame() langsung mengembalikan bytes gambar."""
+
+    def is_alive(self):
+        return True
+
+    def get_frame(self):
+        return b"stub"
+
+
+class CleanupButton(SimulatedButton):
+    """Tombol simulasi yang mencatat stop() (pengganti GPIO.cleanup())."""
+
+    cleaned = False
+
+    def stop(self):
+        super().stop()
+        self.cleaned = True
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_order_and_throughput():
+    print("\n[TES] Urutan output & tumpang tindih tahap")
+    capture = FakeStage(delay=0.05)
+    llm = FakeStage(delay=0.02, fanout=3)
+    tts = FakeStage(delay=0.03)
+    stages = [Stage("capture", capture), Stage("llm", llm), Stage("tts", tts)]
+
+    start = time.monotonic()
+    outputs, stats = asyncio.run(Orchestrator(stages).run(range(N_ITEMS)))
+    elapsed = time.monotonic() - start
+    print_stage_stats(stats)
+
+    sequential = N_ITEMS * (0.05 + 3 * 0.02 + 3 * 0.03)
+    expected = [(i, k) for i in range(N_ITEMS) for k in range(3)]
+    check("output urut sesuai input", outputs == expected)
+    check("tiap tahap menerima input berurutan", capture.seen == list(range(N_ITEMS)))
+    check(f"total {elapsed:.2f}s < 70% sekuensial {sequential:.2f}s", elapsed < 0.7 * sequential)
+    check("tts mulai sebelum capture selesai semua", tts.spans[0][0] < capture.spans[-1][1])
+
+
+def test_backpressure():
+    print("\n[TES] Backpressure: produsen cepat, konsumen lambat, antrian 2")
+    producer = FakeStage(delay=0.0, fanout=50)
+    consumer = FakeStage(delay=0.01)
+    stages = [Stage("produsen", producer), Stage("konsumen", consumer, queue_size=2)]
+    outputs, stats = asyncio.run(Orchestrator(stages).run([0]))
+    print_stage_stats(stats)
+
+    check("semua output sampai", len(outputs) == 50)
+    check(f"produsen tertahan {stats[0]['blocked_sec']:.2f}s (> 0.3s)", stats[0]["blocked_sec"] > 0.3)
+    lag = consumer.spans[-1][1] - producer.spans[0][1]
+    check(f"produsen selesai hanya {lag * 1000:.0f} ms sebelum konsumen (antrian tidak menumpuk)",
+          lag < 0.1)
+
+
+def test_stage_error_and_cancel():
+    print("\n[TES] Item gagal dilewati, pembatalan cepat")
+
+    def flaky(item, cancel):
+        if item == 3:
+            raise ValueError("item rusak")
+        return (item,)
+
+    outputs, stats = asyncio.run(Orchestrator([Stage("flaky", flaky)]).run(range(6)))
+    check("item lain tetap diproses", outputs == [0, 1, 2, 4, 5])
+    check("error tercatat", stats[0]["errors"] == 1)
+
+    token = CancelToken()
+    threading.Timer(0.2, token.cancel).start()
+    stages = [Stage("lambat", FakeStage(delay=1.0)), Stage("tts", FakeStage(delay=0.01))]
+    try:
+        asyncio.run(Orchestrator(stages).run(range(5), cancel=token))
+        raise AssertionError("run selesai tanpa PipelineCancelled")
+    except PipelineCancelled:
+        latency = token.latency()
+    check(f"latensi pembatalan {latency * 1000:.0f} ms < 100 ms", latency < 0.1)
+
+
+def test_cancel_mid_run():
+    print("\n[TES] Pembatalan di tengah run: run() kembali, tidak menggantung")
+
+    def blocking(item, cancel):
+        # Tahap yang mengabaikan token: worker hanya bisa dihentikan lewat task.cancel()
+        time.sleep(0.5)
+        return (item,)
+
+    async def cancelled_run(stages, items, token):
+        threading.Timer(0.1, token.cancel).start()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(Orchestrator(stages).run(items, cancel=token), timeout=2.0)
+        except PipelineCancelled:
+            return time.monotonic() - start
+        raise AssertionError("run selesai tanpa PipelineCancelled")
+
+    for name, stages in [
+        ("tahap patuh token", [Stage("lambat", FakeStage(delay=1.0, fanout=5)), Stage("tts", FakeStage(delay=0.01))]),
+        ("tahap blocking", [Stage("blocking", blocking), Stage("tts", FakeStage(delay=0.01))]),
+    ]:
+        try:
+            elapsed = asyncio.run(cancelled_run(stages, range(5), CancelToken()))
+        except asyncio.TimeoutError:
+            raise AssertionError(f"{name}: run() menggantung setelah cancel")
+        check(f"{name}: run() kembali {elapsed * 1000:.0f} ms setelah mulai (< 1 s)", elapsed < 1.0)
+
+
+def test_device_pipeline(engine):
+    print("\n[TES] Pipeline perangkat: stub Ollama -> FakeVoice -> NullSink")
+    voice = FakeVoice(synth_sec_per_char=0.001)
+    text, stats = asyncio.run(orchestrator.run_device_pipeline(voice, FakeCamera(), engine))
+    by_name = {s["stage"]: s for s in stats}
+    check("teks dihasilkan", bool(text))
+    check(f"{by_name['llm']['items_out']} kalimat -> {by_name['tts']['items_out']} potongan PCM",
+          by_name["llm"]["items_out"] > 0 and by_name["tts"]["items_out"] >= by_name["llm"]["items_out"])
+    check("audio pertama sebelum LLM selesai",
+          by_name["tts"]["t_first_out"] < by_name["llm"]["busy_sec"] + by_name["capture"]["busy_sec"])
+
+
+def test_serve_shutdown():
+    print("\n[TES] serve(): tekan tombol, SIGINT -> berhenti rapi")
+    runs = []
+    buttons = []
+
+    async def run_once(press_time, cancel):
+        runs.append(time.monotonic() - press_time)
+        await asyncio.sleep(0.05)
+
+    def make_button(on_press):
+        button = CleanupButton(on_press)
+        buttons.append(button)
+        return button
+
+    def drive():
+        while not buttons or not buttons[0].started:
+            time.sleep(0.01)
+        buttons[0].press()
+        time.sleep(0.2)
+        os.kill(os.getpid(), signal.SIGINT)
+
+    threading.Thread(target=drive, daemon=True).start()
+    asyncio.run(orchestrator.serve(make_button, run_once))
+    check("satu run dari tekan tombol", len(runs) == 1)
+    check(f"tekan -> run {runs[0] * 1000:.1f} ms (< 20 ms)", runs[0] < 0.02)
+    check("button.stop() dipanggil (GPIO.cleanup)", buttons[0].cleaned)
+
+
+def main():
+    print("=" * 60)
+    print("TEST ORCHESTRATOR - Worker asyncio dengan tahap palsu")
+    print("=" * 60)
+
+    test_order_and_throughput()
+    test_backpressure()
+    test_stage_error_and_cancel()
+    test_cancel_mid_run()
+
+    server = start_stub_server(token_delay=0.02, first_token_delay=0.2)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+    generateTTS.TTS_CACHE_ENABLED = False
+    engine = PlaybackEngine(sink=NullSink(realtime=True, speed=0.1)).start()
+    try:
+        test_device_pipeline(engine)
+    finally:
+        engine.stop()
+        server.stop()
+
+    test_serve_shutdown()
+
+    print("\n[OK] Semua skenario orchestrator lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Uji PlaybackEngine tanpa speaker (NullSink / FileSink):
+- beberapa ucapan berturut-turut tersambung tanpa celah di FileSink
+- potongan PCM yang datang terlambat di tengah ucapan terhitung underrun
+- play_wav memakai engine bersama (device dibuka sekali)
+- potongan dari produsen yang tertahan antrian penuh tidak diputar setelah flush()
+- sample rate mengikuti voice: device dibuka ulang jika rate berubah
+
+    cd test
+    python testPlayback.py
+"""
+
+import os
+import sys
+import time
+import wave
+import tempfile
+import threading
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import playAudio
+from playAudio import PlaybackEngine, NullSink, FileSink, SAMPLE_RATE, CHUNK_FRAMES
+from streamPipeline import speak_text
+
+from fakeStages import FakeVoice
+
+
+class GateSink(NullSink):
+    """Sink yang menahan write() sampai gate dibuka (device lambat / penuh)."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.writes = []
+
+    def write(self, pcm):
+        self.gate.wait()
+        self.writes.append(pcm)
+
+
+def silence(seconds):
+    return b"\x00\x00" * int(SAMPLE_RATE * seconds)
+
+
+def test_gapless_file_sink(tmp_dir):
+    print("\n[TES] Ucapan berurutan tersambung tanpa celah (FileSink)")
+    path = os.path.join(tmp_dir, "gapless.wav")
+    engine = PlaybackEngine(sink=FileSink(path)).start()
+    for seconds in (0.3, 0.5, 0.2):
+        engine.play_pcm(silence(seconds))
+        engine.end_utterance()
+    engine.wait_idle()
+    engine.stop()
+
+    with wave.open(path, "rb") as wav_file:
+        duration = wav_file.getnframes() / float(wav_file.getframerate())
+    stats = engine.stats()
+    print(f"  durasi rekaman {duration:.3f}s, underrun {stats['underruns']}")
+    assert abs(duration - 1.0) < 1e-3, "Ada sampel yang hilang/bertambah"
+    assert stats["underruns"] == 0, "Ucapan yang sudah lengkap tidak boleh underrun"
+    print("  [OK] 3 ucapan = 1.000s audio, 0 underrun")
+
+
+def test_underrun_counter():
+    print("\n[TES] PCM terlambat di tengah ucapan -> underrun")
+    engine = PlaybackEngine(sink=NullSink()).start()
+    engine.play_pcm(silence(0.1))
+    time.sleep(0.3)  # produsen (TTS) terlambat 0.2 detik
+    engine.play_pcm(silence(0.1))
+    engine.end_utterance()
+    engine.wait_idle()
+
+    time.sleep(0.3)  # jeda antar ucapan bukan underrun
+    engine.play_pcm(silence(0.1))
+    engine.end_utterance()
+    engine.wait_idle()
+    engine.stop()
+
+    stats = engine.stats()
+    print(f"  underrun {stats['underruns']} ({stats['underrun_sec']:.2f}s)")
+    assert stats["underruns"] == 1, "Harus tepat 1 underrun"
+    assert 0.1 < stats["underrun_sec"] < 0.4
+    print("  [OK] 1 underrun tercatat, jeda antar ucapan diabaikan")
+
+
+def test_play_wav_wrapper(tmp_dir):
+    print("\n[TES] play_wav lewat engine bersama")
+    sink = NullSink(realtime=True, speed=1.0)
+    playAudio._engine = PlaybackEngine(sink=sink).start()
+
+    path = os.path.join(tmp_dir, "utt.wav")
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(silence(0.4))
+
+    start = time.monotonic()
+    playAudio.play_wav(path)
+    playAudio.play_wav(path)
+    elapsed = time.monotonic() - start
+    playAudio.shutdown_engine()
+
+    print(f"  2 x 0.4s diputar dalam {elapsed:.2f}s")
+    assert sink.bytes_written == 2 * len(silence(0.4))
+    assert 0.75 < elapsed < 1.2, "play_wav harus blok sampai audio selesai"
+    print("  [OK] play_wav memblok selama durasi audio, tanpa spawn aplay")
+
+
+def test_flush_blocked_producer():
+    print("\n[TES] flush() saat produsen tertahan antrian penuh")
+    sink = GateSink()
+    engine = PlaybackEngine(sink=sink, max_queue=1).start()
+    chunks = [bytes([k, 0]) * CHUNK_FRAMES for k in range(1, 5)]
+    # Potongan 1 sedang ditulis, 2 di antrian, 3 tertahan di put()
+    producer = threading.Thread(target=engine.play_pcm, args=(b"".join(chunks),))
+    producer.start()
+    time.sleep(0.2)
+
+    engine.flush()
+    sink.gate.set()
+    producer.join(timeout=1.0)
+    engine.wait_idle(timeout=1.0)
+    engine.stop()
+
+    print(f"  {len(sink.writes)} potongan ditulis ke sink")
+    assert not producer.is_alive(), "play_pcm harus kembali setelah flush()"
+    assert sink.writes == chunks[:1], "Potongan yang diantrikan sebelum flush() tidak boleh diputar"
+    print("  [OK] hanya potongan yang sudah ditulis sebelum flush(); sisanya dibuang")
+
+
+def test_voice_sample_rate():
+    print("\n[TES] Sample rate engine mengikuti voice")
+    opened = []
+
+    def open_sink(device, sample_rate):
+        opened.append(sample_rate)
+        return NullSink(sample_rate=sample_rate)
+
+    open_device_sink = playAudio.open_device_sink
+    playAudio.open_device_sink = open_sink
+    try:
+        engine = PlaybackEngine().start()
+        speak_text("Ada kursi di lorong.", FakeVoice(synth_sec_per_char=0.0), engine=engine)
+        speak_text("Ada kursi di lorong.", FakeVoice(synth_sec_per_char=0.0, sample_rate=16000), engine=engine)
+        speak_text("Ada meja.", FakeVoice(synth_sec_per_char=0.0, sample_rate=16000), engine=engine)
+        engine.stop()
+    finally:
+        playAudio.open_device_sink = open_device_sink
+
+    print(f"  device dibuka dengan rate {opened}")
+    assert opened == [SAMPLE_RATE, 16000], "Device harus dibuka ulang sekali saat rate voice berubah"
+    assert engine.sink.sample_rate == 16000 and engine.bytes_per_sec == 16000 * 2
+    print("  [OK] voice 16 kHz memutar di 16 kHz, rate sama tidak membuka ulang device")
+
+
+def main():
+    print("=" * 60)
+    print("TEST PLAYBACK ENGINE - Sink headless")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_gapless_file_sink(tmp_dir)
+        test_underrun_counter()
+        test_play_wav_wrapper(tmp_dir)
+        test_flush_blocked_producer()
+        test_voice_sample_rate()
+    print("\n[OK] Semua skenario playback lolos.")
+
+
+if __name__ == "__main__":
+    main()
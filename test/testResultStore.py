@@ -0,0 +1,196 @@
+"""
+Uji database hasil eksperimen (resultStore.py):
+- ingest resultText/resultTime + file metrik, ingest ulang mengganti run
+- ingest-dir memasangkan resultText{N}.json dengan resultTime{N}.csv
+- compare/regressions sama dengan hitungan langsung dari JSON
+- persentil latensi = tracing.percentile atas CSV
+- baris cached (hasil dari cache) tidak ikut latency/compare
+- skor korpus di tabel corpus_scores: dataset dengan image_id 0 tidak tertimpa,
+  database lama (korpus = image_id 0 di scores) dimigrasi
+- "info" resultText.json (setting preprocessing testMain) tercatat di notes run
+
+    cd test
+    python testResultStore.py
+"""
+
+import os
+import sys
+import csv
+import json
+import sqlite3
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tracing import percentile
+from resultStore import ResultStore
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNS_DIR = os.path.join(TEST_DIR, "hasil sementara")
+TEXT_JSON = os.path.join(TEST_DIR, "resultText.json")
+TIME_CSV = os.path.join(TEST_DIR, "resultTime.csv")
+METEOR_JSON = os.path.join(TEST_DIR, "meteor_results.json")
+SPICE_JSON = os.path.join(TEST_DIR, "spice_results.json")
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_ingest(store):
+    print("\n[TES] Ingest satu run")
+    count = store.ingest_run("base", TEXT_JSON, TIME_CSV, [METEOR_JSON, SPICE_JSON])
+    check("50 gambar", count == 50)
+    with open(METEOR_JSON, 'r', encoding='utf-8') as f:
+        meteor = json.load(f)
+    run = {r['run_id']: r for r in store.runs()}["base"]
+    check("skor korpus METEOR tersimpan", abs(run['scores']["METEOR"] - meteor['overall']) < 1e-12)
+    check("metrik METEOR & SPICE", set(run['scores']) == {"METEOR", "SPICE"})
+    row = store.conn.execute(
+        "SELECT score FROM scores WHERE run_id = 'base' AND metric = 'METEOR' AND image_id = 7").fetchone()
+    check("skor per gambar tersimpan", row[0] == meteor['per_image']["7"])
+
+    store.ingest_run("base", TEXT_JSON, TIME_CSV, [METEOR_JSON])
+    check("ingest ulang mengganti run",
+          store.conn.execute("SELECT COUNT(*) FROM images WHERE run_id = 'base'").fetchone()[0] == 50
+          and "SPICE" not in store.metric_names())
+
+
+def test_ingest_directory(store):
+    print("\n[TES] Ingest folder run + skor metrik")
+    run_ids = store.ingest_directory(RUNS_DIR, score=True, backend="native")  # tanpa NLTK
+    check("run hasil0..hasil2", run_ids == ["hasil0", "hasil1", "hasil2"])
+    check("BLEU/ROUGE-L/CIDEr/METEOR dihitung",
+          {"BLEU-4", "ROUGE-L", "CIDEr", "METEOR"} <= set(store.metric_names()))
+    corpus = store.conn.execute("SELECT COUNT(*) FROM corpus_scores").fetchone()[0]
+    check("satu skor korpus per metrik per run", corpus == 1 + 3 * 7)
+
+
+def test_queries(store):
+    print("\n[TES] Query compare / regressions / latency")
+    per_image = {}
+    for run_id in ("hasil0", "hasil1"):
+        per_image[run_id] = dict(store.conn.execute(
+            "SELECT image_id, score FROM scores WHERE run_id = ? AND metric = 'METEOR'",
+            (run_id,)).fetchall())
+    comparison = store.compare_runs("hasil0", "hasil1")
+    expected = sum(per_image["hasil1"].values()) / 50 - sum(per_image["hasil0"].values()) / 50
+    check("delta METEOR = selisih rata-rata", abs(comparison["METEOR"]['delta'] - expected) < 1e-12)
+    check("kolom waktu ikut dibandingkan", "T_Ollama" in comparison and comparison["T_Ollama"]['n'] == 50)
+
+    regressions = store.regressions("hasil0", "hasil1", "METEOR", threshold=0.05)
+    dropped = sorted(i for i in per_image["hasil0"] if per_image["hasil1"][i] - per_image["hasil0"][i] < -0.05)
+    check("regresi = gambar yang turun > 0.05", sorted(r['image_id'] for r in regressions) == dropped)
+    check("urut dari penurunan terbesar",
+          [r['delta'] for r in regressions] == sorted(r['delta'] for r in regressions))
+    check("caption kedua run ikut", all(r['base_caption'] and r['new_caption'] for r in regressions))
+
+    with open(TIME_CSV, 'r', encoding='utf-8') as f:
+        values = sorted(float(r['T_Ollama']) for r in csv.DictReader(f) if r['status'] == 'success')
+    summary = store.latency_percentiles("base")
+    check("jumlah gambar sukses", summary['count'] == len(values))
+    check("p50/p95/p99 = tracing.percentile",
+          all(abs(summary[f"p{q}"] - percentile(values, q)) < 1e-9 for q in (50, 95, 99)))
+    check("run tanpa data -> kosong", store.latency_percentiles("tidak-ada") == {})
+
+
+def test_cached_rows(store, tmp):
+    print("\n[TES] Baris dari cache tidak ikut statistik waktu")
+    with open(TIME_CSV, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    # Run ulang: 10 gambar pertama dari cache (waktu ~0)
+    for k, row in enumerate(rows):
+        row['cached'] = k < 10
+        if row['cached']:
+            row['T_Ollama'] = row['T_Piper'] = '0.001'
+    cached_csv = os.path.join(tmp, "resultTimeCached.csv")
+    with open(cached_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    store.ingest_run("rerun", TEXT_JSON, cached_csv)
+
+    values = sorted(float(r['T_Ollama']) for r in rows if r['status'] == 'success' and not r['cached'])
+    summary = store.latency_percentiles("rerun")
+    check(f"latency: {summary['count']} gambar tanpa cache", summary['count'] == len(values))
+    check("p50 tanpa baris cache", abs(summary["p50"] - percentile(values, 50)) < 1e-9)
+    comparison = store.compare_runs("base", "rerun")
+    check("compare waktu hanya gambar tanpa cache", comparison["T_Ollama"]['n'] == 40
+          and abs(comparison["T_Ollama"]['delta']) < 1e-9)
+    check("CSV lama tanpa kolom cached -> NULL",
+          store.conn.execute("SELECT COUNT(*) FROM images WHERE run_id = 'base' AND cached IS NOT NULL")
+          .fetchone()[0] == 0)
+
+
+def test_image_id_zero(store, tmp):
+    print("\n[TES] Dataset dengan image_id 0 tidak tertimpa skor korpus")
+    metric_json = os.path.join(tmp, "meteor_zero.json")
+    with open(metric_json, 'w', encoding='utf-8') as f:
+        json.dump({"overall": 0.6, "per_image": {"0": 0.5, "1": 0.7}, "num_images": 2}, f)
+    store.ingest_run("zero", metric_files=[metric_json])
+    per_image = dict(store.conn.execute(
+        "SELECT image_id, score FROM scores WHERE run_id = 'zero' AND metric = 'METEOR'").fetchall())
+    check("skor gambar 0 tersimpan", per_image == {0: 0.5, 1: 0.7})
+    run = {r['run_id']: r for r in store.runs()}["zero"]
+    check("skor korpus terpisah", run['scores'] == {"METEOR": 0.6})
+    check("gambar 0 ikut regressions",
+          [r['image_id'] for r in store.regressions("zero", "zero", threshold=-1.0)] == [0, 1])
+
+    print("\n[TES] Migrasi database lama (korpus = image_id 0 di scores)")
+    old_db = os.path.join(tmp, "old.sqlite")
+    conn = sqlite3.connect(old_db)
+    conn.executescript("""
+        CREATE TABLE runs (run_id TEXT PRIMARY KEY, ingested_at REAL NOT NULL, source TEXT, notes TEXT);
+        CREATE TABLE scores (run_id TEXT NOT NULL, image_id INTEGER NOT NULL, metric TEXT NOT NULL,
+                             score REAL NOT NULL, PRIMARY KEY (run_id, metric, image_id));
+        INSERT INTO runs VALUES ('lama', 0, NULL, NULL);
+        INSERT INTO scores VALUES ('lama', 0, 'METEOR', 0.4), ('lama', 3, 'METEOR', 0.3);
+    """)
+    conn.commit()
+    conn.close()
+    old = ResultStore(old_db)
+    try:
+        check("skor korpus dipindah ke corpus_scores", old.runs()[0]['scores'] == {"METEOR": 0.4})
+        check("baris image_id 0 dihapus dari scores",
+              [r[0] for r in old.conn.execute("SELECT image_id FROM scores")] == [3])
+    finally:
+        old.close()
+
+
+def test_run_info(store, tmp):
+    print("\n[TES] Metadata run (info resultText.json) tercatat di notes")
+    with open(TEXT_JSON, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data["info"] = {"preprocess": {"enabled": False}}
+    text_json = os.path.join(tmp, "resultTextInfo.json")
+    with open(text_json, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    store.ingest_run("info", text_json, notes="baseline")
+    notes = store.conn.execute("SELECT notes FROM runs WHERE run_id = 'info'").fetchone()[0]
+    check("catatan + setting preprocessing", notes == 'baseline; {"preprocess": {"enabled": false}}')
+
+
+def main():
+    print("=" * 60)
+    print("TEST RESULT STORE - Database hasil eksperimen")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, "results.sqlite"))
+        try:
+            test_ingest(store)
+            test_ingest_directory(store)
+            test_queries(store)
+            test_cached_rows(store, tmp)
+            test_image_id_zero(store, tmp)
+            test_run_info(store, tmp)
+        finally:
+            store.close()
+
+    print("\n[OK] Semua skenario result store lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Uji evaluator SPICE-style berbasis aturan (evaluate_spice.py):
+- parser mengekstrak objek, atribut dan relasi dari caption Indonesia
+- bentuk berimbuhan cocok lewat stem ("bangunan" / "bangunannya")
+- hasil parse di-cache per caption
+- process pool memberi skor yang sama dengan serial
+- JSON keluaran punya bentuk yang dibaca analyze_results.py
+
+    cd test
+    python testSpice.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import evaluate_spice
+from evaluate_spice import IndonesianSPICEEvaluator, parse_caption, f1_score
+from analyze_results import categorize_scores
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_parser():
+    print("\n[TES] Parser proposisi")
+    props = parse_caption("Seorang pria berdiri di trotoar dekat tiang miring.")
+    for expected in [("pria",), ("trotoar",), ("tiang",), ("pria", "seorang"), ("pria", "diri"),
+                     ("tiang", "miring"), ("pria", "di", "trotoar"), ("trotoar", "dekat", "tiang")]:
+        check(f"{expected}", expected in props)
+    check("kata fungsi tidak jadi objek", ("ada",) not in parse_caption("Ada dua kursi di lorong."))
+    check("stem: bangunan = bangunannya",
+          parse_caption("Pria memotret bangunan.") == parse_caption("Pria itu memotret bangunannya."))
+
+    parse_caption.cache_clear()
+    parse_caption("Dua kursi di lorong.")
+    parse_caption("Dua kursi di lorong.")
+    check("hasil parse di-cache", parse_caption.cache_info().hits == 1)
+
+
+def test_f1():
+    print("\n[TES] F1 proposisi")
+    a = frozenset({("pria",), ("pria", "diri")})
+    check("identik = 1", f1_score(a, a) == 1.0)
+    check("kosong = 0", f1_score(frozenset(), a) == 0.0)
+    check("setengah cocok", abs(f1_score(a, frozenset({("pria",)})) - 2 / 3) < 1e-12)
+
+
+def test_evaluator():
+    print("\n[TES] Evaluator: serial vs pool, format JSON")
+    evaluator = IndonesianSPICEEvaluator(workers=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "spice_results.json")
+        serial = evaluator.evaluate_from_files(os.path.join(TEST_DIR, "resultText.json"),
+                                               os.path.join(TEST_DIR, "GroundTruthAsli.json"), output)
+        with open(output, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+
+    check("kunci JSON = overall/per_image/num_images", set(saved) == {"overall", "per_image", "num_images"})
+    check("per_image berkunci string image_id", all(k.isdigit() for k in saved["per_image"]))
+    check("num_images = jumlah skor", saved["num_images"] == len(saved["per_image"]) == 50)
+    check("skor dalam [0, 1]", all(0.0 <= v <= 1.0 for v in saved["per_image"].values()))
+    check("analyze_results bisa mengkategorikan",
+          sum(len(v) for v in categorize_scores(saved["per_image"]).values()) == 50)
+
+    evaluate_spice.PARALLEL_MIN_IMAGES = 1
+    candidates = load_by_image(os.path.join(TEST_DIR, "resultText.json"), "predictions")
+    references = load_by_image(os.path.join(TEST_DIR, "GroundTruthAsli.json"), "annotations")
+    pooled = IndonesianSPICEEvaluator(workers=2).compute_spice_score(candidates, references, verbose=False)
+    check("pool = serial", pooled["per_image"] == serial["per_image"])
+
+
+def load_by_image(path, key):
+    with open(path, 'r', encoding='utf-8') as f:
+        return {item['image_id']: item['captions'] for item in json.load(f)[key]}
+
+
+def main():
+    print("=" * 60)
+    print("TEST SPICE - Evaluator proposisi berbasis aturan")
+    print("=" * 60)
+
+    test_parser()
+    test_f1()
+    test_evaluator()
+
+    print("\n[OK] Semua skenario SPICE lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Uji time-to-first-audio: pipeline lama (tunggu caption penuh) vs
+pipeline streaming, terhadap stub Ollama lokal yang meneteskan token.
+
+Tidak butuh GPU, model Piper, maupun speaker (pakai FakeVoice/FakePlayer).
+
+    cd test
+    python testStreaming.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import generateTTS
+import preprocessImage
+from generateTTS import tts_from_text
+from streamPipeline import run_streaming_pipeline
+
+from stubOllama import start_stub_server
+from fakeStages import FakeVoice, FakePlayer
+
+
+def run_baseline(img_path, voice, player, audio_dir):
+    """Alur lama: caption penuh -> TTS penuh -> play. Return: TTFA (detik)."""
+    t0 = time.monotonic()
+    text, _ = generateText.generate_text_from_image(img_path, save_to_file=False)
+    wav_path = tts_from_text(text, voice=voice, output_path=os.path.join(audio_dir, "baseline.wav"))
+    player(wav_path)
+    return player.played[-1][0] - t0
+
+
+def main():
+    print("=" * 60)
+    print("TEST STREAMING - Time-to-first-audio")
+    print("=" * 60)
+
+    server = start_stub_server(token_delay=0.05, first_token_delay=0.5)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+    generateTTS.TTS_CACHE_ENABLED = False  # ukur sintesis sebenarnya, bukan hit cache
+    voice = FakeVoice()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        img_path = os.path.join(tmp, "dummy.png")
+        with open(img_path, "wb") as f:
+            f.write(b"\x89PNG dummy")
+
+        ttfa_baseline = run_baseline(img_path, voice, FakePlayer(), tmp)
+
+        player = FakePlayer()
+        text, metrics = run_streaming_pipeline(img_path, voice, play_fn=player,
+                                               save_to_file=False, audio_folder=tmp)
+
+    server.stop()
+
+    print(f"\n{'=' * 60}")
+    print("RINGKASAN")
+    print(f"{'=' * 60}")
+    print(f"TTFA baseline : {ttfa_baseline:.2f}s")
+    print(f"TTFA streaming: {metrics['t_first_audio']:.2f}s")
+    print(f"Kalimat       : {metrics['n_sentences']} | file diputar: {len(player.played)}")
+
+    assert text, "Streaming tidak menghasilkan teks"
+    assert len(player.played) == metrics["n_sentences"], "Jumlah audio != jumlah kalimat"
+    assert metrics["t_first_audio"] < ttfa_baseline, "Streaming tidak lebih cepat dari baseline"
+    print("\n[OK] Streaming memutar audio pertama lebih awal dari baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Uji cache audio Piper per kalimat (ttsCache.py + generateTTS.stream_tts)
+dengan FakeVoice (tanpa model Piper):
+- sintesis kedua teks yang sama tidak memanggil voice (hit), PCM identik
+- potongan audio dari voice disambung utuh dan berurutan di cache
+- key cache dari voice yang dipakai: voice lain (sample_rate / length_scale)
+  tidak mendapat audio voice pertama; sample rate WAV ikut voice
+- eviction LRU (mtime) menjaga batas jumlah entri dan ukuran total
+
+    cd test
+    python testTTSCache.py
+"""
+
+import os
+import sys
+import time
+import wave
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateTTS
+import ttsCache
+from generateTTS import stream_tts, tts_from_text
+
+from fakeStages import FakeVoice
+
+TEXT = "Ada seorang pria di trotoar. Tidak ada bahaya yang terlihat."
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def synthesize(voice, text=TEXT):
+    stats = {}
+    pcm = b"".join(stream_tts(text, voice=voice, use_cache=True, stats=stats))
+    return pcm, stats
+
+
+def test_hit_and_reassembly(cache):
+    print("\n[TES] Hit/miss dan penyambungan potongan audio")
+    voice = FakeVoice(synth_sec_per_char=0.0, chunks=3)
+    first, stats = synthesize(voice)
+    check("sintesis pertama: 2 kalimat, 0 dari cache", (stats["sentences"], stats["cache_hits"]) == (2, 0))
+    check("voice dipanggil sekali per kalimat", voice.synth_calls == 2)
+    check("2 entri tersimpan", cache.stores == 2)
+
+    second, stats = synthesize(voice)
+    check("sintesis kedua: semua dari cache", stats["cache_hits"] == 2)
+    check("voice tidak dipanggil lagi", voice.synth_calls == 2)
+    check("PCM dari cache identik", second == first)
+
+    params = generateTTS.get_voice_params(voice)
+    pcm = cache.get(ttsCache.sentence_key("Ada seorang pria di trotoar.", params))
+    parts = list(voice.synthesize("Ada seorang pria di trotoar."))
+    check("3 potongan disambung berurutan", pcm == b"".join(p.audio_int16_bytes for p in parts))
+    check("potongan terakhir tidak hilang", pcm.endswith(bytes([2, 0])))
+
+
+def test_voice_params(cache, tmp):
+    print("\n[TES] Key cache dari voice yang dipakai")
+    base = FakeVoice(synth_sec_per_char=0.0)
+    synthesize(base, "Kursi di lorong.")
+
+    slower = FakeVoice(synth_sec_per_char=0.0, length_scale=1.2)
+    _, stats = synthesize(slower, "Kursi di lorong.")
+    check("length_scale lain -> miss", stats["cache_hits"] == 0 and slower.synth_calls == 1)
+
+    other_rate = FakeVoice(synth_sec_per_char=0.0, sample_rate=16000)
+    _, stats = synthesize(other_rate, "Kursi di lorong.")
+    check("sample_rate lain -> miss", stats["cache_hits"] == 0 and other_rate.synth_calls == 1)
+    check("sample rate dari voice.config", generateTTS.get_sample_rate(other_rate) == 16000)
+
+    path = tts_from_text("Kursi di lorong.", voice=other_rate, output_path=os.path.join(tmp, "16k.wav"),
+                         use_cache=True)
+    with wave.open(path, "rb") as wav_file:
+        check("WAV ditulis dengan sample rate voice", wav_file.getframerate() == 16000)
+
+    base.model_path = os.path.join(tmp, "suara-a.onnx")
+    check("nama model dari voice.model_path", generateTTS.get_voice_params(base)["model"] == "suara-a.onnx")
+
+
+def test_eviction(tmp):
+    print("\n[TES] Eviction LRU (mtime)")
+    cache = ttsCache.TTSCache(cache_dir=os.path.join(tmp, "lru"), max_entries=3, max_bytes=10_000)
+    for i in range(3):
+        cache.put(f"k{i}", b"\x01\x00" * 100)
+        os.utime(cache._path(f"k{i}"), (time.time() - 100 + i, time.time() - 100 + i))
+    cache.get("k0")  # k0 dipakai lagi -> k1 paling lama
+    cache.put("k3", b"\x01\x00" * 100)
+    check("batas 3 entri", sorted(os.listdir(cache.cache_dir)) == ["k0.pcm", "k2.pcm", "k3.pcm"])
+    check("1 eviction tercatat", cache.evictions == 1)
+
+    cache.put("besar", b"\x01\x00" * 4900)  # 9800 byte: total > 10_000
+    size = sum(os.path.getsize(os.path.join(cache.cache_dir, n)) for n in os.listdir(cache.cache_dir))
+    check(f"ukuran total {size} byte <= batas 10000", size <= 10_000)
+    check("entri terbaru disimpan", cache.get("besar") is not None)
+    check("miss tercatat", cache.get("tidak-ada") is None and cache.misses == 1)
+
+
+def main():
+    print("=" * 60)
+    print("TEST TTS CACHE - Cache audio Piper per kalimat")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generateTTS._cache = ttsCache.TTSCache(cache_dir=os.path.join(tmp, "tts"))
+        try:
+            test_hit_and_reassembly(generateTTS._cache)
+            test_voice_params(generateTTS._cache, tmp)
+        finally:
+            generateTTS._cache = None
+        test_eviction(tmp)
+
+    print("\n[OK] Semua skenario cache TTS lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Uji tracing latensi per tahap (tracing.py) tanpa hardware:
+- span ditulis ke JSONL dengan timestamp monotonic dan id run
+- id run diawali id sesi: dua sesi yang append ke file yang sama tidak bentrok
+- span tetap tercatat saat blok gagal; tracing nonaktif = tanpa file
+- persentil p50/p95/p99 dari ringkasan
+- satu run streaming (stub Ollama, FakeVoice, NullSink) menghasilkan
+  span encode, HTTP, token pertama/terakhir, TTS per kalimat dan playback
+
+    cd test
+    python testTracing.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Tambahkan parent directory ke sys.path agar bisa import modul dari root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import generateText
+import generateTTS
+import preprocessImage
+import tracing
+from playAudio import PlaybackEngine, NullSink
+from streamPipeline import run_streaming_pipeline
+
+from stubOllama import start_stub_server
+from fakeStages import FakeVoice
+
+EXPECTED_SPANS = ["llm.encode", "llm.http", "llm.first_token", "llm.last_token",
+                  "tts.sentence", "pipeline.first_audio", "play.utterance"]
+
+
+def check(name, condition):
+    print(f"  [{'OK' if condition else 'GAGAL'}] {name}")
+    assert condition, name
+
+
+def test_spans_and_summary(tmp):
+    print("\n[TES] Span JSONL dan ringkasan persentil")
+    path = os.path.join(tmp, "unit.jsonl")
+
+    with tracing.span("tidak.aktif"):
+        pass
+    check("tracing nonaktif tidak membuat file", not os.path.exists(path))
+
+    tracing.start_tracing(path)
+    run_id = tracing.begin_run()
+    for ms in range(1, 101):
+        tracing.record("tahap", 0.0, ms / 1000.0)
+    try:
+        with tracing.span("gagal"):
+            raise ValueError("rusak")
+    except ValueError:
+        pass
+    tracing.end_run()
+    with tracing.span("di.luar.run"):
+        time.sleep(0.01)
+    tracing.stop_tracing()
+
+    spans = tracing.load_trace(path)
+    by_name = {s["name"]: s for s in spans}
+    check("102 span tertulis", len(spans) == 102)
+    check("span di dalam run membawa id run", by_name["tahap"]["run"] == run_id)
+    check("span di luar run tanpa id", by_name["di.luar.run"]["run"] is None)
+    check("error tercatat di span", by_name["gagal"]["error"] == "ValueError")
+    check("durasi span ~10 ms", 9 <= by_name["di.luar.run"]["dur_ms"] < 50)
+
+    summary = tracing.summarize(spans)["tahap"]
+    tracing.print_summary({"tahap": summary})
+    check("p50 = 50.5 ms", abs(summary["p50"] - 50.5) < 1e-6)
+    check("p95 = 95.05 ms", abs(summary["p95"] - 95.05) < 1e-6)
+    check("p99 = 99.01 ms", abs(summary["p99"] - 99.01) < 1e-6)
+    check("persentil list kosong = None", tracing.percentile([], 50) is None)
+
+
+def test_sessions_append(tmp):
+    print("\n[TES] Dua sesi menulis ke file trace yang sama")
+    path = os.path.join(tmp, "sessions.jsonl")
+    session, next_run = tracing.SESSION_ID, tracing._next_run
+    run_ids = []
+    try:
+        for name in ("sesi-a", "sesi-b"):  # proses baru: id sesi baru, nomor run mulai dari 1
+            tracing.SESSION_ID, tracing._next_run = name, 0
+            tracing.start_tracing(path)
+            run_ids.append(tracing.begin_run())
+            tracing.record("tahap", 0.0, 0.01)
+            tracing.end_run()
+            tracing.stop_tracing()
+    finally:
+        tracing.SESSION_ID, tracing._next_run = session, next_run
+
+    spans = tracing.load_trace(path)
+    check("id run diawali id sesi", run_ids == ["sesi-a-1", "sesi-b-1"])
+    check("run kedua sesi tidak tercampur", len({s["run"] for s in spans}) == 2)
+
+
+def test_streaming_run(tmp):
+    print("\n[TES] Satu run streaming: stub Ollama -> FakeVoice -> NullSink")
+    path = os.path.join(tmp, "run.jsonl")
+
+    server = start_stub_server(token_delay=0.02, first_token_delay=0.2)
+    generateText.OLLAMA_URL = server.url
+    preprocessImage.PREPROCESS_ENABLED = False  # stub tidak membaca isi gambar
+    generateTTS.TTS_CACHE_ENABLED = False
+    engine = PlaybackEngine(sink=NullSink(realtime=True, speed=0.1)).start()
+
+    tracing.start_tracing(path)
+    try:
+        tracing.begin_run()
+        text, metrics = run_streaming_pipeline(b"stub", FakeVoice(synth_sec_per_char=0.001),
+                                               engine=engine, save_to_file=False)
+        tracing.end_run()
+    finally:
+        tracing.stop_tracing()
+        engine.stop()
+        server.stop()
+
+    spans = tracing.load_trace(path)
+    names = {s["name"] for s in spans}
+    summary = tracing.summarize(spans)
+    tracing.print_summary(summary)
+
+    check("teks dihasilkan", bool(text))
+    for name in EXPECTED_SPANS:
+        check(f"span {name} ada", name in names)
+    check("semua span dalam run yang sama", len({s["run"] for s in spans}) == 1)
+    check("t_end >= t_start", all(s["t_end"] >= s["t_start"] for s in spans))
+    first = summary["llm.first_token"]["p50"]
+    check(f"token pertama {first:.0f} ms >= jeda stub 200 ms", first >= 200)
+    check("token terakhir setelah token pertama", summary["llm.last_token"]["p50"] >= first)
+    n_sentences = summary["tts.sentence"]["count"]
+    check(f"{n_sentences} span TTS untuk {metrics['n_sentences']} kalimat stream",
+          n_sentences >= metrics["n_sentences"])
+
+
+def main():
+    print("=" * 60)
+    print("TEST TRACING - Span latensi per tahap")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_spans_and_summary(tmp)
+        test_sessions_append(tmp)
+        test_streaming_run(tmp)
+
+    print("\n[OK] Semua skenario tracing lolos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import re
+
+# === KONFIGURASI PEMECAH KALIMAT ===
+# Kalimat dianggap selesai jika tanda akhir (. ! ? …) diikuti spasi/baris baru.
+# Angka desimal seperti "3.5" tidak dipecah karena tidak diikuti spasi.
+SENTENCE_END_RE = re.compile(r"(?<=[.!?…])\s+|\n+")
+SENTENCE_TERMINATOR_RE = re.compile(r"[.!?…][\"'”’)\]]*$")
+MIN_SENTENCE_CHARS = 12  # kalimat yang terlalu pendek digabung ke kalimat berikutnya
+
+
+def ends_sentence(text):
+    """
+    True jika teks diakhiri tanda akhir kalimat (boleh diikuti kutip/kurung tutup).
+    """
+    return bool(SENTENCE_TERMINATOR_RE.search(text.rstrip()))
+
+
+class SentenceBuffer:
+    """
+    Kumpulkan potongan teks (token streaming dari LLM) dan keluarkan
+    kalimat utuh begitu batas kalimat terdeteksi.
+
+    Kalimat asli yang lebih pendek dari min_chars digabung dengan kalimat
+    berikutnya sebelum dikeluarkan; feed_groups()/flush_groups() memberi
+    kalimat asli per gabungan supaya batas jumlah kalimat tetap tepat.
+    """
+
+    def __init__(self, min_chars=MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self.buffer = ""
+        self.pending = []  # kalimat lengkap yang belum mencapai min_chars
+
+    def feed_groups(self, chunk):
+        """
+        Tambahkan potongan teks baru.
+        Return: list gabungan yang sudah lengkap; tiap gabungan = list
+                kalimat asli (sebelum digabung).
+        """
+        if not chunk:
+            return []
+        self.buffer += chunk
+
+        groups = []
+        start = 0
+        for match in SENTENCE_END_RE.finditer(self.buffer):
+            piece = self.buffer[start:match.start()].strip()
+            start = match.end()
+            if not piece:
+                continue
+            self.pending.append(piece)
+            if len(" ".join(self.pending)) >= self.min_chars:
+                groups.append(self.pending)
+                self.pending = []
+
+        # Sisa yang belum lengkap tetap di buffer
+        self.buffer = self.buffer[start:]
+        return groups
+
+    def feed(self, chunk):
+        """
+        Tambahkan potongan teks baru.
+        Return: list kalimat yang sudah lengkap (bisa kosong).
+        """
+        return [" ".join(group) for group in self.feed_groups(chunk)]
+
+    def flush_groups(self):
+        """
+        Ambil sisa buffer.
+        Return: (kalimat asli lengkap yang masih tertahan, fragmen akhir tanpa
+                batas kalimat atau "" jika tidak ada).
+        """
+        pending, rest = self.pending, self.buffer.strip()
+        self.pending, self.buffer = [], ""
+        return pending, rest
+
+    def flush(self):
+        """
+        Keluarkan sisa teks di buffer sebagai kalimat terakhir.
+        """
+        pending, rest = self.flush_groups()
+        text = " ".join(pending + ([rest] if rest else []))
+        return [text] if text else []
+
+
+def split_sentences(text, min_chars=MIN_SENTENCE_CHARS):
+    """
+    Pecah teks utuh menjadi list kalimat.
+    """
+    buf = SentenceBuffer(min_chars=min_chars)
+    return buf.feed(text) + buf.flush()
@@ -0,0 +1,277 @@
+"""
+Tracing ringan per tahap pipeline.
+
+Setiap span (buka kamera, ambil frame, encode, HTTP, token pertama/terakhir,
+TTS per kalimat, playback) ditulis sebagai satu baris JSONL dengan timestamp
+time.monotonic(). Jika tracing tidak aktif, semua fungsi di modul ini no-op.
+
+Ringkasan p50/p95/p99 per tahap:
+
+    python tracing.py traces/trace.jsonl
+"""
+
+import os
+import json
+import time
+import uuid
+import argparse
+import threading
+from contextlib import contextmanager
+
+# === KONFIGURASI TRACE ===
+TRACE_DIR = os.path.join(os.getcwd(), "traces")
+TRACE_PATH = os.path.join(TRACE_DIR, "trace.jsonl")
+
+# Id sesi per proses: file trace dibuka append, jadi id run diawali id sesi
+# supaya run 1 sesi kemarin tidak tercampur dengan run 1 sesi hari ini
+SESSION_ID = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+_tracer = None
+_run_id = None  # run (tekan tombol) yang sedang berjalan; span lain ditandai None
+_run_lock = threading.Lock()
+_next_run = 0
+
+
+class Tracer:
+    """
+    Penulis span ke file JSONL (append). Dipanggil dari banyak thread
+    (kamera, Ollama, Piper, playback), jadi tulisan dilindungi lock.
+    File line-buffered tanpa fsync: trace boleh kehilangan baris terakhir
+    saat crash, tapi tidak menambah latensi di jalur kritis.
+    """
+
+    def __init__(self, path=TRACE_PATH):
+        self.path = path
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+        self.spans_written = 0
+
+    def record(self, name, start, end, run=None, **attrs):
+        span = {
+            "run": run,
+            "name": name,
+            "t_start": round(start, 6),
+            "t_end": round(end, 6),
+            "dur_ms": round((end - start) * 1000, 3),
+            "thread": threading.current_thread().name,
+        }
+        span.update(attrs)
+        line = json.dumps(span, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self.spans_written += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def start_tracing(path=TRACE_PATH):
+    """
+    Aktifkan tracing ke file path (ditambahkan di akhir file).
+    Return: Tracer aktif.
+    """
+    global _tracer
+    stop_tracing()
+    _tracer = Tracer(path)
+    print(f"[INFO] Trace latensi ditulis ke: {path}")
+    return _tracer
+
+
+def stop_tracing():
+    """Nonaktifkan tracing dan tutup file trace."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+
+
+def enabled():
+    return _tracer is not None
+
+
+def begin_run():
+    """
+    Mulai run baru (satu tekan tombol / satu gambar). Span berikutnya
+    ditandai dengan id run ini sampai end_run().
+    Return: id run (str, "<SESSION_ID>-<nomor run>"), unik antar proses.
+    """
+    global _run_id, _next_run
+    with _run_lock:
+        _next_run += 1
+        _run_id = f"{SESSION_ID}-{_next_run}"
+        return _run_id
+
+
+def end_run():
+    global _run_id
+    _run_id = None
+
+
+def record(name, start, end=None, **attrs):
+    """
+    Catat span yang waktunya sudah diukur pemanggil (monotonic).
+    end: default sekarang.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return
+    end = time.monotonic() if end is None else end
+    try:
+        tracer.record(name, start, end, run=_run_id, **attrs)
+    except Exception as e:
+        print(f"[WARNING] Gagal menulis trace '{name}': {e}")
+
+
+@contextmanager
+def span(name, **attrs):
+    """
+    Ukur blok kode sebagai satu span. Span tetap dicatat jika blok
+    melempar exception (dengan attr error=nama exception).
+    """
+    if _tracer is None:
+        yield
+        return
+    start = time.monotonic()
+    try:
+        yield
+    except BaseException as e:
+        record(name, start, error=type(e).__name__, **attrs)
+        raise
+    record(name, start, **attrs)
+
+
+def load_trace(path=TRACE_PATH):
+    """
+    Baca semua span dari file trace. Baris rusak/terpotong diabaikan.
+    Return: list dict span.
+    """
+    spans = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue
+    return spans
+
+
+def percentile(values, q):
+    """
+    Persentil q (0-100) dengan interpolasi linear antar rank.
+    Return: None jika values kosong.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    pos = (len(values) - 1) * q / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+# t(0.975, df) untuk df = 1..30
+T_CRITICAL_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def t_critical(df):
+    """
+    Nilai kritis t Student dua sisi untuk interval kepercayaan 95%.
+    df > 30 memakai pendekatan normal (1.96).
+    """
+    if df < 1:
+        return None
+    if df <= len(T_CRITICAL_95):
+        return T_CRITICAL_95[df - 1]
+    return 1.96
+
+
+def describe(values, percentiles=(50, 90, 99)):
+    """
+    Statistik deskriptif satu sampel latensi: jumlah, mean, simpangan baku
+    (sampel, n-1), min/maks, persentil, dan interval kepercayaan 95% untuk
+    mean (t Student). Field yang tidak bisa dihitung (n < 2) bernilai None.
+    Return: dict, atau {"count": 0} jika values kosong.
+    """
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"count": 0}
+    n = len(values)
+    mean = sum(values) / n
+    stddev = (sum((v - mean) ** 2 for v in values) / (n - 1)) ** 0.5 if n > 1 else None
+    half_width = t_critical(n - 1) * stddev / n ** 0.5 if n > 1 else None
+    result = {
+        "count": n,
+        "mean": mean,
+        "stddev": stddev,
+        "min": min(values),
+        "max": max(values),
+    }
+    for q in percentiles:
+        result[f"p{q}"] = percentile(values, q)
+    result["ci95_low"] = mean - half_width if half_width is not None else None
+    result["ci95_high"] = mean + half_width if half_width is not None else None
+    return result
+
+
+def summarize(spans):
+    """
+    Ringkas durasi per nama span (tahap).
+    Return: {name: {"count", "p50", "p95", "p99", "max"}} dalam ms,
+            urut sesuai kemunculan pertama di trace.
+    """
+    durations = {}
+    for s in spans:
+        durations.setdefault(s["name"], []).append(s["dur_ms"])
+
+    return {
+        name: {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": max(values),
+        }
+        for name, values in durations.items()
+    }
+
+
+def print_summary(summary):
+    print(f"{'Tahap':<22} {'n':>5} {'p50':>10} {'p95':>10} {'p99':>10} {'maks':>10}")
+    for name, s in summary.items():
+        print(f"{name:<22} {s['count']:>5} {s['p50']:>8.1f}ms {s['p95']:>8.1f}ms "
+              f"{s['p99']:>8.1f}ms {s['max']:>8.1f}ms")
+
+
+def main():
+    """
+    Mode mandiri: ringkas file trace JSONL jadi p50/p95/p99 per tahap.
+    """
+    parser = argparse.ArgumentParser(description="Ringkasan latensi per tahap dari trace JSONL")
+    parser.add_argument("path", nargs="?", default=TRACE_PATH, help="file trace (default: traces/trace.jsonl)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        print(f"[ERROR] File trace tidak ada: {args.path}")
+        return
+
+    spans = load_trace(args.path)
+    runs = {s["run"] for s in spans if s.get("run") is not None}
+    print(f"=== Ringkasan trace: {len(spans)} span, {len(runs)} run ===")
+    print_summary(summarize(spans))
+
+
+if __name__ == "__main__":
+    main()
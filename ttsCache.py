@@ -0,0 +1,137 @@
+import os
+import re
+import threading
+import unicodedata
+
+from captionCache import make_key, evict_lru
+
+# === KONFIGURASI CACHE AUDIO TTS ===
+CACHE_DIR = os.path.join(os.getcwd(), "tts_cache")
+MAX_ENTRIES = 1000              # jumlah kalimat maksimal yang disimpan
+MAX_BYTES = 64 * 1024 * 1024    # ukuran total maksimal PCM di cache (64 MB)
+
+# Field PiperConfig yang memengaruhi audio (namanya berbeda antar versi piper)
+INFERENCE_FIELDS = ("noise_scale", "length_scale", "noise_w", "noise_w_scale", "speaker_id")
+
+_SPACE_RE = re.compile(r"\s+")
+_MARKDOWN_RE = re.compile(r"[*_#`]+")
+
+
+def normalize_sentence(text):
+    """
+    Normalisasi kalimat sebelum dijadikan key: Unicode NFC, hapus simbol
+    markdown dari LLM, rapikan spasi. Huruf besar/kecil dan tanda baca
+    dipertahankan karena memengaruhi pengucapan dan intonasi Piper.
+    """
+    text = unicodedata.normalize("NFC", text)
+    text = _MARKDOWN_RE.sub("", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def voice_params(voice):
+    """
+    Parameter suara yang memengaruhi hasil audio, diambil dari voice yang
+    dipakai (bukan dari MODEL_PATH modul): sample_rate dan parameter
+    inference dari voice.config, serta identitas file model dari
+    voice.model_path (diisi generateTTS.load_voice).
+    Return: dict parameter (dipakai sebagai bagian key cache).
+    """
+    config = voice.config
+    model_path = getattr(voice, "model_path", None)
+    params = {
+        "model": os.path.basename(model_path) if model_path else type(voice).__name__,
+        "sample_rate": config.sample_rate,
+        "inference": {name: getattr(config, name) for name in INFERENCE_FIELDS if hasattr(config, name)},
+    }
+
+    # Model yang ditimpa (ukuran/mtime berubah) membuat key baru
+    if model_path:
+        try:
+            st = os.stat(model_path)
+            params["model_size"] = st.st_size
+            params["model_mtime"] = int(st.st_mtime)
+        except OSError:
+            pass
+    return params
+
+
+def sentence_key(sentence, voice_params):
+    """
+    Key cache untuk satu kalimat: teks ternormalisasi + parameter suara.
+    """
+    return make_key(text=normalize_sentence(sentence), voice=voice_params)
+
+
+class TTSCache:
+    """
+    Cache audio per kalimat di disk, satu file PCM int16 mono per key.
+    LRU memakai mtime file seperti CaptionCache.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pcm")
+
+    def get(self, key):
+        """
+        Return: bytes PCM jika ada di cache, None jika miss.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                pcm = f.read()
+            os.utime(path)  # tandai baru dipakai (LRU)
+        except OSError:
+            pcm = None
+
+        with self._lock:
+            if pcm:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return pcm or None
+
+    def put(self, key, pcm):
+        """
+        Simpan PCM satu kalimat (tulis ke file sementara lalu rename).
+        """
+        if not pcm:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(pcm)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[WARNING] Gagal menyimpan cache audio: {e}")
+            return
+
+        with self._lock:
+            self.stores += 1
+            self.evictions += evict_lru(self.cache_dir, ".pcm", self.max_entries, self.max_bytes)
+
+    def clear(self):
+        """Hapus semua entri cache."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pcm"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }